@@ -0,0 +1,260 @@
+"""End-to-end agent benchmark that runs fully offline.
+
+Drives SQLChatAgent against an in-memory SQLite table of generated orders
+and TextAnalysisAgent, both with a deterministic stub LLM. For each
+concurrency level it reports throughput and p50/p95/p99 latency, followed
+by a per-stage breakdown. The breakdown has mean and p95 time from the
+agents' traces, plus peak traced memory and net allocated blocks from a
+sequential tracemalloc pass.
+
+Usage:
+    python benchmarks/bench_agents.py [--rows N] [--requests N]
+        [--concurrency 1,8,32] [--llm-latency SECONDS] [--llm-jitter SECONDS]
+        [--agents sql,text] [--cache] [--log-level LEVEL] [--output FILE]
+        [--cassette FILE [--cassette-latency-scale FACTOR]]
+
+With ``--cassette``, completions are replayed from a recorded cassette
+(see ``ai_analytics.agents.cassette``) instead of the stub, at the
+recorded latency times the scale factor.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+from unittest.mock import patch
+
+import numpy as np
+from fixtures import SQL_WORKLOAD, TEXT_WORKLOAD, SQLiteConnection, StubLLM
+
+from ai_analytics.agents import SQLChatAgent, SQLChatRequest, TextAnalysisAgent
+from ai_analytics.agents.base import BaseAgent
+from ai_analytics.agents.text_analysis import TextAnalysisRequest
+from ai_analytics.config import Settings
+from ai_analytics.database.cache import ResultCache
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import configure_logging, shutdown_logging
+
+
+class StageProfiler:
+    """Replacement for the metrics stage timer that also tracks memory.
+
+    Nested stages each see the highest traced memory reached while they
+    were open. Allocation counts are net blocks, so only meaningful when
+    requests run one at a time.
+    """
+
+    def __init__(self) -> None:
+        self.peak_bytes: Dict[str, List[int]] = defaultdict(list)
+        self.net_blocks: Dict[str, List[int]] = defaultdict(list)
+        self._open: List[Dict[str, int]] = []
+
+    def _update_peaks(self) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        for entry in self._open:
+            entry["peak"] = max(entry["peak"], peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def timed(self, current: metrics.Trace, stage: str) -> Iterator[None]:
+        self._update_peaks()
+        traced = tracemalloc.get_traced_memory()[0]
+        entry = {"start": traced, "peak": traced, "blocks": sys.getallocatedblocks()}
+        self._open.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current.timings[stage] += time.perf_counter() - start
+            self._update_peaks()
+            self._open.remove(entry)
+            self.peak_bytes[stage].append(entry["peak"] - entry["start"])
+            self.net_blocks[stage].append(sys.getallocatedblocks() - entry["blocks"])
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": p50, "p95": p95, "p99": p99}
+
+
+async def run_level(
+    agent: BaseAgent,
+    make_request: Callable[[int], Any],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Run requests with bounded concurrency and collect latencies.
+
+    Args:
+        agent: Agent to benchmark.
+        make_request: Builds the i-th request.
+        requests: Number of requests.
+        concurrency: Maximum requests in flight.
+
+    Returns:
+        Dict with throughput, latency percentiles and per-stage timings.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = defaultdict(list)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await agent.execute(make_request(i))
+            latencies.append(time.perf_counter() - start)
+            for stage, seconds in result["metrics"]["timings"].items():
+                stages[stage].append(seconds)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput": requests / wall,
+        "latency": _percentiles(latencies),
+        "stages": {
+            stage: {"mean": float(np.mean(values)), "p95": _percentiles(values)["p95"]}
+            for stage, values in stages.items()
+        },
+    }
+
+
+async def profile_stages(
+    agent: BaseAgent, make_request: Callable[[int], Any], requests: int
+) -> Dict[str, Dict[str, float]]:
+    """Run requests one at a time under tracemalloc.
+
+    Args:
+        agent: Agent to benchmark.
+        make_request: Builds the i-th request.
+        requests: Number of requests.
+
+    Returns:
+        Mean peak traced bytes and net allocated blocks per stage.
+    """
+    profiler = StageProfiler()
+    tracemalloc.start()
+    try:
+        with patch.object(metrics, "_timed", profiler.timed):
+            for i in range(requests):
+                await agent.execute(make_request(i))
+    finally:
+        tracemalloc.stop()
+    return {
+        stage: {
+            "peak_bytes": float(np.mean(profiler.peak_bytes[stage])),
+            "net_blocks": float(np.mean(profiler.net_blocks[stage])),
+        }
+        for stage in profiler.peak_bytes
+    }
+
+
+def print_report(
+    name: str, levels: List[Dict[str, Any]], memory: Dict[str, Any]
+) -> None:
+    """Print the results for one agent."""
+    print(f"\n{name}")
+    print(f"{'concurrency':>11} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for level in levels:
+        latency = level["latency"]
+        print(
+            f"{level['concurrency']:>11} {level['throughput']:>9.1f} "
+            f"{latency['p50'] * 1000:>9.1f} {latency['p95'] * 1000:>9.1f} "
+            f"{latency['p99'] * 1000:>9.1f}"
+        )
+
+    print(
+        f"\n{'stage':<22} {'mean ms':>9} {'p95 ms':>9} {'peak KiB':>10} "
+        f"{'net blocks':>11}"
+        f"   (time at concurrency {levels[-1]['concurrency']})"
+    )
+    for stage, timing in sorted(levels[-1]["stages"].items()):
+        profile = memory.get(stage, {})
+        print(
+            f"{stage:<22} {timing['mean'] * 1000:>9.2f} {timing['p95'] * 1000:>9.2f} "
+            f"{profile.get('peak_bytes', 0) / 1024:>10.1f} "
+            f"{profile.get('net_blocks', 0):>11.0f}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--profile-requests", type=int, default=20)
+    parser.add_argument("--agents", default="sql,text")
+    parser.add_argument(
+        "--cache", action="store_true", help="enable LLM and result caches"
+    )
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--cassette", help="replay completions from this cassette")
+    parser.add_argument("--cassette-latency-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    settings = Settings(
+        openai_api_key="benchmark",
+        enable_monitoring=True,
+        cache_backend="memory" if args.cache else "none",
+        log_level=args.log_level,
+        llm_cassette_path=args.cassette,
+        llm_cassette_latency_scale=args.cassette_latency_scale,
+    )
+    # Log records are produced and serialized as usual, then discarded
+    configure_logging(settings, stream=open(os.devnull, "w"))
+    levels = [int(value) for value in args.concurrency.split(",")]
+    workloads = {
+        "sql": lambda: (
+            SQLChatAgent(settings, database=SQLiteConnection(
+                args.rows, result_cache=ResultCache() if args.cache else None
+            )),
+            lambda i: SQLChatRequest(question=SQL_WORKLOAD[i % len(SQL_WORKLOAD)][0]),
+        ),
+        "text": lambda: (
+            TextAnalysisAgent(settings),
+            lambda i: TextAnalysisRequest(
+                text=TEXT_WORKLOAD[i % len(TEXT_WORKLOAD)][0],
+                tasks=TEXT_WORKLOAD[i % len(TEXT_WORKLOAD)][1],
+            ),
+        ),
+    }
+
+    report: Dict[str, Any] = {"args": vars(args)}
+    stub = StubLLM(latency=args.llm_latency, jitter=args.llm_jitter)
+    with stub.installed():
+        for name in args.agents.split(","):
+            agent, make_request = workloads[name]()
+            # Warm up connection setup and first-call imports
+            await agent.execute(make_request(0))
+            results = [
+                await run_level(agent, make_request, args.requests, level)
+                for level in levels
+            ]
+            memory = await profile_stages(agent, make_request, args.profile_requests)
+            print_report(agent.__class__.__name__, results, memory)
+            report[name] = {"levels": results, "memory": memory}
+
+    shutdown_logging()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\nStub LLM calls: {stub.calls}, peak RSS: {max_rss / 1024:.0f} MiB")
+    report["max_rss_kib"] = max_rss
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
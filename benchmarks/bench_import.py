@@ -0,0 +1,88 @@
+"""Benchmark cold import time of the package entry points.
+
+Each import runs in a fresh interpreter, so module caches from earlier runs
+do not hide regressions. The script exits non-zero if an entry point pulls
+in a module it must not load, or is slower than ``--max-seconds``.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--max-seconds SECONDS]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+# (statement, modules that must stay unloaded)
+CASES: List[Tuple[str, Tuple[str, ...]]] = [
+    (
+        "import ai_analytics",
+        ("pandas", "openai", "google.cloud.bigquery", "sqlalchemy"),
+    ),
+    ("import ai_analytics.database", ("pandas", "google.cloud.bigquery", "sqlalchemy")),
+    (
+        "from ai_analytics.database import PostgresConnection",
+        ("google.cloud.bigquery",),
+    ),
+    ("from ai_analytics import TextAnalysisAgent", ("pandas", "google.cloud.bigquery")),
+    ("from ai_analytics import SQLChatAgent", ("google.cloud.bigquery",)),
+]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {forbidden!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(statement: str, forbidden: Tuple[str, ...]) -> Tuple[float, List[str]]:
+    """Run an import in a fresh interpreter.
+
+    Args:
+        statement: Import statement to time.
+        forbidden: Modules that must not be loaded by the statement.
+
+    Returns:
+        Tuple of elapsed seconds and the forbidden modules that were loaded.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement, forbidden=forbidden)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    elapsed, _, loaded = output.rpartition("\n")[-1].partition(" ")
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'statement':<56} {'median ms':>10} {'max ms':>8}  unexpected modules")
+    for statement, forbidden in CASES:
+        timings = []
+        loaded: List[str] = []
+        for _ in range(args.runs):
+            elapsed, loaded = measure(statement, forbidden)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        print(
+            f"{statement:<56} {median * 1000:>10.1f} {max(timings) * 1000:>8.1f}"
+            f"  {', '.join(loaded) or '-'}"
+        )
+        if loaded or (args.max_seconds is not None and median > args.max_seconds):
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Benchmark per-request logging overhead on the caller's thread.
+
+Compares a synchronous StreamHandler with the queued handler from
+``ai_analytics.utils.logging`` while the output stream is slow, as when
+stdout is a congested container pipe.
+
+Usage:
+    python benchmarks/bench_logging.py [--requests N] [--write-delay SECONDS]
+"""
+
+import argparse
+import logging
+import time
+
+from ai_analytics.utils.logging import (
+    configure_logging,
+    get_logger,
+    request_context,
+    shutdown_logging,
+)
+
+# Log calls made by one SQLChatAgent request that reaches the database
+RECORDS_PER_REQUEST = 3
+
+
+class SlowStream:
+    """Text stream that takes a fixed time per write."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _time_requests(logger: logging.Logger, requests: int) -> float:
+    """Log like an agent request does and return seconds per request."""
+    start = time.perf_counter()
+    for i in range(requests):
+        with request_context():
+            logger.info("Executing %s", "SQLChatAgent")
+            logger.info("Answered from column profile of %s", f"column_{i}")
+            logger.info("Execution completed successfully")
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--write-delay", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    stream = SlowStream(args.write_delay)
+
+    sync_logger = logging.getLogger("bench.sync")
+    sync_logger.addHandler(logging.StreamHandler(stream))
+    sync_logger.setLevel(logging.INFO)
+    sync_logger.propagate = False
+    sync = _time_requests(sync_logger, args.requests)
+
+    configure_logging(stream=stream)
+    queued_logger = get_logger("bench.queued")
+    queued_logger.propagate = False
+    queued = _time_requests(queued_logger, args.requests)
+    shutdown_logging()
+
+    print(f"{'handler':<10} {'us/request':>12}")
+    print(f"{'sync':<10} {sync * 1e6:>12.1f}")
+    print(f"{'queued':<10} {queued * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
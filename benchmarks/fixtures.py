@@ -0,0 +1,260 @@
+"""Offline stand-ins for the database and the LLM used by the benchmarks."""
+
+import asyncio
+import itertools
+import queue
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ai_analytics.database.base import ColumnStats, DatabaseConnection, TableSchema
+from ai_analytics.database.cache import ResultCache
+
+# Benchmark questions and the SQL the stub LLM answers them with
+SQL_WORKLOAD: List[Tuple[str, str]] = [
+    (
+        "What is the total amount per country?",
+        "SELECT country, SUM(amount) AS total FROM orders GROUP BY country "
+        "ORDER BY total DESC",
+    ),
+    (
+        "How many orders are in each status?",
+        "SELECT status, COUNT(*) AS orders FROM orders GROUP BY status",
+    ),
+    (
+        "Who are the top customers by revenue?",
+        "SELECT customer_id, SUM(amount) AS revenue FROM orders "
+        "GROUP BY customer_id ORDER BY revenue DESC LIMIT 10",
+    ),
+    (
+        "What is the average order amount per month?",
+        "SELECT substr(created_at, 1, 7) AS month, AVG(amount) AS average "
+        "FROM orders GROUP BY month ORDER BY month",
+    ),
+    (
+        "Show the most recent orders",
+        "SELECT * FROM orders ORDER BY created_at DESC",
+    ),
+]
+
+TEXT_WORKLOAD: List[Tuple[str, List[str]]] = [
+    (
+        "The delivery was late but support resolved it quickly.",
+        ["sentiment", "summary"],
+    ),
+    ("Invoice 4711 from ACME GmbH, Berlin, due on 1 March.", ["entities"]),
+    ("Great product, terrible packaging. Would buy again.", ["sentiment", "keywords"]),
+]
+
+_COUNTRIES = ["DE", "FR", "US", "GB", "NL", "ES", "IT", "PL"]
+_STATUSES = ["placed", "paid", "shipped", "delivered", "returned"]
+
+
+def generate_orders(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a synthetic orders table.
+
+    Args:
+        rows: Number of rows.
+        seed: Random seed, so runs are comparable.
+
+    Returns:
+        DataFrame with id, customer_id, country, status, amount and
+        created_at columns.
+    """
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp("2023-01-01") + pd.to_timedelta(
+        rng.integers(0, 730 * 24 * 3600, rows), unit="s"
+    )
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "customer_id": rng.integers(0, max(rows // 20, 1), rows),
+        "country": rng.choice(_COUNTRIES, rows),
+        "status": rng.choice(_STATUSES, rows, p=[0.1, 0.2, 0.2, 0.45, 0.05]),
+        "amount": rng.gamma(2.0, 40.0, rows).round(2),
+        "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+_database_ids = itertools.count()
+
+
+class SQLiteConnection(DatabaseConnection):
+    """In-memory SQLite database holding a generated orders table.
+
+    Queries run on a fixed-size pool of connections to one shared-cache
+    database, so pool saturation behaves like a pooled server database.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        seed: int = 0,
+        result_cache: Optional[ResultCache] = None,
+        pool_size: int = 5,
+    ):
+        """Initialize the connection.
+
+        Args:
+            rows: Number of generated rows.
+            seed: Random seed for the generated data.
+            result_cache: Optional cache for query results.
+            pool_size: Number of pooled connections.
+        """
+        super().__init__(result_cache)
+        self.rows = rows
+        self.seed = seed
+        self.pool_size = pool_size
+        self.data: Optional[pd.DataFrame] = None
+        self._uri = f"file:benchmark_{next(_database_ids)}?mode=memory&cache=shared"
+        self._pool: Optional["queue.LifoQueue[sqlite3.Connection]"] = None
+        self._checked_out = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> None:
+        """Create the database, load the generated table and fill the pool."""
+        self.data = generate_orders(self.rows, self.seed)
+        pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            pool.put(sqlite3.connect(self._uri, uri=True, check_same_thread=False))
+        conn = pool.get()
+        self.data.to_sql("orders", conn, index=False)
+        conn.commit()
+        pool.put(conn)
+        self._pool = pool
+
+    def disconnect(self) -> None:
+        """Close all pooled connections, dropping the database."""
+        if self._pool is not None:
+            while not self._pool.empty():
+                self._pool.get().close()
+            self._pool = None
+
+    def _execute_query(self, query: str) -> pd.DataFrame:
+        """Execute a query on a pooled connection, waiting for a free one."""
+        if self._pool is None:
+            self.connect()
+        conn = self._pool.get()
+        with self._lock:
+            self._checked_out += 1
+        try:
+            return pd.read_sql_query(query, conn)
+        finally:
+            with self._lock:
+                self._checked_out -= 1
+            self._pool.put(conn)
+
+    def pool_status(self) -> Optional[Dict[str, int]]:
+        """Get the pool size and connections in use."""
+        return {"size": self.pool_size, "checked_out": self._checked_out, "overflow": 0}
+
+    def get_schema(self) -> TableSchema:
+        """Get the orders table schema."""
+        return TableSchema(
+            name="orders",
+            columns=[
+                {"name": "id", "type": "INTEGER"},
+                {"name": "customer_id", "type": "INTEGER"},
+                {"name": "country", "type": "TEXT"},
+                {"name": "status", "type": "TEXT"},
+                {"name": "amount", "type": "REAL"},
+                {"name": "created_at", "type": "TEXT"},
+            ],
+        )
+
+    def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
+        """Get the first rows of the table."""
+        return self.execute_query(f"SELECT * FROM orders LIMIT {limit}")
+
+    def get_column_stats(self, top_k: int = 5) -> Dict[str, ColumnStats]:
+        """Profile the generated columns with pandas."""
+        if self.data is None:
+            self.connect()
+        stats = {}
+        for name in self.data.columns:
+            column = self.data[name]
+            counts = column.value_counts()
+            numeric = pd.api.types.is_numeric_dtype(column)
+            stats[name] = ColumnStats(
+                name=name,
+                null_fraction=float(column.isna().mean()),
+                distinct_count=float(len(counts)),
+                min_value=column.min().item() if numeric else None,
+                max_value=column.max().item() if numeric else None,
+                top_values=[] if numeric else counts.index[:top_k].tolist(),
+                top_values_complete=not numeric and len(counts) <= top_k,
+            )
+        return stats
+
+    def estimate_row_count(self) -> Optional[int]:
+        """Get the generated row count."""
+        return self.rows
+
+    def _qualified_table_name(self) -> str:
+        """Get the table name."""
+        return "orders"
+
+
+class StubLLM:
+    """Deterministic stand-in for ``openai.ChatCompletion.acreate``.
+
+    SQL requests are answered from ``SQL_WORKLOAD`` by matching the
+    question in the last user message, question suggestions with workload
+    questions, and other requests with a fixed analysis. Each call sleeps
+    for ``latency`` seconds, plus up to ``jitter`` seconds drawn from a
+    seeded generator.
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, seed: int = 0):
+        """Initialize the stub.
+
+        Args:
+            latency: Base seconds per completion.
+            jitter: Maximum extra seconds per completion.
+            seed: Random seed for the jitter.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._sql = dict(SQL_WORKLOAD)
+
+    async def acreate(self, **kwargs: Any) -> Any:
+        """Return a completion after the configured latency."""
+        self.calls += 1
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        messages = kwargs.get("messages", [])
+        prompt = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        )
+        content = next(
+            (sql for question, sql in self._sql.items() if question in prompt),
+            None,
+        )
+        if content is None and "analytical questions" in prompt:
+            content = "\n".join(question for question, _ in SQL_WORKLOAD[:3])
+        if content is None:
+            content = (
+                "Sentiment: mixed. Summary: the customer reports a problem that "
+                "was resolved. Entities: none. Keywords: delivery, support."
+            )
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4
+            ),
+        )
+
+    @contextmanager
+    def installed(self) -> Iterator["StubLLM"]:
+        """Route chat completions to the stub while the context is open."""
+        with patch("openai.ChatCompletion.acreate", self.acreate):
+            yield self
\ No newline at end of file
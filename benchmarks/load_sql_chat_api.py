@@ -0,0 +1,313 @@
+"""In-process load test of the FastAPI SQL chat service.
+
+Sends an open-loop mix of ``/query``, ``/schema`` and ``/suggest-questions``
+requests at a target rate to ``implementations/fastapi/sql_chat_api.py``
+through an ASGI transport, with no server, network or OpenAI access. The
+agent reads a local SQLite stand-in with a fixed-size connection pool and
+gets completions from the stub LLM or a recorded cassette.
+
+Reports latency percentiles and error rates per endpoint, event-loop lag,
+and connection-pool saturation, to size workers and pools before rollout.
+
+Usage:
+    python benchmarks/load_sql_chat_api.py [--rps 50] [--duration 30]
+        [--mix query=8,schema=1,suggest=1] [--rows N] [--pool-size 5]
+        [--executor-workers N] [--llm-latency SECONDS] [--cassette FILE]
+        [--cache] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "implementations", "fastapi"
+    ),
+)
+
+from fixtures import SQL_WORKLOAD, SQLiteConnection, StubLLM  # noqa: E402
+
+SAMPLE_INTERVAL = 0.01
+
+
+def _request(endpoint: str, i: int) -> Dict[str, Any]:
+    """Build the i-th request to an endpoint as httpx arguments."""
+    if endpoint == "query":
+        question = SQL_WORKLOAD[i % len(SQL_WORKLOAD)][0]
+        return {"method": "POST", "url": "/query", "json": {"question": question}}
+    if endpoint == "schema":
+        return {"method": "GET", "url": "/schema"}
+    if endpoint == "suggest":
+        return {"method": "GET", "url": "/suggest-questions", "params": {"n": 3}}
+    raise ValueError(f"Unknown endpoint in mix: {endpoint}")
+
+
+class Sampler:
+    """Samples event-loop lag and pool usage while the test runs."""
+
+    def __init__(self, database: Any):
+        self.database = database
+        self.lag: List[float] = []
+        self.pool: List[Dict[str, int]] = []
+        self.in_flight: List[int] = []
+        self.active = 0
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            self.lag.append(max(loop.time() - start - SAMPLE_INTERVAL, 0.0))
+            status = self.database.pool_status()
+            if status is not None:
+                self.pool.append(status)
+            self.in_flight.append(self.active)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    sampler: Sampler,
+    rps: float,
+    duration: float,
+    mix: Dict[str, float],
+    timeout: float,
+    seed: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Send requests at the target rate regardless of response times.
+
+    Args:
+        client: Client bound to the app.
+        sampler: Sampler tracking in-flight requests.
+        rps: Target requests per second.
+        duration: Seconds to generate load for.
+        mix: Relative weight per endpoint.
+        timeout: Seconds after which a request counts as failed.
+        seed: Random seed for arrivals and endpoint choice.
+
+    Returns:
+        Outcomes per endpoint, each with latency, status and error.
+    """
+    rng = random.Random(seed)
+    endpoints, weights = list(mix), list(mix.values())
+    outcomes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    async def send(endpoint: str, i: int) -> None:
+        sampler.active += 1
+        start = time.perf_counter()
+        status, error = None, None
+        try:
+            response = await asyncio.wait_for(
+                client.request(**_request(endpoint, i)), timeout
+            )
+            status = response.status_code
+            if status >= 400:
+                error = response.text[:200]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            sampler.active -= 1
+        outcomes[endpoint].append(
+            {"latency": time.perf_counter() - start, "status": status, "error": error}
+        )
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    arrival = 0.0
+    tasks = []
+    i = 0
+    # Poisson arrivals at the target rate
+    while arrival < duration:
+        await asyncio.sleep(max(start + arrival - loop.time(), 0))
+        endpoint = rng.choices(endpoints, weights)[0]
+        tasks.append(asyncio.create_task(send(endpoint, i)))
+        i += 1
+        arrival += rng.expovariate(rps)
+    await asyncio.gather(*tasks)
+    return outcomes
+
+
+def summarize(
+    outcomes: Dict[str, List[Dict[str, Any]]], sampler: Sampler, duration: float
+) -> Dict[str, Any]:
+    """Reduce raw outcomes and samples to report figures."""
+    endpoints = {}
+    for endpoint, results in sorted(outcomes.items()):
+        latencies = [r["latency"] for r in results]
+        errors = [r for r in results if r["error"] is not None]
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        endpoints[endpoint] = {
+            "requests": len(results),
+            "error_rate": len(errors) / len(results),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "errors": sorted({e["error"] for e in errors})[:5],
+        }
+
+    lag = np.array(sampler.lag or [0.0])
+    pool: Dict[str, Any] = {}
+    if sampler.pool:
+        checked_out = np.array([s["checked_out"] for s in sampler.pool])
+        size = sampler.pool[-1]["size"]
+        pool = {
+            "size": size,
+            "mean_checked_out": float(checked_out.mean()),
+            "max_checked_out": int(checked_out.max()),
+            "saturated": float((checked_out >= size).mean()),
+        }
+
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "throughput": total / duration,
+        "endpoints": endpoints,
+        "loop_lag": {
+            "p50": float(np.percentile(lag, 50)),
+            "p99": float(np.percentile(lag, 99)),
+            "max": float(lag.max()),
+        },
+        "pool": pool,
+        "max_in_flight": max(sampler.in_flight or [0]),
+    }
+
+
+def print_report(summary: Dict[str, Any], args: argparse.Namespace) -> None:
+    """Print the summary."""
+    print(
+        f"target {args.rps:g} req/s for {args.duration:g}s, "
+        f"achieved {summary['throughput']:.1f} req/s, "
+        f"max in flight {summary['max_in_flight']}"
+    )
+    print(
+        f"\n{'endpoint':<10} {'requests':>9} {'errors':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for endpoint, stats in summary["endpoints"].items():
+        print(
+            f"{endpoint:<10} {stats['requests']:>9} {stats['error_rate']:>8.1%} "
+            f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} "
+            f"{stats['p99'] * 1000:>9.1f}"
+        )
+        for error in stats["errors"]:
+            print(f"{'':<10} error: {error}")
+
+    lag = summary["loop_lag"]
+    print(
+        f"\nevent-loop lag: p50 {lag['p50'] * 1000:.1f} ms, "
+        f"p99 {lag['p99'] * 1000:.1f} ms, max {lag['max'] * 1000:.1f} ms"
+    )
+    pool = summary["pool"]
+    if pool:
+        print(
+            f"connection pool: size {pool['size']}, "
+            f"mean in use {pool['mean_checked_out']:.1f}, "
+            f"max {pool['max_checked_out']}, "
+            f"saturated {pool['saturated']:.0%} of samples"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=float, default=50.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", default="query=8,schema=1,suggest=1")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument(
+        "--executor-workers",
+        type=int,
+        default=None,
+        help="threads for blocking database work (default: asyncio's)",
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--cassette", help="replay completions from this cassette")
+    parser.add_argument(
+        "--cache", action="store_true", help="enable LLM and result caches"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    mix = {
+        name: float(weight)
+        for name, weight in (item.split("=") for item in args.mix.split(","))
+    }
+    for endpoint in mix:
+        _request(endpoint, 0)
+
+    # The service reads its settings from the environment
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["CACHE_BACKEND"] = "memory" if args.cache else "none"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    if args.cassette:
+        os.environ["LLM_CASSETTE_PATH"] = args.cassette
+        os.environ["LLM_CASSETTE_MODE"] = "replay"
+
+    import sql_chat_api
+
+    from ai_analytics.agents import SQLChatAgent
+    from ai_analytics.utils.logging import configure_logging, shutdown_logging
+
+    configure_logging(stream=open(os.devnull, "w"))
+    if args.executor_workers:
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=args.executor_workers)
+        )
+
+    settings = sql_chat_api.get_settings()
+    database = SQLiteConnection(
+        args.rows,
+        seed=args.seed,
+        result_cache=sql_chat_api.get_result_cache(settings),
+        pool_size=args.pool_size,
+    )
+    database.connect()
+    agent = SQLChatAgent(
+        settings, database=database, cache=sql_chat_api.get_cache_backend(settings)
+    )
+    sql_chat_api.app.dependency_overrides[sql_chat_api.get_agent] = lambda: agent
+
+    sampler = Sampler(database)
+    transport = httpx.ASGITransport(app=sql_chat_api.app)
+    stub = StubLLM(latency=args.llm_latency, jitter=args.llm_jitter, seed=args.seed)
+    with stub.installed():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest"
+        ) as client:
+            sampling = asyncio.create_task(sampler.run())
+            try:
+                outcomes = await run_load(
+                    client,
+                    sampler,
+                    args.rps,
+                    args.duration,
+                    mix,
+                    args.timeout,
+                    args.seed,
+                )
+            finally:
+                sampling.cancel()
+
+    shutdown_logging()
+    summary = summarize(outcomes, sampler, args.duration)
+    print_report(summary, args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), **summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
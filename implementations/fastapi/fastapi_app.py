@@ -1,19 +1,51 @@
 """Example FastAPI application using AI Analytics Library."""
 
-from fastapi import FastAPI, HTTPException
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 from ai_analytics import TextAnalysisAgent
 from ai_analytics.agents.text_analysis import TextAnalysisRequest
 from ai_analytics.config import Settings
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import configure_logging, request_context
 
 app = FastAPI(title="AI Analytics API")
 
 # Initialize settings and agent
 settings = Settings()
+configure_logging(settings)
 text_agent = TextAnalysisAgent(settings)
 
 
+@app.middleware("http")
+async def correlate_request_id(request: Request, call_next):
+    """Tag logs of a request with its X-Request-ID, generating one if absent."""
+    with request_context(request.headers.get("X-Request-ID")) as request_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record request latency per route when monitoring is enabled."""
+    if not settings.enable_monitoring:
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REGISTRY.request_seconds.observe(
+        time.perf_counter() - start,
+        path=getattr(route, "path", "unmatched"),
+        method=request.method,
+        status=str(response.status_code),
+    )
+    return response
+
+
 @app.post("/analyze/text")
 async def analyze_text(request: TextAnalysisRequest):
     """Analyze text using the TextAnalysisAgent.
@@ -31,6 +63,16 @@ async def analyze_text(request: TextAnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics endpoint.
+    
+    Returns:
+        Metrics in Prometheus text exposition format.
+    """
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint.
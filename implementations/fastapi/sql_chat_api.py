@@ -1,15 +1,39 @@
 """FastAPI example for SQL Chat functionality."""
 
+import json
 import os
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from ai_analytics.agents import SQLChatAgent, SQLChatRequest, SQLChatResponse
+from ai_analytics.agents import (
+    FederatedRequest,
+    FederatedResponse,
+    FederatedSQLAgent,
+    SQLChatAgent,
+    SQLChatRequest,
+    SQLChatResponse,
+)
+from ai_analytics.agents.jobs import Job, JobManager, QuotaExceeded
+from ai_analytics.agents.routing import create_router
+from ai_analytics.cache import CacheBackend, create_cache_backend
 from ai_analytics.config import Settings
-from ai_analytics.database import BigQueryConnection, PostgresConnection
+from ai_analytics.database import (
+    BigQueryConnection,
+    DatabaseConnection,
+    PostgresConnection,
+    ResultCache,
+)
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import configure_logging, request_context
 
 
 app = FastAPI(
@@ -28,6 +52,32 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def correlate_request_id(request: Request, call_next):
+    """Tag logs of a request with its X-Request-ID, generating one if absent."""
+    with request_context(request.headers.get("X-Request-ID")) as request_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record request latency per route when monitoring is enabled."""
+    if not get_settings().enable_monitoring:
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REGISTRY.request_seconds.observe(
+        time.perf_counter() - start,
+        path=getattr(route, "path", "unmatched"),
+        method=request.method,
+        status=str(response.status_code),
+    )
+    return response
+
+
 class DatabaseConfig(BaseModel):
     """Database configuration model."""
     
@@ -39,7 +89,8 @@ class DatabaseConfig(BaseModel):
     database: Optional[str] = None
     user: Optional[str] = None
     password: Optional[str] = None
-    schema: Optional[str] = "public"
+    # Exposed as "schema"; the attribute name would shadow BaseModel.schema
+    schema_name: Optional[str] = Field("public", alias="schema")
     table: Optional[str] = None
     
     # BigQuery settings
@@ -53,48 +104,108 @@ class DatabaseConfig(BaseModel):
 db_connections = {}
 
 
+@lru_cache()
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings, read once from the environment."""
     return Settings(
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4"),
+        openai_fast_model=os.getenv("OPENAI_FAST_MODEL"),
     )
 
 
+configure_logging(get_settings())
+
+
+# One cache backend serves results, schemas and generated SQL for all
+# connections; with CACHE_BACKEND=sqlite it is shared by every worker process
+cache_backend: Optional[CacheBackend] = None
+result_cache: Optional[ResultCache] = None
+
+
+def get_cache_backend(settings: Settings) -> Optional[CacheBackend]:
+    """Get the process-wide cache backend."""
+    global cache_backend
+    if cache_backend is None:
+        cache_backend = create_cache_backend(settings)
+    return cache_backend
+
+
+def get_result_cache(settings: Settings) -> Optional[ResultCache]:
+    """Get the process-wide query result cache."""
+    global result_cache
+    if result_cache is None and get_cache_backend(settings) is not None:
+        result_cache = ResultCache(
+            max_bytes=settings.result_cache_max_bytes,
+            ttl=settings.result_cache_ttl,
+            unversioned_ttl=settings.result_cache_unversioned_ttl,
+            backend=get_cache_backend(settings),
+        )
+    return result_cache
+
+
+job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get the process-wide background job manager."""
+    global job_manager
+    if job_manager is None:
+        job_manager = JobManager.from_settings(get_settings())
+    return job_manager
+
+
+def _database_key(db_config: DatabaseConfig) -> str:
+    """Identify a configured database."""
+    return f"{db_config.db_type}:{db_config.database or db_config.project_id}"
+
+
+def _connect(db_config: DatabaseConfig, settings: Settings) -> DatabaseConnection:
+    """Create a connection to the configured database."""
+    if db_config.db_type == "postgres":
+        if not all(
+            [db_config.host, db_config.database, db_config.user, db_config.password]
+        ):
+            raise HTTPException(400, "Missing PostgreSQL connection details")
+            
+        return PostgresConnection(
+            host=db_config.host,
+            port=db_config.port,
+            database=db_config.database,
+            user=db_config.user,
+            password=db_config.password,
+            schema=db_config.schema_name,
+            table=db_config.table,
+            result_cache=get_result_cache(settings),
+            cache=get_cache_backend(settings),
+        )
+    if db_config.db_type == "bigquery":
+        if not all([db_config.project_id, db_config.dataset_id, db_config.table_id]):
+            raise HTTPException(400, "Missing BigQuery connection details")
+            
+        return BigQueryConnection(
+            project_id=db_config.project_id,
+            dataset_id=db_config.dataset_id,
+            table_id=db_config.table_id,
+            credentials_json=db_config.credentials_json,
+            result_cache=get_result_cache(settings),
+            cache=get_cache_backend(settings),
+        )
+    raise HTTPException(400, f"Unsupported database type: {db_config.db_type}")
+
+
 def get_agent(db_config: DatabaseConfig = Depends()) -> SQLChatAgent:
     """Get or create SQL Chat Agent for the specified database."""
-    db_key = f"{db_config.db_type}:{db_config.database or db_config.project_id}"
+    db_key = _database_key(db_config)
     
     if db_key not in db_connections:
-        if db_config.db_type == "postgres":
-            if not all([db_config.host, db_config.database, db_config.user, db_config.password]):
-                raise HTTPException(400, "Missing PostgreSQL connection details")
-                
-            db = PostgresConnection(
-                host=db_config.host,
-                port=db_config.port,
-                database=db_config.database,
-                user=db_config.user,
-                password=db_config.password,
-                schema=db_config.schema,
-                table=db_config.table
-            )
-        elif db_config.db_type == "bigquery":
-            if not all([db_config.project_id, db_config.dataset_id, db_config.table_id]):
-                raise HTTPException(400, "Missing BigQuery connection details")
-                
-            db = BigQueryConnection(
-                project_id=db_config.project_id,
-                dataset_id=db_config.dataset_id,
-                table_id=db_config.table_id,
-                credentials_json=db_config.credentials_json
-            )
-        else:
-            raise HTTPException(400, f"Unsupported database type: {db_config.db_type}")
-            
+        settings = get_settings()
+        db = _connect(db_config, settings)
         try:
             db.connect()
-            agent = SQLChatAgent(get_settings(), database=db)
+            agent = SQLChatAgent(
+                settings, database=db, cache=get_cache_backend(settings)
+            )
             db_connections[db_key] = agent
         except Exception as e:
             raise HTTPException(500, f"Failed to connect to database: {str(e)}")
@@ -102,6 +213,77 @@ def get_agent(db_config: DatabaseConfig = Depends()) -> SQLChatAgent:
     return db_connections[db_key]
 
 
+class FederatedQuery(FederatedRequest):
+    """Federated question with the databases it may use."""
+
+    sources: Dict[str, DatabaseConfig] = Field(
+        ..., description="Database configurations by source name"
+    )
+
+
+# Federated agents by source combination, least recently used first, with
+# the connections each one opened itself
+FederatedEntry = Tuple[FederatedSQLAgent, List[DatabaseConnection]]
+federated_agents: "OrderedDict[str, FederatedEntry]" = OrderedDict()
+federated_lock = threading.Lock()
+
+
+def get_federated_agent(request: FederatedQuery) -> FederatedSQLAgent:
+    """Get or create the federated agent for a set of sources.
+
+    Sources reuse the connections of SQL Chat Agents where those exist. At
+    most ``FEDERATED_MAX_AGENTS`` agents are kept; the connections of the
+    least recently used are closed when it is dropped.
+    """
+    sources = {name: _database_key(config) for name, config in request.sources.items()}
+    agent_key = json.dumps(sources, sort_keys=True)
+    with federated_lock:
+        if agent_key in federated_agents:
+            federated_agents.move_to_end(agent_key)
+            return federated_agents[agent_key][0]
+
+    settings = get_settings()
+    databases = {}
+    opened = []
+    try:
+        for name, config in request.sources.items():
+            if sources[name] in db_connections:
+                databases[name] = db_connections[sources[name]].database
+            else:
+                databases[name] = _connect(config, settings)
+                databases[name].connect()
+                opened.append(databases[name])
+        agent = FederatedSQLAgent(
+            settings, databases=databases, cache=get_cache_backend(settings)
+        )
+    except Exception as e:
+        _disconnect(opened)
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(500, f"Failed to connect to database: {str(e)}")
+
+    with federated_lock:
+        if agent_key in federated_agents:
+            # Another request connected the same sources first
+            _disconnect(opened)
+            return federated_agents[agent_key][0]
+        federated_agents[agent_key] = (agent, opened)
+        evicted = []
+        while len(federated_agents) > max(settings.federated_max_agents, 1):
+            evicted.extend(federated_agents.popitem(last=False)[1][1])
+    _disconnect(evicted)
+    return agent
+
+
+def _disconnect(databases: List[DatabaseConnection]) -> None:
+    """Close connections, ignoring ones that fail to close."""
+    for database in databases:
+        try:
+            database.disconnect()
+        except Exception:
+            pass
+
+
 @app.post("/query", response_model=SQLChatResponse)
 async def query_database(
     request: SQLChatRequest,
@@ -115,6 +297,155 @@ async def query_database(
         raise HTTPException(500, f"Query execution failed: {str(e)}")
 
 
+@app.post("/query/progressive")
+async def query_database_progressive(
+    request: SQLChatRequest,
+    agent: SQLChatAgent = Depends(get_agent)
+):
+    """Stream a fast approximate answer followed by the exact one.
+
+    Responses are sent as newline-delimited JSON, one SQLChatResponse per line.
+    """
+    async def responses():
+        try:
+            async for result in agent.execute_progressive(request):
+                yield json.dumps(jsonable_encoder(result)) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": f"Query execution failed: {str(e)}"}) + "\n"
+
+    return StreamingResponse(responses(), media_type="application/x-ndjson")
+
+
+@app.post("/query/stream")
+async def query_database_stream(
+    request: SQLChatRequest,
+    agent: SQLChatAgent = Depends(get_agent)
+):
+    """Stream a query as Server-Sent Events while it runs.
+
+    Sends ``token`` events while the SQL is generated, then ``sql``, ``cost``
+    when the database can estimate it, ``rows`` batches as they are fetched,
+    and finally ``done`` or ``error``.
+    """
+    async def events():
+        async for event in agent.execute_stream(request):
+            data = json.dumps(jsonable_encoder(event["data"]))
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/query/page", response_model=SQLChatResponse)
+async def query_page(
+    cursor: str,
+    agent: SQLChatAgent = Depends(get_agent)
+):
+    """Get the next page of a paged query result.
+
+    Pass the ``next_cursor`` of the previous response; the query is not run
+    again.
+    """
+    try:
+        return await agent.fetch_page(cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except KeyError:
+        raise HTTPException(410, "Cursor expired; run the query again")
+
+
+def get_job(
+    job_id: str,
+    tenant: str = Header("default", alias="X-Tenant-ID"),
+    jobs: JobManager = Depends(get_job_manager),
+) -> Job:
+    """Look up a job of the requesting tenant."""
+    job = jobs.get(job_id, tenant=tenant)
+    if job is None:
+        raise HTTPException(404, f"Job not found: {job_id}")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    request: SQLChatRequest,
+    agent: SQLChatAgent = Depends(get_agent),
+    tenant: str = Header("default", alias="X-Tenant-ID"),
+    jobs: JobManager = Depends(get_job_manager),
+):
+    """Run a query in the background and return its job id at once."""
+    try:
+        job = jobs.submit(agent, request, tenant=tenant)
+    except QuotaExceeded as e:
+        raise HTTPException(429, str(e))
+    return job.summary()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job: Job = Depends(get_job)):
+    """Get the status of a job."""
+    return job.summary()
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job: Job = Depends(get_job),
+    jobs: JobManager = Depends(get_job_manager),
+):
+    """Stream job status changes until the job finishes.
+
+    Events are sent as newline-delimited JSON, one job status per line.
+    """
+    async def events():
+        async for event in jobs.events(job):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10_000),
+    job: Job = Depends(get_job),
+    jobs: JobManager = Depends(get_job_manager),
+):
+    """Get a page of the results of a finished job."""
+    if not job.finished:
+        raise HTTPException(409, f"Job is {job.status.value}")
+    if job.result is None:
+        raise HTTPException(500, f"Job {job.status.value}: {job.error}")
+    return jsonable_encoder(jobs.results(job, offset=offset, limit=limit))
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(
+    job: Job = Depends(get_job),
+    jobs: JobManager = Depends(get_job_manager),
+):
+    """Cancel a queued or running job."""
+    jobs.cancel(job.id)
+    return job.summary()
+
+
+@app.post("/federated/query", response_model=FederatedResponse)
+async def query_federated(
+    request: FederatedQuery,
+    agent: FederatedSQLAgent = Depends(get_federated_agent)
+):
+    """Answer a question across several databases, combining results locally."""
+    try:
+        return await agent.execute(
+            FederatedRequest(**request.dict(exclude={"sources"}))
+        )
+    except Exception as e:
+        raise HTTPException(500, f"Query execution failed: {str(e)}")
+
+
 @app.get("/schema")
 async def get_schema(agent: SQLChatAgent = Depends(get_agent)):
     """Get database schema and sample data."""
@@ -124,6 +455,22 @@ async def get_schema(agent: SQLChatAgent = Depends(get_agent)):
         raise HTTPException(500, f"Failed to get schema: {str(e)}")
 
 
+@app.get("/tables")
+def get_table_previews(
+    tables: Optional[List[str]] = Query(
+        None, description="Tables to preview; all when omitted"
+    ),
+    agent: SQLChatAgent = Depends(get_agent),
+):
+    """Get the columns and sample rows of many tables at once."""
+    if not hasattr(agent.database, "get_table_previews"):
+        raise HTTPException(400, "Table previews are not supported for this database")
+    try:
+        return agent.database.get_table_previews(tables)
+    except Exception as e:
+        raise HTTPException(500, f"Failed to preview tables: {str(e)}")
+
+
 @app.get("/suggest-questions", response_model=List[str])
 async def suggest_questions(
     n: int = 3,
@@ -136,6 +483,23 @@ async def suggest_questions(
         raise HTTPException(500, f"Failed to generate questions: {str(e)}")
 
 
+@app.get("/models")
+async def get_model_stats():
+    """Per-model request counts, latency, tokens, cost and success rates."""
+    router = create_router(get_settings())
+    return {
+        "strong_model": router.strong_model,
+        "fast_model": router.fast_model,
+        "models": router.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics endpoint."""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
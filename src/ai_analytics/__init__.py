@@ -1,7 +1,37 @@
-"""AI Analytics Library - A modular AI analytics library with deployable agents."""
+"""AI Analytics Library - A modular AI analytics library with deployable agents.
 
-from ai_analytics.agents import TextAnalysisAgent, ImageAnalysisAgent, DataAnalysisAgent
-from ai_analytics.config import Settings
+Agents and their dependencies are imported on first attribute access, so
+``import ai_analytics`` stays cheap for tools that only need part of it.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from ai_analytics.agents import SQLChatAgent, SQLChatRequest, TextAnalysisAgent
+    from ai_analytics.config import Settings
 
 __version__ = "0.1.0"
-__all__ = ["TextAnalysisAgent", "ImageAnalysisAgent", "DataAnalysisAgent", "Settings"]
\ No newline at end of file
+
+_LAZY_ATTRIBUTES = {
+    "TextAnalysisAgent": "ai_analytics.agents.text_analysis",
+    "SQLChatAgent": "ai_analytics.agents.sql_chat",
+    "SQLChatRequest": "ai_analytics.agents.sql_chat",
+    "Settings": "ai_analytics.config",
+}
+
+__all__ = ["TextAnalysisAgent", "SQLChatAgent", "SQLChatRequest", "Settings"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public attributes on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including lazy ones."""
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
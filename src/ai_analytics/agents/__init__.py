@@ -1,6 +1,49 @@
 """AI Analytics Agents package."""
 
-from ai_analytics.agents.text_analysis import TextAnalysisAgent
-from ai_analytics.agents.sql_chat import SQLChatAgent, SQLChatRequest, SQLChatResponse
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["TextAnalysisAgent", "SQLChatAgent", "SQLChatRequest", "SQLChatResponse"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from ai_analytics.agents.federated import (
+        FederatedRequest, FederatedResponse, FederatedSQLAgent,
+    )
+    from ai_analytics.agents.sql_chat import (
+        SQLChatAgent, SQLChatRequest, SQLChatResponse,
+    )
+    from ai_analytics.agents.text_analysis import TextAnalysisAgent
+
+# Agents load on first access, so using one does not import the others'
+# dependencies (pandas and the database backends for SQLChatAgent)
+_LAZY_ATTRIBUTES = {
+    "TextAnalysisAgent": "ai_analytics.agents.text_analysis",
+    "SQLChatAgent": "ai_analytics.agents.sql_chat",
+    "SQLChatRequest": "ai_analytics.agents.sql_chat",
+    "SQLChatResponse": "ai_analytics.agents.sql_chat",
+    "FederatedSQLAgent": "ai_analytics.agents.federated",
+    "FederatedRequest": "ai_analytics.agents.federated",
+    "FederatedResponse": "ai_analytics.agents.federated",
+}
+
+__all__ = [
+    "TextAnalysisAgent",
+    "SQLChatAgent",
+    "SQLChatRequest",
+    "SQLChatResponse",
+    "FederatedSQLAgent",
+    "FederatedRequest",
+    "FederatedResponse",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import agents on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including lazy ones."""
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -1,30 +1,56 @@
 """Base agent implementation for AI Analytics Library."""
 
+import asyncio
+import hashlib
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
 
-from tenacity import retry, stop_after_attempt, wait_exponential
+import openai
+from tenacity import (
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
+from ai_analytics.agents.cassette import CassetteMiss, create_cassette, stream_content
+from ai_analytics.agents.routing import create_router
+from ai_analytics.cache import CacheBackend, create_cache_backend
 from ai_analytics.config import Settings
-from ai_analytics.utils.logging import get_logger
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import get_logger, get_request_id, request_context
+
+T = TypeVar("T")
+
+
+class PermanentError(RuntimeError):
+    """Raised for failures that retrying the whole request would repeat."""
 
 
 class BaseAgent(ABC):
     """Base class for all AI agents in the library."""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, cache: Optional[CacheBackend] = None):
         """Initialize the base agent.
         
         Args:
             settings: Configuration settings for the agent.
+            cache: Cache backend for LLM outputs; created from settings
+                when omitted.
         """
         self.settings = settings
-        self.logger = get_logger(self.__class__.__name__)
+        self.cache = cache if cache is not None else create_cache_backend(settings)
+        self.cassette = create_cassette(settings)
+        self.router = create_router(settings)
+        self.logger = get_logger(self.__class__.__name__, settings)
         self._setup()
 
     def _setup(self) -> None:
         """Set up the agent with necessary configurations."""
-        self.logger.info(f"Initializing {self.__class__.__name__}")
+        self.logger.info("Initializing %s", self.__class__.__name__)
         self._validate_settings()
         self._initialize_client()
 
@@ -40,7 +66,10 @@ class BaseAgent(ABC):
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        # A replay miss or rejected SQL is deterministic, retrying only
+        # delays the failure
+        retry=retry_if_not_exception_type((CassetteMiss, PermanentError)),
     )
     async def execute(self, input_data: Any) -> Dict[str, Any]:
         """Execute the agent's main functionality.
@@ -51,14 +80,165 @@ class BaseAgent(ABC):
         Returns:
             Dict containing the results of the agent's execution.
         """
+        # Keep the caller's request id, e.g. from an HTTP header, if one is set
+        with request_context(get_request_id()):
+            try:
+                self.logger.info("Executing %s", self.__class__.__name__)
+                if not self.settings.enable_monitoring:
+                    result = await self._process(input_data)
+                else:
+                    with metrics.trace(self.__class__.__name__) as trace:
+                        with metrics.span("total"):
+                            result = await self._process(input_data)
+                        trace.publish()
+                    result["metrics"] = trace.summary()
+                self.logger.info("Execution completed successfully")
+                return result
+            except Exception as e:
+                self.logger.error("Error during execution: %s", e)
+                raise
+
+    async def _chat_completion(self, **kwargs: Any) -> Any:
+        """Call the chat completion API, recording latency and token usage.
+
+        With a cassette configured, completions are recorded to or replayed
+        from it instead. Calls are recorded per model in the router.
+
+        Args:
+            **kwargs: Arguments for ``openai.ChatCompletion.acreate``.
+
+        Returns:
+            The completion response.
+        """
+        start = time.perf_counter()
         try:
-            self.logger.info(f"Executing {self.__class__.__name__}")
-            result = await self._process(input_data)
-            self.logger.info(f"Execution completed successfully")
-            return result
-        except Exception as e:
-            self.logger.error(f"Error during execution: {str(e)}")
+            with metrics.span("llm"):
+                if self.cassette is not None:
+                    response = await self.cassette.complete(
+                        openai.ChatCompletion.acreate, **kwargs
+                    )
+                else:
+                    response = await openai.ChatCompletion.acreate(**kwargs)
+        except Exception:
+            self.router.record_call(
+                kwargs.get("model"), time.perf_counter() - start, error=True
+            )
             raise
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        self.router.record_call(
+            kwargs.get("model"),
+            time.perf_counter() - start,
+            prompt_tokens,
+            completion_tokens,
+        )
+        if usage is not None:
+            metrics.record("prompt_tokens", prompt_tokens)
+            metrics.record("completion_tokens", completion_tokens)
+        return response
+
+    async def _chat_completion_stream(self, **kwargs: Any) -> AsyncIterator[str]:
+        """Stream a chat completion, recording time to first token.
+
+        With a cassette configured, completions are recorded to or replayed
+        from it instead.
+
+        Args:
+            **kwargs: Arguments for ``openai.ChatCompletion.acreate``, without
+                ``stream``.
+
+        Yields:
+            Pieces of the completion content as they are generated.
+        """
+        start = time.perf_counter()
+        pieces = 0
+        try:
+            with metrics.span("llm"):
+                if self.cassette is not None:
+                    chunks = self.cassette.stream(
+                        openai.ChatCompletion.acreate, **kwargs
+                    )
+                else:
+                    chunks = stream_content(
+                        await openai.ChatCompletion.acreate(stream=True, **kwargs)
+                    )
+                async for text in chunks:
+                    if not pieces:
+                        metrics.record_timing(
+                            "llm_first_token", time.perf_counter() - start
+                        )
+                    pieces += 1
+                    yield text
+        except Exception:
+            self.router.record_call(
+                kwargs.get("model"), time.perf_counter() - start, error=True
+            )
+            raise
+        # Streamed responses carry no usage; each piece is about one token
+        self.router.record_call(
+            kwargs.get("model"), time.perf_counter() - start, completion_tokens=pieces
+        )
+        metrics.record("completion_tokens", pieces)
+
+    async def _run_blocking(self, stage: str, func: Callable[..., T], *args: Any) -> T:
+        """Run blocking work in a thread, timing queueing and execution.
+
+        Args:
+            stage: Stage name for the execution time.
+            func: Blocking callable.
+            *args: Arguments for the callable.
+
+        Returns:
+            The callable's return value.
+        """
+        if not metrics.enabled():
+            return await asyncio.to_thread(func, *args)
+
+        submitted = time.perf_counter()
+
+        def run() -> T:
+            metrics.record_timing("queue", time.perf_counter() - submitted)
+            with metrics.span(stage):
+                return func(*args)
+
+        return await asyncio.to_thread(run)
+
+    async def _iter_blocking(
+        self, stage: str, iterator: Iterator[T]
+    ) -> AsyncIterator[T]:
+        """Iterate a blocking iterator, fetching each item in a thread.
+
+        Args:
+            stage: Stage name for the time spent fetching items.
+            iterator: Blocking iterator, closed when iteration stops early.
+
+        Yields:
+            The iterator's items.
+        """
+        lock = threading.Lock()
+        done = object()
+
+        def fetch() -> Any:
+            with lock:
+                return next(iterator, done)
+
+        def close() -> None:
+            with lock:
+                close_iterator = getattr(iterator, "close", None)
+                if close_iterator is not None:
+                    close_iterator()
+
+        try:
+            while True:
+                item = await self._run_blocking(stage, fetch)
+                if item is done:
+                    return
+                yield item
+        finally:
+            # A fetch may still be running in its thread after cancellation;
+            # close once it returns, without waiting here
+            asyncio.get_running_loop().run_in_executor(None, close)
 
     @abstractmethod
     async def _process(self, input_data: Any) -> Dict[str, Any]:
@@ -72,6 +252,19 @@ class BaseAgent(ABC):
         """
         pass
 
+    def _cache_key(self, namespace: str, *parts: Any) -> str:
+        """Build a namespaced cache key from JSON-serializable parts.
+
+        Args:
+            namespace: Key prefix identifying the kind of cached value.
+            *parts: Values that determine the cached output.
+
+        Returns:
+            Cache key string.
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str).encode()
+        return f"{namespace}:{hashlib.sha256(payload).hexdigest()}"
+
     def get_metadata(self) -> Dict[str, Any]:
         """Get agent metadata.
         
@@ -0,0 +1,253 @@
+"""Record and replay of LLM completions for offline, reproducible runs."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ai_analytics.config import Settings
+
+_MODES = {"record", "replay"}
+
+_open_cassettes: Dict[str, "Cassette"] = {}
+_open_lock = threading.Lock()
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """File of recorded chat completions keyed by request.
+
+    In ``record`` mode each completion is forwarded to the real API and
+    appended to the file with its token usage and observed latency. In
+    ``replay`` mode completions are served from the file; a request whose
+    prompt, model or parameters changed since recording raises
+    CassetteMiss. Requests recorded several times are replayed in turn.
+    Streamed and non-streamed requests share recordings.
+
+    The file is gzip-compressed JSON lines, one completion per line.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 0.0):
+        """Initialize the cassette.
+
+        Args:
+            path: Cassette file path.
+            mode: ``record`` or ``replay``.
+            latency_scale: In replay mode, sleep for the recorded latency
+                times this factor; 0 replays instantly.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in _MODES:
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._replayed: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {path}")
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Build the lookup key of a completion request.
+
+        Args:
+            request: Keyword arguments of the completion call.
+
+        Returns:
+            Hex digest of the canonical request.
+        """
+        payload = json.dumps(request, sort_keys=True, default=str).encode()
+        return hashlib.sha256(payload).hexdigest()
+
+    async def complete(
+        self, create: Callable[..., Awaitable[Any]], **kwargs: Any
+    ) -> Any:
+        """Get a completion from the cassette or the API.
+
+        Args:
+            create: Completion function called in record mode.
+            **kwargs: Arguments of the completion call.
+
+        Returns:
+            The completion response.
+
+        Raises:
+            CassetteMiss: In replay mode, if the request was not recorded.
+        """
+        key = self.make_key(kwargs)
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = await create(**kwargs)
+            self._append(
+                key,
+                kwargs,
+                response.choices[0].message.content,
+                getattr(response, "usage", None),
+                time.perf_counter() - start,
+            )
+            return response
+
+        entry = self._replay(key, kwargs)
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["latency"] * self.latency_scale)
+        return _response(entry)
+
+    async def stream(
+        self, create: Callable[..., Awaitable[Any]], **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream a completion from the cassette or the API.
+
+        Replayed content is yielded in word-sized pieces.
+
+        Args:
+            create: Completion function called with ``stream=True`` in
+                record mode.
+            **kwargs: Arguments of the completion call, without ``stream``.
+
+        Yields:
+            Pieces of the completion content.
+
+        Raises:
+            CassetteMiss: In replay mode, if the request was not recorded.
+        """
+        key = self.make_key(kwargs)
+        if self.mode == "record":
+            start = time.perf_counter()
+            parts = []
+            async for text in stream_content(await create(stream=True, **kwargs)):
+                parts.append(text)
+                yield text
+            self._append(key, kwargs, "".join(parts), None, time.perf_counter() - start)
+            return
+
+        entry = self._replay(key, kwargs)
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["latency"] * self.latency_scale)
+        for piece in re.findall(r"\S+\s*|\s+", entry["content"]):
+            yield piece
+
+    def _replay(self, key: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the next recorded completion of a request."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(
+                    f"No recorded completion for request {key[:12]} "
+                    f"(model {request.get('model')}); "
+                    f"re-record the cassette {self.path}"
+                )
+            entry = entries[self._replayed[key] % len(entries)]
+            self._replayed[key] += 1
+            self.hits += 1
+        return entry
+
+    def _load(self) -> None:
+        """Read recorded completions from the file."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def _append(
+        self,
+        key: str,
+        request: Dict[str, Any],
+        content: str,
+        usage: Any,
+        latency: float,
+    ) -> None:
+        """Add a completion to the file."""
+        entry = {
+            "key": key,
+            "request": request,
+            "content": content,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "latency": round(latency, 4),
+        }
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            self._entries[key].append(entry)
+            # Each append is a complete gzip member, so the file stays
+            # readable if the process stops mid-run
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+
+
+async def stream_content(chunks: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Extract the content pieces from a streamed completion.
+
+    Args:
+        chunks: Chunks returned by ``acreate(stream=True)``.
+
+    Yields:
+        Non-empty content deltas.
+    """
+    async for chunk in chunks:
+        if not chunk.choices:
+            continue
+        text = getattr(chunk.choices[0].delta, "content", None)
+        if text:
+            yield text
+
+
+def _response(entry: Dict[str, Any]) -> Any:
+    """Build a response object shaped like the API's from a recording."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(role="assistant", content=entry["content"]),
+            finish_reason="stop",
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=entry["prompt_tokens"],
+            completion_tokens=entry["completion_tokens"],
+            total_tokens=(
+                (entry["prompt_tokens"] or 0) + (entry["completion_tokens"] or 0)
+            ),
+        ),
+    )
+
+
+def create_cassette(settings: Settings) -> Optional[Cassette]:
+    """Get the cassette configured in settings.
+
+    Agents configured with the same file share one Cassette instance.
+
+    Args:
+        settings: Settings with the ``llm_cassette_*`` options.
+
+    Returns:
+        Cassette, or None if no cassette file is configured.
+    """
+    if not settings.llm_cassette_path:
+        return None
+    path = os.path.abspath(settings.llm_cassette_path)
+    with _open_lock:
+        cassette = _open_cassettes.get(path)
+        if cassette is None or cassette.mode != settings.llm_cassette_mode:
+            cassette = _open_cassettes[path] = Cassette(
+                path,
+                mode=settings.llm_cassette_mode,
+                latency_scale=settings.llm_cassette_latency_scale,
+            )
+        return cassette
\ No newline at end of file
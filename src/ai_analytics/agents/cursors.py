@@ -0,0 +1,146 @@
+"""Server-side result cursors for paging through query results."""
+
+import base64
+import io
+import json
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ai_analytics.cache import BoundedCacheBackend, CacheBackend, MemoryCacheBackend
+from ai_analytics.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CursorStore:
+    """Keeps query results so later pages are read without re-executing.
+
+    Each page of a result is stored as its own Parquet entry, so reading a
+    page fetches and decodes only that page. Cursors live in a cache
+    backend; with a shared backend any worker process can serve the next
+    page. The bytes of stored pages are bounded by ``max_bytes`` either
+    way, so cursors neither evict nor get evicted by other cached values.
+    Cursors expire ``ttl`` seconds after the query ran.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 900.0,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        """Initialize the cursor store.
+
+        Args:
+            backend: Cache backend to keep results in; an in-process one is
+                used when omitted.
+            ttl: Seconds a cursor stays readable.
+            max_bytes: Maximum total size of the stored pages.
+        """
+        self.ttl = ttl
+        if backend is None:
+            self.backend: CacheBackend = MemoryCacheBackend(
+                max_bytes=max_bytes, default_ttl=ttl
+            )
+        else:
+            self.backend = BoundedCacheBackend(backend, max_bytes)
+
+    def create(
+        self, df: pd.DataFrame, page_size: int, metadata: Dict[str, Any]
+    ) -> Optional[str]:
+        """Store a result whose first page has been returned.
+
+        Args:
+            df: Complete result.
+            page_size: Rows per page.
+            metadata: JSON-serializable values returned with every page,
+                such as the question and the SQL.
+
+        Returns:
+            Cursor for the second page, or None if the result fits on one.
+        """
+        if len(df) <= page_size:
+            return None
+
+        cursor_id = uuid.uuid4().hex
+        for start in range(page_size, len(df), page_size):
+            page = _to_parquet(df.iloc[start:start + page_size])
+            key = f"cursor:{cursor_id}:{start // page_size}"
+            self.backend.set(key, page, ttl=self.ttl)
+        metadata = {
+            **metadata,
+            "page_size": page_size,
+            "total_rows": len(df),
+            "columns": [str(column) for column in df.columns],
+        }
+        encoded = json.dumps(metadata, default=str).encode()
+        self.backend.set(f"cursor:{cursor_id}:meta", encoded, ttl=self.ttl)
+        return _encode(cursor_id, page_size)
+
+    def fetch(
+        self, cursor: str
+    ) -> Tuple[pd.DataFrame, Dict[str, Any], Optional[str]]:
+        """Read the page a cursor points to.
+
+        Args:
+            cursor: Cursor from ``create`` or a previous ``fetch``.
+
+        Returns:
+            Tuple of the page, the stored metadata and the cursor for the
+            following page, or None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+            KeyError: If the cursor expired or was evicted.
+        """
+        cursor_id, offset = _decode(cursor)
+        raw_metadata = self.backend.get(f"cursor:{cursor_id}:meta")
+        if raw_metadata is None:
+            raise KeyError(f"Cursor expired: {cursor}")
+
+        metadata = json.loads(raw_metadata)
+        page_size, total_rows = metadata["page_size"], metadata["total_rows"]
+        if offset >= total_rows:
+            page = pd.DataFrame(columns=metadata["columns"])
+        else:
+            payload = self.backend.get(f"cursor:{cursor_id}:{offset // page_size}")
+            if payload is None:
+                raise KeyError(f"Cursor expired: {cursor}")
+            page = pd.read_parquet(io.BytesIO(payload))
+
+        next_offset = offset + page_size
+        if next_offset >= total_rows:
+            return page, metadata, None
+        return page, metadata, _encode(cursor_id, next_offset)
+
+
+def _to_parquet(page: pd.DataFrame) -> bytes:
+    """Serialize a page as Parquet."""
+    buffer = io.BytesIO()
+    try:
+        page.to_parquet(buffer, index=False)
+    except Exception as e:
+        # Mixed-type object columns cannot be stored as Parquet as-is
+        logger.debug("Storing cursor columns as strings: %s", e)
+        buffer = io.BytesIO()
+        text_columns = {col: str for col in page.columns if page[col].dtype == object}
+        page.astype(text_columns).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _encode(cursor_id: str, offset: int) -> str:
+    """Build an opaque cursor string."""
+    encoded = base64.urlsafe_b64encode(f"{cursor_id}:{offset}".encode())
+    return encoded.decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Tuple[str, int]:
+    """Split a cursor string into result id and row offset."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_id, offset = base64.urlsafe_b64decode(padded).decode().split(":")
+        return cursor_id, int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
\ No newline at end of file
@@ -0,0 +1,394 @@
+"""Federated agent answering questions across several databases."""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple
+
+import openai
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from ai_analytics.agents.base import BaseAgent, PermanentError
+from ai_analytics.agents.session import LocalOperation
+from ai_analytics.cache import CacheBackend
+from ai_analytics.database.base import DatabaseConnection, TableSchema
+from ai_analytics.database.frames import to_records
+from ai_analytics.database.sql import apply_limit
+from ai_analytics.utils import metrics
+
+_PLAN_PROMPT = """You answer questions over several databases that cannot query each
+other. Each source is a separate database with its own SQL dialect:
+
+{sources}
+
+Respond with ONLY a JSON object of this form:
+{{"queries": [{{"name": "...", "source": "...", "sql": "..."}}],
+"join": {{"on": [], "how": "inner"}},
+"combine": {{"filters": [], "group_by": [], "aggregations": [], "sort": [],
+"columns": [], "limit": null}}}}
+
+Rules:
+1. Each query reads tables of one source only, in that source's dialect. Use a single
+   query when the question needs only one source.
+2. Push filters, grouping and aggregation into the queries, so each returns as few rows
+   as possible; at most {max_rows} rows per query are accepted.
+3. Query results are combined in order: joined on the "on" columns, which every query
+   must return under the same names, with "how" being inner, left, right or outer; or,
+   when "on" is empty, stacked, which needs the same columns in every query.
+4. "combine" is applied to the combined rows. Its filter ops are ==, !=, >, >=, <, <=,
+   in, not in and contains; its aggregation funcs are sum, mean, median, min, max, count
+   and nunique. Aggregate again here to merge partial aggregates, e.g. sum of counts.
+   Leave it empty if the combined rows answer the question."""
+
+_REPAIR_PROMPT = """The plan failed:
+{error}
+
+Respond with ONLY the corrected JSON plan."""
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+class SourceQuery(BaseModel):
+    """SQL pushed down to one source."""
+
+    name: str
+    source: str
+    sql: str
+
+
+class JoinSpec(BaseModel):
+    """How the results of the source queries are combined."""
+
+    on: List[str] = Field(default_factory=list)
+    how: Literal["inner", "left", "right", "outer"] = "inner"
+
+
+class FederatedPlan(BaseModel):
+    """Source queries and the local steps combining their results."""
+
+    queries: List[SourceQuery]
+    join: JoinSpec = Field(default_factory=JoinSpec)
+    combine: LocalOperation = Field(default_factory=LocalOperation)
+
+
+class FederatedRequest(BaseModel):
+    """Request model for federated questions."""
+
+    question: str = Field(..., description="Natural language question to answer")
+    max_results: Optional[int] = Field(
+        100, description="Maximum number of rows to return"
+    )
+
+
+class FederatedResponse(BaseModel):
+    """Response model for federated questions."""
+
+    question: str
+    queries: List[Dict[str, Any]] = Field(
+        ..., description="Name, source, SQL and row count of each source query"
+    )
+    join: Dict[str, Any]
+    combine: Dict[str, Any]
+    results: List[Dict[str, Any]]
+    column_names: List[str]
+    execution_time: float
+    row_count: int
+    repairs: int = Field(0, description="Times the plan was corrected after failing")
+
+
+class FederatedSQLAgent(BaseAgent):
+    """Agent answering questions that span several databases.
+
+    The LLM plans one query per source it needs, pushing filters and
+    aggregation down to the sources. The queries run concurrently, each
+    capped at ``federated_max_source_rows`` rows, and their results are
+    joined or stacked and then filtered, aggregated and sorted locally with
+    vectorized pandas operations. Plans that fail validation, exceed the
+    row cap or cannot be combined are sent back to the LLM with the error,
+    up to ``sql_repair_attempts`` times.
+    """
+
+    def __init__(
+        self,
+        settings: Any,
+        databases: Mapping[str, DatabaseConnection],
+        cache: Optional[CacheBackend] = None,
+    ):
+        """Initialize Federated SQL Agent.
+
+        Args:
+            settings: Configuration settings
+            databases: Database connections by source name
+            cache: Cache backend for generated plans (optional)
+        """
+        if not databases:
+            raise ValueError("At least one database is required")
+        # Set before the base initializer, which loads the schemas through them
+        self.databases = dict(databases)
+        self.schemas: Dict[str, TableSchema] = {}
+        super().__init__(settings, cache)
+
+    def _validate_settings(self) -> None:
+        """Validate required settings."""
+        if not self.settings.openai_api_key:
+            raise ValueError("OpenAI API key is required")
+
+    def _initialize_client(self) -> None:
+        """Initialize OpenAI client and load the schema of every source."""
+        openai.api_key = self.settings.openai_api_key
+        self.schemas = {
+            name: database.get_profiled_schema()
+            for name, database in self.databases.items()
+        }
+
+    def _build_system_prompt(self) -> str:
+        """Build system prompt for federated planning.
+
+        Returns:
+            Formatted system prompt string
+        """
+        sources = []
+        for name, schema in self.schemas.items():
+            schema_str = json.dumps(schema.dict(exclude={"column_stats"}), indent=2)
+            stats_str = schema.format_column_stats()
+            if stats_str:
+                schema_str += f"\nColumn value profile (approximate):\n{stats_str}"
+            dialect = self.databases[name].__class__.__name__
+            sources.append(f'Source "{name}" ({dialect}):\n{schema_str}')
+        return _PLAN_PROMPT.format(
+            sources="\n\n".join(sources),
+            max_rows=self.settings.federated_max_source_rows,
+        )
+
+    async def _process(self, input_data: FederatedRequest) -> Dict[str, Any]:
+        """Plan, run and combine the source queries for a question.
+
+        Args:
+            input_data: FederatedRequest containing the question
+
+        Returns:
+            Dict containing the combined results and the plan
+
+        Raises:
+            PermanentError: If the plan still fails after the repairs; errors
+                running the source queries are raised as they are
+        """
+        start_time = time.time()
+        messages = [
+            {"role": "system", "content": self._build_system_prompt()},
+            {"role": "user", "content": input_data.question},
+        ]
+        key = self._cache_key("federated", self.settings.openai_model, messages)
+
+        repairs: List[Tuple[str, str]] = []
+        while True:
+            content = await self._generate(messages, key, repairs)
+            try:
+                plan = _parse_plan(content)
+                await self._validate(plan)
+                partials = await self._run_queries(plan)
+                with metrics.span("local_operation"):
+                    results_df = _combine(plan, partials)
+                break
+            except (ValueError, KeyError, TypeError) as e:
+                error = str(e)
+            if len(repairs) >= self.settings.sql_repair_attempts:
+                if self.cache is not None:
+                    self.cache.delete(key)
+                self.logger.error("Federated plan failed: %s", error)
+                raise PermanentError(f"Failed to answer federated question: {error}")
+            self.logger.warning("Federated plan failed, repairing: %s", error)
+            metrics.record("sql_repairs")
+            repairs.append((content, error))
+
+        if repairs and self.cache is not None:
+            # Serve the repaired plan for the question from now on
+            self.cache.set(key, content.encode())
+
+        if input_data.max_results:
+            results_df = results_df.head(input_data.max_results)
+        with metrics.span("dataframe_conversion"):
+            results = to_records(results_df)
+        return FederatedResponse(
+            question=input_data.question,
+            queries=[
+                {**query.dict(), "row_count": len(partials[query.name])}
+                for query in plan.queries
+            ],
+            join=plan.join.dict(),
+            combine=plan.combine.dict(),
+            results=results,
+            column_names=list(results_df.columns),
+            execution_time=time.time() - start_time,
+            row_count=len(results),
+            repairs=len(repairs),
+        ).dict()
+
+    async def _generate(
+        self,
+        messages: List[Dict[str, str]],
+        key: str,
+        repairs: List[Tuple[str, str]],
+    ) -> str:
+        """Ask the LLM for a plan, or to correct failed plans.
+
+        Args:
+            messages: System prompt and question
+            key: Cache key of the question's plan
+            repairs: Earlier plans and the error each failed with
+
+        Returns:
+            Raw completion content
+        """
+        if not repairs and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                metrics.record("sql_cache_hits")
+                return cached.decode()
+            metrics.record("sql_cache_misses")
+
+        messages = list(messages)
+        for previous, error in repairs:
+            messages.append({"role": "assistant", "content": previous})
+            messages.append(
+                {"role": "user", "content": _REPAIR_PROMPT.format(error=error)}
+            )
+        response = await self._chat_completion(
+            model=self.settings.openai_model,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=1000,
+        )
+        content: str = response.choices[0].message.content.strip()
+        if not repairs and self.cache is not None:
+            self.cache.set(key, content.encode())
+        return content
+
+    async def _validate(self, plan: FederatedPlan) -> None:
+        """Check every source query with its database, without running it.
+
+        Raises:
+            ValueError: Listing the queries that failed and their errors
+        """
+        errors = []
+        for query in plan.queries:
+            if query.source not in self.databases:
+                errors.append(f"{query.name}: unknown source {query.source!r}")
+            elif not self.databases[query.source].validate_query(query.sql):
+                errors.append(f"{query.name}: not a read-only query")
+        if errors:
+            raise ValueError("\n".join(errors))
+        if not self.settings.sql_validation:
+            return
+
+        checks = await asyncio.gather(
+            *(
+                self._run_blocking(
+                    "sql_validation",
+                    self.databases[query.source].check_query,
+                    query.sql,
+                )
+                for query in plan.queries
+            ),
+            return_exceptions=True,
+        )
+        for query, result in zip(plan.queries, checks):
+            if isinstance(result, Exception):
+                self.logger.warning("Could not validate %s: %s", query.name, result)
+            elif result is not None:
+                errors.append(f"{query.name}: {result}")
+        if errors:
+            raise ValueError("\n".join(errors))
+
+    async def _run_queries(self, plan: FederatedPlan) -> Dict[str, pd.DataFrame]:
+        """Run the source queries concurrently, each capped in rows.
+
+        Returns:
+            Result of each query by name
+
+        Raises:
+            ValueError: If a query returned more rows than allowed
+            Exception: The error of the first query that failed to run,
+                left to the request retry rather than repaired as a plan
+                error
+        """
+        max_rows = self.settings.federated_max_source_rows
+        results = await asyncio.gather(
+            *(
+                self._run_blocking(
+                    "sql_execution",
+                    self.databases[query.source].execute_query,
+                    # One extra row shows whether the cap cut the result
+                    apply_limit(query.sql, max_rows + 1),
+                )
+                for query in plan.queries
+            ),
+            return_exceptions=True,
+        )
+
+        frames: List[pd.DataFrame] = []
+        for query, result in zip(plan.queries, results):
+            if isinstance(result, BaseException):
+                self.logger.warning("Federated query %s failed: %s", query.name, result)
+                raise result
+            frames.append(result)
+
+        partials, errors = {}, []
+        for query, result in zip(plan.queries, frames):
+            if len(result) > max_rows:
+                errors.append(
+                    f"{query.name}: returned more than {max_rows} rows; filter or "
+                    "aggregate more in the query"
+                )
+            else:
+                partials[query.name] = result
+        if errors:
+            raise ValueError("\n".join(errors))
+        return partials
+
+
+def _parse_plan(content: str) -> FederatedPlan:
+    """Parse a plan from completion content.
+
+    Raises:
+        ValueError: If the content is not a valid plan
+    """
+    plan = FederatedPlan.parse_obj(json.loads(_CODE_FENCE.sub("", content.strip())))
+    if not plan.queries:
+        raise ValueError("The plan has no queries")
+    names = [query.name for query in plan.queries]
+    if len(set(names)) < len(names):
+        raise ValueError(f"Query names must be unique: {names}")
+    return plan
+
+
+def _combine(plan: FederatedPlan, partials: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Join or stack the source results, then apply the local operation.
+
+    Raises:
+        ValueError: If join columns are missing or the operation is invalid
+    """
+    frames = [partials[query.name] for query in plan.queries]
+    keys = plan.join.on
+    if not keys:
+        combined = pd.concat(frames, ignore_index=True)
+    else:
+        for query, frame in zip(plan.queries, frames):
+            missing = [key for key in keys if key not in frame.columns]
+            if missing:
+                raise ValueError(f"{query.name}: join columns {missing} are missing")
+        combined = frames[0]
+        for query, frame in zip(plan.queries[1:], frames[1:]):
+            # Sources may type the same key differently, e.g. INT64 and TEXT
+            mismatched = [
+                key for key in keys if combined[key].dtype != frame[key].dtype
+            ]
+            if mismatched:
+                combined = combined.astype({key: str for key in mismatched})
+                frame = frame.astype({key: str for key in mismatched})
+            combined = combined.merge(
+                frame, on=keys, how=plan.join.how, suffixes=("", f"_{query.name}")
+            )
+    return plan.combine.apply(combined)
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""Background jobs for agent requests that outlive an HTTP request."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ai_analytics.agents.base import BaseAgent
+from ai_analytics.config import Settings
+from ai_analytics.utils.logging import get_logger, request_context
+
+logger = get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_FINISHED = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised when a tenant has too many unfinished jobs."""
+
+
+@dataclass
+class Job:
+    """An agent request running in the background."""
+
+    id: str
+    tenant: str
+    request: Any
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    task: Optional["asyncio.Task[None]"] = field(default=None, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a final state."""
+        return self.status in _FINISHED
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the job state without its result rows.
+
+        Returns:
+            Dict with id, status, timestamps, row count and error.
+        """
+        rows = self.result.get("results") if self.result else None
+        return {
+            "job_id": self.id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "row_count": len(rows) if rows is not None else None,
+            "error": self.error,
+        }
+
+    def _set_status(self, status: JobStatus) -> None:
+        """Move to a new state and wake up event streams."""
+        self.status = status
+        if status == JobStatus.RUNNING:
+            self.started_at = time.time()
+        elif status in _FINISHED:
+            self.finished_at = time.time()
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class JobManager:
+    """Runs agent requests as background jobs.
+
+    At most ``max_workers`` jobs run at once, and at most ``tenant_limit``
+    of them for any one tenant; further jobs wait in submission order. A
+    tenant can have at most ``tenant_max_queued`` unfinished jobs. Finished
+    jobs are kept for ``retention`` seconds, and the oldest finished jobs
+    are evicted early once more than ``max_jobs`` are held.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        tenant_limit: int = 2,
+        tenant_max_queued: int = 20,
+        retention: float = 3600.0,
+        max_jobs: int = 1000,
+    ):
+        """Initialize the job manager.
+
+        Args:
+            max_workers: Maximum jobs running at the same time.
+            tenant_limit: Maximum running jobs per tenant.
+            tenant_max_queued: Maximum unfinished jobs per tenant.
+            retention: Seconds finished jobs and their results are kept.
+            max_jobs: Maximum jobs held, including unfinished ones.
+        """
+        self.max_workers = max_workers
+        self.tenant_limit = tenant_limit
+        self.tenant_max_queued = tenant_max_queued
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._tenant_slots: Dict[str, asyncio.Semaphore] = {}
+        self._unfinished: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "JobManager":
+        """Create a job manager from settings.
+
+        Args:
+            settings: Settings with the ``job_*`` options.
+
+        Returns:
+            Configured JobManager.
+        """
+        return cls(
+            max_workers=settings.job_max_workers,
+            tenant_limit=settings.job_tenant_limit,
+            tenant_max_queued=settings.job_tenant_max_queued,
+            retention=settings.job_retention,
+            max_jobs=settings.job_max_jobs,
+        )
+
+    def submit(self, agent: BaseAgent, request: Any, tenant: str = "default") -> Job:
+        """Start a job in the background.
+
+        Must be called from a running event loop.
+
+        Args:
+            agent: Agent to execute the request with.
+            request: Agent request.
+            tenant: Tenant the job is accounted to.
+
+        Returns:
+            The queued Job.
+
+        Raises:
+            QuotaExceeded: If the tenant has too many unfinished jobs, or
+                ``max_jobs`` jobs are unfinished.
+        """
+        self._evict(reserve=1)
+        if self._unfinished[tenant] >= self.tenant_max_queued:
+            raise QuotaExceeded(
+                f"Tenant {tenant} has {self._unfinished[tenant]} unfinished jobs"
+            )
+        if len(self._jobs) >= self.max_jobs:
+            raise QuotaExceeded(f"{len(self._jobs)} jobs are unfinished")
+
+        job = Job(id=uuid.uuid4().hex, tenant=tenant, request=request)
+        self._jobs[job.id] = job
+        self._unfinished[tenant] += 1
+        job.task = asyncio.create_task(self._run(job, agent))
+        return job
+
+    def get(self, job_id: str, tenant: Optional[str] = None) -> Optional[Job]:
+        """Get a job.
+
+        Args:
+            job_id: Job id.
+            tenant: If given, only return the job if it belongs to this tenant.
+
+        Returns:
+            The Job, or None if unknown, evicted or owned by another tenant.
+        """
+        self._evict()
+        job = self._jobs.get(job_id)
+        if job is None or (tenant is not None and job.tenant != tenant):
+            return None
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        Args:
+            job_id: Job id.
+
+        Returns:
+            True if the job was still unfinished.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def results(self, job: Job, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """Get a page of a finished job's result rows.
+
+        Args:
+            job: Finished job.
+            offset: Index of the first row.
+            limit: Maximum number of rows.
+
+        Returns:
+            Dict with the rows, paging information and the result metadata.
+        """
+        result = dict(job.result or {})
+        rows = result.pop("results", None) or []
+        page_end = offset + limit
+        return {
+            **result,
+            "job_id": job.id,
+            "results": rows[offset:page_end],
+            "offset": offset,
+            "limit": limit,
+            "total_rows": len(rows),
+            "next_offset": page_end if page_end < len(rows) else None,
+        }
+
+    async def events(self, job: Job) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the job's state whenever it changes, until it finishes.
+
+        Args:
+            job: Job to follow.
+
+        Yields:
+            Job summaries, the last one in a final state.
+        """
+        while True:
+            changed = job._changed
+            yield job.summary()
+            if job.finished:
+                return
+            await changed.wait()
+
+    async def _run(self, job: Job, agent: BaseAgent) -> None:
+        """Execute a job once its tenant and the pool have capacity."""
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.max_workers)
+        tenant_slots = self._tenant_slots.setdefault(
+            job.tenant, asyncio.Semaphore(self.tenant_limit)
+        )
+        with request_context(job.id):
+            try:
+                # Wait for the tenant quota first, so jobs held back by it
+                # do not occupy a worker
+                async with tenant_slots, self._workers:
+                    job._set_status(JobStatus.RUNNING)
+                    job.result = await agent.execute(job.request)
+                job._set_status(JobStatus.SUCCEEDED)
+            except asyncio.CancelledError:
+                job._set_status(JobStatus.CANCELLED)
+            except Exception as e:
+                logger.warning("Job %s failed: %s", job.id, e)
+                job.error = str(e)
+                job._set_status(JobStatus.FAILED)
+            finally:
+                self._unfinished[job.tenant] -= 1
+                job.task = None
+
+    def _evict(self, reserve: int = 0) -> None:
+        """Drop expired finished jobs, and the oldest finished beyond max_jobs.
+
+        Args:
+            reserve: Number of jobs about to be added.
+        """
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(self._jobs) + reserve - self.max_jobs
+        for job in sorted(finished, key=lambda j: j.finished_at or 0.0):
+            if now - (job.finished_at or 0.0) > self.retention or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""Per-request model selection with escalation to a stronger model."""
+
+import re
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+from ai_analytics.config import Settings
+
+# USD per 1K prompt and completion tokens, for cost estimates
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+# Phrases that usually need joins, window functions, subqueries or
+# several aggregations
+_COMPLEX_TERMS = re.compile(
+    r"\b(?:join\w*|compar\w*|versus|vs|correlat\w*|trend\w*|growth|over time|"
+    r"(?:year|quarter|month|week|day) over (?:year|quarter|month|week|day)|"
+    r"cumulative|running total|rolling|moving average|rank\w*|percentile\w*|"
+    r"median|distribution|ratio|share of|percent\w*|proportion|retention|"
+    r"cohort\w*|churn|previous|prior|increase\w*|decrease\w*|difference)\b",
+    re.IGNORECASE,
+)
+
+# Words that add filter conditions or combine criteria
+_CONDITION_TERMS = re.compile(
+    r"\b(?:and|or|but|not|without|except|excluding|whose|between|"
+    r"more than|less than|at least|at most)\b",
+    re.IGNORECASE,
+)
+
+# Recent outcomes per model and task that success rates are computed over
+_OUTCOME_WINDOW = 200
+
+# Every this many requests a demoted fast model is tried again, so its
+# success rate can recover
+_PROBE_INTERVAL = 20
+
+_open_routers: Dict[Tuple[Any, ...], "ModelRouter"] = {}
+_open_lock = threading.Lock()
+
+
+def question_complexity(question: str, columns: Sequence[str] = ()) -> float:
+    """Score how hard a question is likely to be to answer in SQL.
+
+    Counts analytical phrases, filter conditions, extra words beyond a short
+    question and schema columns mentioned beyond two.
+
+    Args:
+        question: Natural language question.
+        columns: Column names of the queried table.
+
+    Returns:
+        Score from 0 for simple lookups to 1 for complex analyses.
+    """
+    text = question.lower()
+    score = 0.25 * len(_COMPLEX_TERMS.findall(question))
+    score += 0.1 * len(_CONDITION_TERMS.findall(question))
+    score += 0.02 * max(len(question.split()) - 12, 0)
+    mentioned = sum(
+        1 for name in columns
+        if name.lower() in text or name.lower().replace("_", " ") in text
+    )
+    score += 0.1 * max(mentioned - 2, 0)
+    return min(score, 1.0)
+
+
+@dataclass
+class ModelStats:
+    """Usage and outcomes of one model."""
+
+    requests: int = 0
+    errors: int = 0
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    outcomes: Dict[str, Deque[bool]] = field(
+        default_factory=lambda: defaultdict(lambda: deque(maxlen=_OUTCOME_WINDOW))
+    )
+
+    def cost(self, model: str) -> Optional[float]:
+        """Estimate the spend on the model in USD, if its price is known."""
+        price = MODEL_PRICES.get(model)
+        if price is None:
+            return None
+        prompt_cost = self.prompt_tokens * price[0]
+        completion_cost = self.completion_tokens * price[1]
+        return (prompt_cost + completion_cost) / 1000
+
+    def success_rate(self, task: str) -> Optional[float]:
+        """Get the share of recent successful outcomes for a task."""
+        outcomes = self.outcomes.get(task)
+        if not outcomes:
+            return None
+        return sum(outcomes) / len(outcomes)
+
+
+class ModelRouter:
+    """Chooses the model for each LLM request and tracks how models perform.
+
+    Requests go to the fast model unless the question looks complex, the
+    schema has many columns, or the fast model's recent success rate on the
+    task is too low. When the fast model's output fails, callers escalate to
+    the strong model. Without a fast model every request uses the strong
+    one. Latency, tokens, cost and outcomes are kept per model in memory.
+    """
+
+    def __init__(
+        self,
+        strong_model: str,
+        fast_model: Optional[str] = None,
+        complexity_threshold: float = 0.5,
+        max_schema_columns: int = 50,
+        min_success_rate: float = 0.8,
+        min_samples: int = 20,
+    ):
+        """Initialize the router.
+
+        Args:
+            strong_model: Model for complex requests and escalations.
+            fast_model: Cheaper, faster model for simple requests; routing
+                is off when omitted.
+            complexity_threshold: Question complexity from which the strong
+                model is used.
+            max_schema_columns: Column count above which the strong model
+                is used.
+            min_success_rate: Recent success rate below which the fast model
+                is skipped for a task.
+            min_samples: Outcomes needed before the success rate is used.
+        """
+        self.strong_model = strong_model
+        self.fast_model = fast_model if fast_model != strong_model else None
+        self.complexity_threshold = complexity_threshold
+        self.max_schema_columns = max_schema_columns
+        self.min_success_rate = min_success_rate
+        self.min_samples = min_samples
+        self._stats: Dict[str, ModelStats] = defaultdict(ModelStats)
+        self._probes: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ModelRouter":
+        """Create a router from settings.
+
+        Args:
+            settings: Settings with ``openai_model``, ``openai_fast_model``
+                and the ``routing_*`` options.
+
+        Returns:
+            Configured ModelRouter.
+        """
+        return cls(
+            strong_model=settings.openai_model,
+            fast_model=settings.openai_fast_model,
+            complexity_threshold=settings.routing_complexity_threshold,
+            max_schema_columns=settings.routing_max_schema_columns,
+            min_success_rate=settings.routing_min_success_rate,
+            min_samples=settings.routing_min_samples,
+        )
+
+    def choose(self, task: str, question: str = "", columns: Sequence[str] = ()) -> str:
+        """Choose the model for a request.
+
+        Args:
+            task: Kind of request, such as ``sql`` or ``text``; success
+                rates are tracked per task.
+            question: Question or text of the request.
+            columns: Column names of the queried table.
+
+        Returns:
+            Model name.
+        """
+        if self.fast_model is None:
+            return self.strong_model
+        if len(columns) > self.max_schema_columns:
+            return self.strong_model
+        if question_complexity(question, columns) >= self.complexity_threshold:
+            return self.strong_model
+
+        with self._lock:
+            outcomes = self._stats[self.fast_model].outcomes.get(task)
+            if outcomes is not None and len(outcomes) >= self.min_samples:
+                if sum(outcomes) / len(outcomes) < self.min_success_rate:
+                    self._probes[task] += 1
+                    if self._probes[task] % _PROBE_INTERVAL:
+                        return self.strong_model
+        return self.fast_model
+
+    def escalation(self, model: str) -> Optional[str]:
+        """Get the model to retry with after a model's output failed.
+
+        Args:
+            model: Model whose output failed.
+
+        Returns:
+            Stronger model, or None if there is none.
+        """
+        return self.strong_model if model != self.strong_model else None
+
+    def record_call(
+        self,
+        model: str,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record an API call to a model.
+
+        Args:
+            model: Model called.
+            latency: Seconds the call took.
+            prompt_tokens: Prompt tokens used.
+            completion_tokens: Completion tokens generated.
+            error: Whether the call failed.
+        """
+        with self._lock:
+            stats = self._stats[model]
+            stats.requests += 1
+            stats.errors += error
+            stats.latency += latency
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+
+    def record_outcome(self, model: str, task: str, success: bool) -> None:
+        """Record whether a model's output worked, e.g. its SQL executed.
+
+        Args:
+            model: Model that produced the output.
+            task: Kind of request.
+            success: Whether the output was usable.
+        """
+        with self._lock:
+            self._stats[model].outcomes[task].append(success)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-model statistics.
+
+        Returns:
+            Dict mapping model names to request and error counts, mean
+            latency, token counts, estimated cost in USD and recent success
+            rates per task.
+        """
+        with self._lock:
+            return {
+                model: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "mean_latency": (
+                        stats.latency / stats.requests if stats.requests else None
+                    ),
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "cost_usd": stats.cost(model),
+                    "success_rates": {
+                        task: stats.success_rate(task) for task in stats.outcomes
+                    },
+                }
+                for model, stats in self._stats.items()
+            }
+
+
+def create_router(settings: Settings) -> ModelRouter:
+    """Get the model router for the routing options in settings.
+
+    Agents with the same routing options share one router, so statistics
+    cover every agent in the process.
+
+    Args:
+        settings: Settings with the model and ``routing_*`` options.
+
+    Returns:
+        ModelRouter.
+    """
+    key = (
+        settings.openai_model,
+        settings.openai_fast_model,
+        settings.routing_complexity_threshold,
+        settings.routing_max_schema_columns,
+        settings.routing_min_success_rate,
+        settings.routing_min_samples,
+    )
+    with _open_lock:
+        router = _open_routers.get(key)
+        if router is None:
+            router = _open_routers[key] = ModelRouter.from_settings(settings)
+        return router
\ No newline at end of file
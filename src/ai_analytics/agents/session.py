@@ -0,0 +1,287 @@
+"""Conversation sessions for follow-up questions on previous results."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import pandas as pd
+from pydantic import BaseModel, Field
+
+_COMPARISONS = {
+    "==": lambda series, value: series == value,
+    "!=": lambda series, value: series != value,
+    ">": lambda series, value: series > value,
+    ">=": lambda series, value: series >= value,
+    "<": lambda series, value: series < value,
+    "<=": lambda series, value: series <= value,
+    "in": lambda series, value: series.isin(value),
+    "not in": lambda series, value: ~series.isin(value),
+    "contains": lambda series, value: series.astype(str).str.contains(
+        str(value), case=False, regex=False
+    ),
+}
+
+_AGGREGATIONS = {"sum", "mean", "min", "max", "count", "nunique", "median"}
+
+
+class FilterSpec(BaseModel):
+    """A single column comparison."""
+
+    column: str
+    op: str = "=="
+    value: Any = None
+
+
+class AggregationSpec(BaseModel):
+    """An aggregate computed over a column."""
+
+    column: str
+    func: str
+    alias: Optional[str] = None
+
+
+class SortSpec(BaseModel):
+    """A sort key."""
+
+    column: str
+    ascending: bool = True
+
+
+class LocalOperation(BaseModel):
+    """Operation on a previous result that can run without the database."""
+
+    filters: List[FilterSpec] = Field(default_factory=list)
+    group_by: List[str] = Field(default_factory=list)
+    aggregations: List[AggregationSpec] = Field(default_factory=list)
+    sort: List[SortSpec] = Field(default_factory=list)
+    columns: List[str] = Field(default_factory=list)
+    limit: Optional[int] = None
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply the operation to a DataFrame with vectorized pandas calls.
+
+        Args:
+            df: Previous result to operate on.
+
+        Returns:
+            New DataFrame with the operation applied.
+
+        Raises:
+            ValueError: If the operation references unknown columns or
+                unsupported operators.
+        """
+        self._check_columns(df)
+
+        if self.filters:
+            mask = pd.Series(True, index=df.index)
+            for spec in self.filters:
+                mask &= _COMPARISONS[spec.op](df[spec.column], spec.value)
+            df = df[mask]
+
+        if self.aggregations:
+            named = {
+                _output_name(agg): pd.NamedAgg(agg.column, agg.func)
+                for agg in self.aggregations
+            }
+            if self.group_by:
+                df = df.groupby(
+                    self.group_by, as_index=False, sort=False, observed=True
+                ).agg(**named)
+            else:
+                df = pd.DataFrame([{
+                    name: df[spec.column].agg(spec.aggfunc)
+                    for name, spec in named.items()
+                }])
+
+        if self.sort:
+            df = df.sort_values(
+                [spec.column for spec in self.sort],
+                ascending=[spec.ascending for spec in self.sort],
+            )
+
+        if self.columns:
+            df = df[self.columns]
+
+        if self.limit is not None:
+            df = df.head(self.limit)
+
+        return df.reset_index(drop=True)
+
+    def _check_columns(self, df: pd.DataFrame) -> None:
+        """Validate column names and operators before touching the data."""
+        source_columns = set(df.columns)
+        referenced = (
+            [spec.column for spec in self.filters]
+            + self.group_by
+            + [agg.column for agg in self.aggregations]
+        )
+        missing = [col for col in referenced if col not in source_columns]
+        if missing:
+            raise ValueError(f"Unknown columns in local operation: {missing}")
+
+        for spec in self.filters:
+            if spec.op not in _COMPARISONS:
+                raise ValueError(f"Unsupported filter operator: {spec.op}")
+        for agg in self.aggregations:
+            if agg.func not in _AGGREGATIONS:
+                raise ValueError(f"Unsupported aggregation: {agg.func}")
+
+        output_columns = (
+            self.group_by + [_output_name(agg) for agg in self.aggregations]
+            if self.aggregations else list(df.columns)
+        )
+        unknown = [
+            col for col in [spec.column for spec in self.sort] + self.columns
+            if col not in output_columns
+        ]
+        if unknown:
+            raise ValueError(f"Unknown output columns in local operation: {unknown}")
+
+    def to_sql(self, previous_sql: str) -> str:
+        """Render the equivalent SQL over the previous query.
+
+        Args:
+            previous_sql: SQL that produced the previous result.
+
+        Returns:
+            SQL statement describing what was computed locally.
+        """
+        if self.aggregations:
+            select = self.group_by + [
+                f"{agg.func.upper()}({agg.column}) AS {_output_name(agg)}"
+                for agg in self.aggregations
+            ]
+        else:
+            select = self.columns or ["*"]
+
+        sql = (
+            f"WITH previous AS (\n{previous_sql}\n)\n"
+            f"SELECT {', '.join(select)}\nFROM previous"
+        )
+        if self.filters:
+            conditions = [
+                f"{spec.column} {'=' if spec.op == '==' else spec.op.upper()} "
+                f"{_sql_literal(spec.value)}"
+                for spec in self.filters
+            ]
+            sql += "\nWHERE " + " AND ".join(conditions)
+        if self.group_by and self.aggregations:
+            sql += "\nGROUP BY " + ", ".join(self.group_by)
+        if self.sort:
+            sql += "\nORDER BY " + ", ".join(
+                f"{spec.column} {'ASC' if spec.ascending else 'DESC'}"
+                for spec in self.sort
+            )
+        if self.limit is not None:
+            sql += f"\nLIMIT {self.limit}"
+        return sql
+
+
+def _output_name(agg: AggregationSpec) -> str:
+    """Get the result column name of an aggregation."""
+    return agg.alias or f"{agg.func}_{agg.column}"
+
+
+def _sql_literal(value: Any) -> str:
+    """Render a Python value as a SQL literal for display."""
+    if isinstance(value, (list, tuple)):
+        return "(" + ", ".join(_sql_literal(item) for item in value) + ")"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if value is None:
+        return "NULL"
+    return str(value)
+
+
+@dataclass
+class SessionResult:
+    """Last result produced in a conversation session."""
+
+    question: str
+    sql: str
+    data: pd.DataFrame
+    complete: bool
+    updated_at: float
+
+
+class SessionStore:
+    """Bounded in-memory store of the last result per session.
+
+    Sessions are evicted least-recently-used once ``max_sessions`` is
+    reached, and expire after ``ttl`` seconds of inactivity. Results larger
+    than ``max_rows`` are not kept.
+    """
+
+    def __init__(
+        self, max_sessions: int = 100, max_rows: int = 10_000, ttl: float = 1800.0
+    ):
+        """Initialize the session store.
+
+        Args:
+            max_sessions: Maximum number of sessions kept in memory.
+            max_rows: Largest result, in rows, that is kept for follow-ups.
+            ttl: Seconds of inactivity after which a session expires.
+        """
+        self.max_sessions = max_sessions
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, SessionResult]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[SessionResult]:
+        """Get the last result for a session.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            SessionResult, or None if the session is unknown or expired.
+        """
+        result = self._sessions.get(session_id)
+        if result is None:
+            return None
+        if time.time() - result.updated_at > self.ttl:
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return result
+
+    def put(
+        self,
+        session_id: str,
+        question: str,
+        sql: str,
+        data: pd.DataFrame,
+        complete: bool,
+    ) -> None:
+        """Record the latest result of a session.
+
+        Args:
+            session_id: Session identifier.
+            question: Question that produced the result.
+            sql: SQL equivalent of the result.
+            data: Result DataFrame.
+            complete: Whether the result holds every row the SQL matches.
+        """
+        if len(data) > self.max_rows:
+            self._sessions.pop(session_id, None)
+            return
+
+        self._sessions[session_id] = SessionResult(
+            question=question,
+            sql=sql,
+            data=data,
+            complete=complete,
+            updated_at=time.time(),
+        )
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def clear(self, session_id: str) -> None:
+        """Forget a session.
+
+        Args:
+            session_id: Session identifier.
+        """
+        self._sessions.pop(session_id, None)
\ No newline at end of file
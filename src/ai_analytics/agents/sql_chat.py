@@ -1,14 +1,34 @@
 """SQL Chat Agent implementation."""
 
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence,
+    Tuple, Union,
+)
+import asyncio
 import json
+import math
+import re
+import time
+from dataclasses import dataclass
 
 import openai
+import pandas as pd
 from pydantic import BaseModel, Field
 
-from ai_analytics.agents.base import BaseAgent
-from ai_analytics.database import DatabaseConnection, BigQueryConnection, PostgresConnection
-from ai_analytics.database.base import TableSchema
+from ai_analytics.agents.base import BaseAgent, PermanentError
+from ai_analytics.agents.cursors import CursorStore
+from ai_analytics.agents.session import LocalOperation, SessionResult, SessionStore
+from ai_analytics.agents.suggestions import SuggestionPool, parse_questions
+from ai_analytics.agents.templates import TemplateStore
+from ai_analytics.cache import CacheBackend
+from ai_analytics.database.base import DatabaseConnection, TableSchema
+from ai_analytics.database.frames import to_records
+from ai_analytics.database.sql import apply_limit, render_parameters, trailing_limit
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import get_request_id, request_context
+
+# Events buffered ahead of a slow stream consumer before work pauses
+_STREAM_BUFFER = 16
 
 
 class SQLChatRequest(BaseModel):
@@ -17,6 +37,23 @@ class SQLChatRequest(BaseModel):
     question: str = Field(..., description="Natural language question about the data")
     context: Optional[str] = Field(None, description="Additional context for the question")
     max_results: int = Field(100, description="Maximum number of results to return")
+    session_id: Optional[str] = Field(
+        None, description="Conversation session for follow-up questions"
+    )
+    approximate: bool = Field(
+        False, description="Answer from a table sample for faster, approximate results"
+    )
+    sample_percent: Optional[float] = Field(
+        None, description="Percentage of the table to sample in approximate mode"
+    )
+    page_size: Optional[int] = Field(
+        None,
+        gt=0,
+        description=(
+            "Return results in pages of this many rows, with a cursor to fetch "
+            "the next page without re-running the query"
+        ),
+    )
 
 
 class SQLChatResponse(BaseModel):
@@ -28,21 +65,199 @@ class SQLChatResponse(BaseModel):
     column_names: List[str]
     execution_time: float
     row_count: int
+    source: str = Field(
+        "database",
+        description=(
+            "Where results came from: database, template when the database "
+            "ran a learned SQL template without the LLM, profile, session when "
+            "a follow-up was served locally from the previous result, or cursor "
+            "for later pages of a paged result"
+        ),
+    )
+    metrics: Optional[Dict[str, Any]] = Field(
+        None, description="Per-stage timings and counters when monitoring is enabled"
+    )
+    approximate: bool = False
+    sampling_rate: Optional[float] = Field(
+        None, description="Fraction of the table read in approximate mode"
+    )
+    error_estimate: Optional[float] = Field(
+        None,
+        description=(
+            "Approximate relative standard error of counts and sums over the "
+            "whole table; filtered subsets have larger error"
+        ),
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page of a paged result"
+    )
+    total_rows: Optional[int] = Field(
+        None, description="Rows in the complete result, for paged results"
+    )
+    model: Optional[str] = Field(
+        None, description="Model that generated the SQL, after any escalation"
+    )
+    truncated: bool = Field(
+        False, description="Whether rows were dropped to fit the result memory budget"
+    )
+
+
+@dataclass
+class _Plan:
+    """How a request is answered: a ready response, or SQL to run."""
+
+    response: Optional[Dict[str, Any]] = None
+    sql: Optional[str] = None
+    sample_percent: Optional[float] = None
+    row_estimate: Optional[int] = None
+    model: Optional[str] = None
+    cache_key: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    template_key: Optional[str] = None
+    base_sql: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def rendered_sql(self) -> Optional[str]:
+        """SQL with any parameter values inlined, for display and estimates."""
+        if self.sql is None or not self.params:
+            return self.sql
+        return render_parameters(self.sql, self.params)
+
+
+class _PartialResult(RuntimeError):
+    """Raised when a streamed query fails after rows were sent."""
+
+
+_LOCAL_OPERATION_PROMPT = """The previous result is held in memory with {row_count} rows
+and these columns:
+{columns}
+
+If, and only if, the new question can be answered exactly by filtering, grouping and
+aggregating, sorting, selecting columns of or limiting that previous result, respond
+with ONLY a JSON object of this form instead of SQL:
+{{"local_operation": {{"filters": [{{"column": "...", "op": "==", "value": "..."}}],
+"group_by": [], "aggregations": [{{"column": "...", "func": "sum", "alias": "..."}}],
+"sort": [{{"column": "...", "ascending": true}}], "columns": [], "limit": null}}}}
+Supported filter ops: ==, !=, >, >=, <, <=, in, not in, contains.
+Supported aggregation funcs: sum, mean, median, min, max, count, nunique.
+Otherwise respond with a SQL query as usual."""
+
+_REPAIR_PROMPT = """The database rejected this query without running it:
+{error}
+
+Respond with ONLY the corrected SQL query."""
+
+_APPROXIMATE_PROMPT = """This is an exploratory question and an approximate answer is
+acceptable. Read the table through a {percent:g}% sample using {clause}, placed after
+the table name and its alias. Reference the table only once, in the outermost FROM
+clause: no subqueries, CTEs or self-joins over it. Multiply COUNT and SUM results by
+{scale:g} to estimate totals for the full table; ratios, averages and percentages need
+no scaling. Prefer approximate aggregate functions where the database supports them.
+If the question cannot be answered with a single reference of the table, answer it
+exactly without {clause}."""
+
+_SAMPLING_ERROR = """{clause} may only be applied to a single reference of the table in
+the outermost FROM clause, since totals are scaled once. Read the table once with the
+sample, or answer exactly without {clause}."""
+
+# Matches questions like "what are the distinct values of country?"
+_DISTINCT_QUESTION = re.compile(
+    r"^(?:what|which|list|show(?: me)?)(?: are| is)?(?: all)?(?: the)?"
+    r"(?: (?:different|distinct|unique|possible))+"
+    r" (?:values? (?:of|for|in) (?:the )?)?(?P<column>[\w ]+?)(?: column)?\s*\??$",
+    re.IGNORECASE,
+)
+
+
+def _sampling_error(sampling_rate: float, rows: Optional[int]) -> Optional[float]:
+    """Estimate the relative standard error of totals scaled from a sample.
+
+    Treats the sample as independent row draws, which understates the error
+    of block sampling on tables with clustered values.
+    """
+    if sampling_rate >= 1:
+        return 0.0
+    if not rows:
+        return None
+    return math.sqrt((1 - sampling_rate) / (sampling_rate * rows))
+
+
+def _with_records(
+    batches: Iterator[pd.DataFrame],
+) -> Iterator[Tuple[pd.DataFrame, List[Dict[str, Any]]]]:
+    """Pair each result batch with its rows as dicts, closing the batches when done."""
+    try:
+        for batch in batches:
+            yield batch, to_records(batch)
+    finally:
+        batches.close()
+
+
+def _is_complete(sql: str, row_count: int) -> bool:
+    """Check whether a result was cut short by a trailing LIMIT clause."""
+    limit = trailing_limit(sql)
+    return limit is None or row_count < limit
 
 
 class SQLChatAgent(BaseAgent):
     """Agent for natural language to SQL interactions."""
 
-    def __init__(self, settings: Any, database: DatabaseConnection):
+    def __init__(
+        self,
+        settings: Any,
+        database: DatabaseConnection,
+        cache: Optional[CacheBackend] = None,
+    ):
         """Initialize SQL Chat Agent.
         
         Args:
             settings: Configuration settings
             database: Database connection instance
+            cache: Cache backend for generated SQL (optional)
         """
-        super().__init__(settings)
+        # Set before the base initializer, which loads the schema through it
         self.database = database
         self.schema: Optional[TableSchema] = None
+        super().__init__(settings, cache)
+        self.sessions = SessionStore(
+            max_sessions=self.settings.session_max_count,
+            max_rows=self.settings.session_max_rows,
+            ttl=self.settings.session_ttl,
+        )
+        self.cursors = CursorStore(
+            self.cache,
+            ttl=self.settings.cursor_ttl,
+            max_bytes=self.settings.cursor_max_bytes,
+        )
+        self.templates = (
+            self._create_template_store() if self.settings.sql_templates else None
+        )
+        self.suggestions: Optional[SuggestionPool] = None
+
+    def _schema_fingerprint(self) -> str:
+        """Identify the database and the version of its schema."""
+        key = self._cache_key(
+            "schema", self.database.__class__.__name__,
+            self.schema.dict(exclude={"column_stats"}),
+        )
+        return key.split(":", 1)[1][:16]
+
+    def _create_template_store(self) -> TemplateStore:
+        """Create the SQL template store for the connected table."""
+        stats = self.schema.column_stats or {}
+        known_values = {
+            value: name
+            for name, column_stats in stats.items()
+            for value in column_stats.top_values
+            if isinstance(value, str)
+        }
+        return TemplateStore(
+            self.cache,
+            ttl=self.settings.template_ttl,
+            scope=self._schema_fingerprint(),
+            known_values=known_values,
+        )
 
     def _validate_settings(self) -> None:
         """Validate required settings."""
@@ -52,8 +267,8 @@ class SQLChatAgent(BaseAgent):
     def _initialize_client(self) -> None:
         """Initialize OpenAI client."""
         openai.api_key = self.settings.openai_api_key
-        # Cache the schema for future use
-        self.schema = self.database.get_schema()
+        # Cache the schema and its column profile for future use
+        self.schema = self.database.get_profiled_schema()
 
     def _build_system_prompt(self) -> str:
         """Build system prompt for SQL generation.
@@ -61,7 +276,10 @@ class SQLChatAgent(BaseAgent):
         Returns:
             Formatted system prompt string
         """
-        schema_str = json.dumps(self.schema.dict(), indent=2)
+        schema_str = json.dumps(self.schema.dict(exclude={"column_stats"}), indent=2)
+        stats_str = self.schema.format_column_stats()
+        if stats_str:
+            schema_str += f"\n\nColumn value profile (approximate):\n{stats_str}"
         
         return f"""You are a SQL expert that helps translate natural language questions into SQL queries.
 Given the following database schema:
@@ -80,6 +298,11 @@ The database type is: {self.database.__class__.__name__}"""
 
     async def _process(self, input_data: SQLChatRequest) -> Dict[str, Any]:
         """Process natural language query and return results.
+
+        SQL from the fast model that fails validation or execution is
+        generated again by the strong model. Failures are not retried as
+        a whole, since the same SQL would fail again. A matching SQL
+        template that fails is dropped and the SQL generated instead.
         
         Args:
             input_data: SQLChatRequest containing the question
@@ -87,14 +310,750 @@ The database type is: {self.database.__class__.__name__}"""
         Returns:
             Dict containing query results and metadata
         """
-        import time
         start_time = time.time()
 
-        # Generate SQL query
-        messages = [
-            {"role": "system", "content": self._build_system_prompt()},
-            {"role": "user", "content": input_data.question}
-        ]
+        model = self._choose_model(input_data)
+        use_templates = True
+        while True:
+            plan = await self._prepare(
+                input_data, start_time, model, use_templates=use_templates
+            )
+            if plan.response is not None:
+                return plan.response
+
+            # Execute query and get results off the event loop
+            try:
+                self._check_query(plan)
+                results_df = await self._run_blocking(
+                    "sql_execution",
+                    self.database.execute_query,
+                    plan.sql,
+                    True,
+                    plan.params,
+                    self.settings.result_max_bytes or None,
+                )
+            except Exception as e:
+                if plan.template_key is not None:
+                    self._forget_template(plan, e)
+                    use_templates = False
+                    continue
+                model = self._escalate(plan, e)
+                continue
+            self._record_success(input_data, plan)
+            break
+
+        source = "template" if plan.template_key is not None else "database"
+        if plan.sample_percent is None:
+            return await self._build_response(
+                input_data, plan.rendered_sql, results_df, start_time, source=source,
+                complete=(
+                    _is_complete(plan.sql, len(results_df))
+                    and not results_df.attrs.get("truncated")
+                ),
+                model=plan.model,
+            )
+
+        sampling_rate = plan.sample_percent / 100
+        return await self._build_response(
+            input_data, plan.rendered_sql, results_df, start_time, source=source,
+            complete=False,
+            sampling_rate=sampling_rate,
+            error_estimate=_sampling_error(sampling_rate, plan.row_estimate),
+            model=plan.model,
+        )
+
+    def _choose_model(self, input_data: SQLChatRequest) -> str:
+        """Choose the model to generate SQL for a request."""
+        columns = (
+            [column["name"] for column in self.schema.columns] if self.schema else []
+        )
+        return self.router.choose("sql", input_data.question, columns)
+
+    def _check_query(self, plan: "_Plan") -> None:
+        """Reject generated text that is not a read-only query or failed checks.
+
+        Raises:
+            ValueError: If the database's validation rejects the query, or
+                it still failed the planner check after repairs
+        """
+        sql = plan.rendered_sql
+        if not self.database.validate_query(sql):
+            raise ValueError(f"Generated text is not a valid query: {sql[:200]}")
+        if plan.error is not None:
+            raise ValueError(f"Generated SQL failed validation: {plan.error}")
+
+    async def _validate(self, sql: str) -> Optional[str]:
+        """Check SQL with the database's planner or dry run, without running it.
+
+        Args:
+            sql: SQL to check
+
+        Returns:
+            The database's error for the SQL, or None if it passed, is not
+            a read-only query, which ``_check_query`` rejects, or could not
+            be checked
+        """
+        if not self.settings.sql_validation or not self.database.validate_query(sql):
+            return None
+        try:
+            return await self._run_blocking(
+                "sql_validation", self.database.check_query, sql
+            )
+        except Exception as e:
+            self.logger.warning("Could not validate SQL: %s", e)
+            return None
+
+    def _record_success(self, input_data: SQLChatRequest, plan: "_Plan") -> None:
+        """Record that planned SQL ran, and learn its template."""
+        if plan.template_key is not None:
+            metrics.record("template_hits")
+            return
+        self.router.record_outcome(plan.model, "sql", success=True)
+        if self.templates is not None and plan.base_sql is not None:
+            self.templates.learn(input_data.question, plan.base_sql)
+
+    def _forget_template(self, plan: "_Plan", error: Union[Exception, str]) -> None:
+        """Drop a template whose SQL failed, so the SQL is generated instead."""
+        self.logger.warning("SQL template failed, generating SQL: %s", error)
+        self.templates.forget(plan.template_key)
+        metrics.record("template_failures")
+
+    def _escalate(self, plan: "_Plan", error: Exception) -> str:
+        """Record failed SQL and choose the model to generate it again.
+
+        The failed SQL is dropped from the cache so it is not served again.
+
+        Args:
+            plan: Plan whose SQL failed
+            error: Validation or execution error
+
+        Returns:
+            Stronger model to retry with
+
+        Raises:
+            PermanentError: If there is no stronger model and the SQL was
+                rejected by validation
+            RuntimeError: If there is no stronger model and the SQL failed
+                to execute
+        """
+        self.router.record_outcome(plan.model, "sql", success=False)
+        if self.cache is not None and plan.cache_key is not None:
+            self.cache.delete(plan.cache_key)
+        stronger = self.router.escalation(plan.model)
+        if stronger is None:
+            self.logger.error("Query execution failed: %s", error)
+            if isinstance(error, ValueError):
+                raise PermanentError(f"Failed to execute query: {str(error)}")
+            raise RuntimeError(f"Failed to execute query: {str(error)}")
+        self.logger.warning(
+            "SQL from %s failed, escalating to %s: %s", plan.model, stronger, error
+        )
+        metrics.record("model_escalations")
+        return stronger
+
+    async def _prepare(
+        self,
+        input_data: SQLChatRequest,
+        start_time: float,
+        model: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        use_templates: bool = True,
+        on_repair: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> "_Plan":
+        """Answer a request without the database if possible, else build its SQL.
+
+        Standalone exact questions whose shape matches a learned template
+        bind their literals into it instead of asking the LLM. SQL is
+        checked by the database without running it; generated SQL that
+        fails is sent back to the LLM with the error, up to
+        ``sql_repair_attempts`` times, and a failing template is dropped.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            start_time: Time the request started processing
+            model: Model to generate SQL with
+            on_token: Called with each piece of the completion as it streams
+            use_templates: Whether a learned template may be used
+            on_repair: Called with the error before SQL is generated again
+
+        Returns:
+            Plan holding either the response, if the request was answered
+            from the column profile or the session result, or the SQL to run
+        """
+        profile_response = await self._answer_from_profile(input_data, start_time)
+        if profile_response is not None:
+            return _Plan(response=profile_response)
+
+        # SQL written for a context may filter on it, so it is not a template
+        templated = (
+            self.templates is not None
+            and not input_data.session_id
+            and not input_data.context
+            and not input_data.approximate
+        )
+        match = (
+            self.templates.match(input_data.question)
+            if templated and use_templates
+            else None
+        )
+        if match is not None:
+            template_sql, params, template_key = match
+            row_limit = self._row_limit(input_data)
+            if row_limit:
+                template_sql = apply_limit(template_sql, row_limit)
+            plan = _Plan(sql=template_sql, params=params, template_key=template_key)
+            error = await self._validate(plan.rendered_sql)
+            if error is None:
+                return plan
+            self._forget_template(plan, error)
+
+        session = (
+            self.sessions.get(input_data.session_id) if input_data.session_id else None
+        )
+        sample_percent, row_estimate = (
+            await self._run_blocking("sample_planning", self._plan_sample, input_data)
+            if input_data.approximate else (None, None)
+        )
+
+        content, cache_key = await self._generate(
+            input_data, session, allow_local=True, sample_percent=sample_percent,
+            model=model, on_token=on_token,
+        )
+        if session is not None and content.startswith("{"):
+            local_response = await self._answer_from_session(
+                input_data, session, content, start_time
+            )
+            if local_response is not None:
+                return _Plan(response=local_response)
+            content, cache_key = await self._generate(
+                input_data, session, allow_local=False, sample_percent=sample_percent,
+                model=model, on_token=on_token,
+            )
+
+        plan = _Plan(
+            sql=self._finish_sql(input_data, content),
+            sample_percent=sample_percent,
+            row_estimate=row_estimate,
+            model=model,
+            cache_key=cache_key,
+            base_sql=content if templated else None,
+        )
+        repairs: List[Tuple[str, str]] = []
+        while True:
+            error = self._sampling_error(plan) or await self._validate(plan.sql)
+            if error is None:
+                break
+            if len(repairs) >= self.settings.sql_repair_attempts:
+                plan.error = error
+                return plan
+            self.logger.warning("Generated SQL failed validation, repairing: %s", error)
+            metrics.record("sql_repairs")
+            if on_repair is not None:
+                await on_repair(error)
+            repairs.append((plan.sql, error))
+            content, _ = await self._generate(
+                input_data, session, allow_local=False, sample_percent=sample_percent,
+                model=model, on_token=on_token, repairs=repairs,
+            )
+            plan.sql = self._finish_sql(input_data, content)
+            plan.sample_percent = sample_percent
+            plan.base_sql = content if templated else None
+
+        if repairs and self.cache is not None and cache_key is not None:
+            # Serve the repaired SQL for the question from now on
+            self.cache.set(cache_key, content.encode())
+        return plan
+
+    def _finish_sql(self, input_data: SQLChatRequest, content: str) -> str:
+        """Apply the row limit to generated SQL."""
+        row_limit = self._row_limit(input_data)
+        if row_limit:
+            return apply_limit(content, row_limit)
+        return content
+
+    def _sampling_error(self, plan: "_Plan") -> Optional[str]:
+        """Check how SQL for an approximate request reads the table.
+
+        Totals are only scaled correctly when the LLM sampled the table's
+        single reference itself, since it was also told to scale them. SQL
+        that does not sample the table is an exact answer, and the plan is
+        marked as such.
+
+        Returns:
+            Error to repair the SQL with, if it samples the table in a
+            subquery or more than once
+        """
+        if plan.sample_percent is None:
+            return None
+        references = self.database.table_references(plan.sql)
+        if references == [(0, True)]:
+            return None
+        if not any(sampled for _, sampled in references):
+            plan.sample_percent = None
+            return None
+        clause = self.database.table_sample_clause(plan.sample_percent)
+        return _SAMPLING_ERROR.format(clause=clause)
+
+    async def execute_stream(
+        self, input_data: SQLChatRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield events as each step of a request produces them.
+
+        Every event is a dict with an ``event`` name and its ``data``:
+
+        - ``token``: a piece of the completion while the SQL is generated
+        - ``repair``: the database rejected the SQL without running it and
+          the LLM corrects it using the error; tokens restart
+        - ``sql``: the SQL to run, where results come from and the model
+        - ``escalation``: the SQL failed before any rows were sent and is
+          generated again by a stronger model, or by the LLM if it came
+          from a template; tokens restart
+        - ``cost``: the database's estimate of the query cost, if available
+        - ``rows``: a batch of result rows with column names and row offset
+        - ``done``: row count, timing and approximation details
+        - ``error``: the failure that ended the stream
+
+        Work runs in a separate task that pauses while the consumer is
+        behind, and is cancelled if the consumer stops early. Results are
+        not paged, so ``page_size`` is ignored.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+
+        Yields:
+            Event dicts, ending with ``done`` or ``error``
+        """
+        input_data = input_data.copy(update={"page_size": None})
+        events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(
+            _STREAM_BUFFER
+        )
+
+        async def emit(event: str, data: Dict[str, Any]) -> None:
+            await events.put({"event": event, "data": data})
+
+        async def produce() -> None:
+            with request_context(get_request_id()):
+                try:
+                    if not self.settings.enable_monitoring:
+                        summary = await self._stream(input_data, emit)
+                    else:
+                        with metrics.trace(self.__class__.__name__) as trace:
+                            with metrics.span("total"):
+                                summary = await self._stream(input_data, emit)
+                            trace.publish()
+                        summary["metrics"] = trace.summary()
+                    await emit("done", summary)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error("Error during streaming execution: %s", e)
+                    await emit("error", {"error": str(e)})
+            await events.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            producer.cancel()
+
+    async def _stream(
+        self,
+        input_data: SQLChatRequest,
+        emit: Callable[[str, Dict[str, Any]], Awaitable[None]],
+    ) -> Dict[str, Any]:
+        """Run a request, emitting tokens, SQL, cost and result batches.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            emit: Called with each event name and data
+
+        Returns:
+            Data of the final ``done`` event
+        """
+        start_time = time.time()
+
+        async def on_token(text: str) -> None:
+            await emit("token", {"text": text})
+
+        async def on_repair(error: str) -> None:
+            await emit("repair", {"error": error})
+
+        model = self._choose_model(input_data)
+        use_templates = True
+        while True:
+            plan = await self._prepare(
+                input_data, start_time, model, on_token=on_token,
+                use_templates=use_templates, on_repair=on_repair,
+            )
+            if plan.response is not None:
+                response = plan.response
+                await emit("sql", {
+                    "sql": response["generated_sql"],
+                    "source": response["source"],
+                    "model": None,
+                })
+                await emit("rows", {
+                    "columns": response["column_names"],
+                    "rows": response["results"],
+                    "offset": 0,
+                })
+                summary = {
+                    key: response[key]
+                    for key in (
+                        "row_count",
+                        "source",
+                        "approximate",
+                        "sampling_rate",
+                        "error_estimate",
+                    )
+                }
+                summary["execution_time"] = time.time() - start_time
+                return summary
+
+            source = "template" if plan.template_key is not None else "database"
+            await emit(
+                "sql", {"sql": plan.rendered_sql, "source": source, "model": plan.model}
+            )
+            try:
+                self._check_query(plan)
+                row_count = await self._stream_rows(input_data, plan, emit)
+            except _PartialResult:
+                if plan.template_key is not None:
+                    self.templates.forget(plan.template_key)
+                else:
+                    self.router.record_outcome(plan.model, "sql", success=False)
+                raise
+            except Exception as e:
+                if plan.template_key is not None:
+                    self._forget_template(plan, e)
+                    use_templates = False
+                    await emit("escalation", {"model": model, "error": str(e)})
+                    continue
+                model = self._escalate(plan, e)
+                await emit("escalation", {"model": model, "error": str(e)})
+                continue
+            self._record_success(input_data, plan)
+            break
+
+        sampling_rate = (
+            plan.sample_percent / 100 if plan.sample_percent is not None else None
+        )
+        return {
+            "row_count": row_count,
+            "source": source,
+            "approximate": sampling_rate is not None,
+            "sampling_rate": sampling_rate,
+            "error_estimate": (
+                _sampling_error(sampling_rate, plan.row_estimate)
+                if sampling_rate is not None else None
+            ),
+            "execution_time": time.time() - start_time,
+        }
+
+    async def _stream_rows(
+        self,
+        input_data: SQLChatRequest,
+        plan: "_Plan",
+        emit: Callable[[str, Dict[str, Any]], Awaitable[None]],
+    ) -> int:
+        """Execute planned SQL, emitting its cost estimate and result batches.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            plan: Plan holding the SQL
+            emit: Called with each event name and data
+
+        Returns:
+            Number of rows sent
+
+        Raises:
+            _PartialResult: If the query fails after rows were sent
+        """
+        # The estimate usually returns before the first rows; it is sent
+        # ahead of them but does not delay starting the query
+        estimate = asyncio.ensure_future(self._estimate_cost(plan.rendered_sql))
+
+        row_count, kept, sent = 0, [], False
+        keep = bool(input_data.session_id)
+        batches = _with_records(
+            self.database.iter_query(
+                plan.sql, self.settings.stream_batch_rows, params=plan.params
+            )
+        )
+        try:
+            async for batch, records in self._iter_blocking("sql_execution", batches):
+                if not sent:
+                    await self._emit_cost(emit, estimate)
+                await emit("rows", {
+                    "columns": list(batch.columns), "rows": records, "offset": row_count
+                })
+                sent = True
+                row_count += len(batch)
+                keep = keep and row_count <= self.sessions.max_rows
+                if keep:
+                    kept.append(batch)
+        except Exception as e:
+            if not sent:
+                raise
+            self.logger.error("Query execution failed: %s", e)
+            raise _PartialResult(f"Failed to execute query: {str(e)}") from e
+        finally:
+            estimate.cancel()
+
+        if input_data.session_id:
+            if keep:
+                self.sessions.put(
+                    input_data.session_id, input_data.question, plan.rendered_sql,
+                    pd.concat(kept, ignore_index=True),
+                    plan.sample_percent is None and _is_complete(plan.sql, row_count),
+                )
+            else:
+                self.sessions.clear(input_data.session_id)
+        return row_count
+
+    async def _estimate_cost(self, sql: str) -> Optional[Dict[str, Any]]:
+        """Get the database's cost estimate for a query, if it has one."""
+        try:
+            return await self._run_blocking(
+                "cost_estimate", self.database.estimate_cost, sql
+            )
+        except Exception as e:
+            self.logger.warning("Cost estimate failed: %s", e)
+            return None
+
+    async def _emit_cost(
+        self,
+        emit: Callable[[str, Dict[str, Any]], Awaitable[None]],
+        estimate: "asyncio.Future[Optional[Dict[str, Any]]]",
+    ) -> None:
+        """Wait for the cost estimate and emit it if there is one."""
+        cost = await estimate
+        if cost is not None:
+            await emit("cost", cost)
+
+    async def execute_progressive(
+        self, input_data: SQLChatRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a fast approximate answer, then the exact one.
+
+        Both queries start together. The approximate response is skipped if
+        the exact one finishes first or the approximate query fails.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+
+        Yields:
+            Response dicts, approximate first and exact last
+        """
+        exact = asyncio.ensure_future(
+            self.execute(input_data.copy(update={"approximate": False}))
+        )
+        try:
+            try:
+                approximate = await self.execute(
+                    input_data.copy(update={"approximate": True})
+                )
+            except Exception as e:
+                self.logger.warning("Approximate query failed: %s", e)
+                approximate = None
+            if (
+                approximate is not None
+                and approximate["approximate"]
+                and not exact.done()
+            ):
+                yield approximate
+            yield await exact
+        finally:
+            if not exact.done():
+                exact.cancel()
+
+    def _row_limit(self, input_data: SQLChatRequest) -> Optional[int]:
+        """Get the maximum number of rows to fetch for a request.
+
+        Paged requests fetch up to ``cursor_max_rows`` unless ``max_results``
+        was set explicitly.
+
+        Args:
+            input_data: SQLChatRequest
+
+        Returns:
+            Row limit, or None for no limit
+        """
+        if input_data.page_size and "max_results" not in input_data.__fields_set__:
+            return self.settings.cursor_max_rows
+        return input_data.max_results
+
+    async def fetch_page(self, cursor: str) -> Dict[str, Any]:
+        """Get the next page of a paged result without running the query.
+
+        Args:
+            cursor: ``next_cursor`` from a previous response
+
+        Returns:
+            Response dict with the page and the cursor for the following one
+
+        Raises:
+            ValueError: If the cursor is malformed
+            KeyError: If the cursor expired
+        """
+        start_time = time.time()
+        page, metadata, next_cursor = await self._run_blocking(
+            "cursor_fetch", self.cursors.fetch, cursor
+        )
+        results = to_records(page)
+        return SQLChatResponse(
+            question=metadata["question"],
+            generated_sql=metadata["generated_sql"],
+            results=results,
+            column_names=list(page.columns),
+            execution_time=time.time() - start_time,
+            row_count=len(results),
+            source="cursor",
+            approximate=metadata["sampling_rate"] is not None,
+            sampling_rate=metadata["sampling_rate"],
+            error_estimate=metadata["error_estimate"],
+            next_cursor=next_cursor,
+            total_rows=metadata["total_rows"],
+        ).dict()
+
+    def _plan_sample(
+        self, input_data: SQLChatRequest
+    ) -> Tuple[Optional[float], Optional[int]]:
+        """Choose the sample size for an approximate request.
+
+        Args:
+            input_data: SQLChatRequest with approximate mode enabled
+
+        Returns:
+            Percentage of the table to sample, or None if the table is small
+            enough to answer exactly or cannot be sampled, and the table's
+            estimated row count
+        """
+        rows = self.database.estimate_row_count()
+        if rows is not None and rows < self.settings.approximate_min_rows:
+            return None, rows
+        percent = input_data.sample_percent or self.settings.approximate_sample_percent
+        percent = min(max(percent, 0.0001), 100.0)
+        if self.database.table_sample_clause(percent) is None:
+            return None, rows
+        return percent, rows
+
+    async def _generate(
+        self,
+        input_data: SQLChatRequest,
+        session: Optional[SessionResult],
+        allow_local: bool,
+        sample_percent: Optional[float] = None,
+        model: Optional[str] = None,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        repairs: Sequence[Tuple[str, str]] = (),
+    ) -> Tuple[str, Optional[str]]:
+        """Ask the LLM for SQL, or for a local operation on a session result.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            session: Previous result of the conversation, if any
+            allow_local: Offer the LLM to answer from the previous result
+            sample_percent: Ask for a query over this percentage of the table
+            model: Model to ask; the configured model when omitted
+            on_token: Stream the completion, calling this with each piece;
+                a cached completion is passed in one piece
+            repairs: Earlier SQL for the question and the database's error
+                for it, to be corrected
+
+        Returns:
+            Raw completion content, and its cache key if it is cached
+        """
+        with metrics.span("prompt"):
+            messages = self._build_messages(
+                input_data, session, allow_local, sample_percent
+            )
+            for failed_sql, error in repairs:
+                messages.append({"role": "assistant", "content": failed_sql})
+                messages.append(
+                    {"role": "user", "content": _REPAIR_PROMPT.format(error=error)}
+                )
+
+        model = model or self.settings.openai_model
+        key = self._cache_key("sql", model, messages)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            metrics.record("sql_cache_hits")
+            if on_token is not None:
+                await on_token(cached.decode())
+            return cached.decode(), key
+        metrics.record("sql_cache_misses")
+
+        request = dict(
+            model=model,
+            messages=messages,
+            temperature=0.1,  # Low temperature for more deterministic SQL generation
+            max_tokens=500
+        )
+        if on_token is None:
+            response = await self._chat_completion(**request)
+            content = response.choices[0].message.content.strip()
+        else:
+            parts = []
+            async for text in self._chat_completion_stream(**request):
+                parts.append(text)
+                await on_token(text)
+            content = "".join(parts).strip()
+
+        if self.cache is None:
+            return content, None
+        self.cache.set(key, content.encode())
+        return content, key
+
+    def _build_messages(
+        self,
+        input_data: SQLChatRequest,
+        session: Optional[SessionResult],
+        allow_local: bool,
+        sample_percent: Optional[float],
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for SQL generation.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            session: Previous result of the conversation, if any
+            allow_local: Offer the LLM to answer from the previous result
+            sample_percent: Ask for a query over this percentage of the table
+
+        Returns:
+            List of chat messages
+        """
+        messages = [{"role": "system", "content": self._build_system_prompt()}]
+
+        if sample_percent is not None:
+            messages.append({
+                "role": "system",
+                "content": _APPROXIMATE_PROMPT.format(
+                    percent=sample_percent,
+                    clause=self.database.table_sample_clause(sample_percent),
+                    scale=100 / sample_percent,
+                ),
+            })
+
+        if session is not None:
+            follow_up = (
+                f"The user is asking a follow-up question. The previous question was: "
+                f"{session.question}\nIt was answered with this SQL:\n{session.sql}"
+            )
+            if allow_local and session.complete:
+                columns = "\n".join(
+                    f"- {name} ({dtype})" for name, dtype in session.data.dtypes.items()
+                )
+                follow_up += "\n\n" + _LOCAL_OPERATION_PROMPT.format(
+                    row_count=len(session.data), columns=columns
+                )
+            messages.append({"role": "system", "content": follow_up})
+
+        messages.append({"role": "user", "content": input_data.question})
         
         if input_data.context:
             messages.append({
@@ -102,40 +1061,186 @@ The database type is: {self.database.__class__.__name__}"""
                 "content": f"Additional context: {input_data.context}"
             })
 
-        response = await openai.ChatCompletion.acreate(
-            model=self.settings.openai_model,
-            messages=messages,
-            temperature=0.1,  # Low temperature for more deterministic SQL generation
-            max_tokens=500
-        )
+        return messages
 
-        generated_sql = response.choices[0].message.content.strip()
-        
-        # Validate and modify query if needed
-        if input_data.max_results:
-            if "limit" not in generated_sql.lower():
-                generated_sql += f"\nLIMIT {input_data.max_results}"
+    async def _answer_from_session(
+        self,
+        input_data: SQLChatRequest,
+        session: SessionResult,
+        content: str,
+        start_time: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Run a local operation from the completion on the previous result.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            session: Previous result of the conversation
+            content: Completion content holding a local operation
+            start_time: Time the request started processing
 
-        # Execute query and get results
+        Returns:
+            Response dict, or None if the operation is malformed or invalid
+        """
         try:
-            results_df = self.database.execute_query(generated_sql)
-            results = results_df.to_dict(orient="records")
-            column_names = list(results_df.columns)
-            row_count = len(results)
-        except Exception as e:
-            self.logger.error(f"Query execution failed: {str(e)}")
-            raise RuntimeError(f"Failed to execute query: {str(e)}")
+            operation = LocalOperation.parse_obj(json.loads(content)["local_operation"])
+            with metrics.span("local_operation"):
+                results_df = operation.apply(session.data)
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning("Local operation failed, querying database: %s", e)
+            return None
 
-        execution_time = time.time() - start_time
+        if input_data.max_results:
+            results_df = results_df.head(input_data.max_results)
 
-        return SQLChatResponse(
-            question=input_data.question,
-            generated_sql=generated_sql,
-            results=results,
-            column_names=column_names,
-            execution_time=execution_time,
-            row_count=row_count
-        ).dict()
+        self.logger.info("Follow-up served from previous session result")
+        return await self._build_response(
+            input_data,
+            operation.to_sql(session.sql),
+            results_df,
+            start_time,
+            source="session",
+            complete=session.complete and not (
+                input_data.max_results and len(results_df) >= input_data.max_results
+            ),
+        )
+
+    async def _build_response(
+        self,
+        input_data: SQLChatRequest,
+        generated_sql: str,
+        results_df: pd.DataFrame,
+        start_time: float,
+        source: str,
+        complete: bool,
+        sampling_rate: Optional[float] = None,
+        error_estimate: Optional[float] = None,
+        model: Optional[str] = None,
+        approximate: bool = False,
+    ) -> Dict[str, Any]:
+        """Build the response and remember the result for follow-ups.
+
+        For paged requests only the first page is returned; the rest is
+        kept behind a cursor, stored in a thread since it encodes and
+        writes every page.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            generated_sql: SQL that produced, or describes, the results
+            results_df: Result DataFrame
+            start_time: Time the request started processing
+            source: Where the results came from
+            complete: Whether the results hold every row the SQL matches
+            sampling_rate: Fraction of the table read, for approximate results
+            error_estimate: Relative standard error, for approximate results
+            model: Model that generated the SQL
+            approximate: Whether the results are estimates, e.g. from
+                column statistics
+
+        Returns:
+            Dict containing query results and metadata
+        """
+        if input_data.session_id:
+            self.sessions.put(
+                input_data.session_id, input_data.question, generated_sql,
+                results_df, complete,
+            )
+
+        truncated = bool(results_df.attrs.get("truncated"))
+        next_cursor, total_rows = None, None
+        if input_data.page_size:
+            next_cursor = await self._run_blocking(
+                "cursor_store",
+                self.cursors.create,
+                results_df,
+                input_data.page_size,
+                {
+                    "question": input_data.question,
+                    "generated_sql": generated_sql,
+                    "sampling_rate": sampling_rate,
+                    "error_estimate": error_estimate,
+                },
+            )
+            total_rows = len(results_df)
+            results_df = results_df.head(input_data.page_size)
+
+        with metrics.span("dataframe_conversion"):
+            results = to_records(results_df)
+        with metrics.span("serialization"):
+            return SQLChatResponse(
+                question=input_data.question,
+                generated_sql=generated_sql,
+                results=results,
+                column_names=list(results_df.columns),
+                execution_time=time.time() - start_time,
+                row_count=len(results),
+                source=source,
+                approximate=approximate or sampling_rate is not None,
+                sampling_rate=sampling_rate,
+                error_estimate=error_estimate,
+                next_cursor=next_cursor,
+                total_rows=total_rows,
+                model=model,
+                truncated=truncated,
+            ).dict()
+
+    async def _answer_from_profile(
+        self, input_data: SQLChatRequest, start_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """Answer "what are the distinct X" questions from the column profile.
+
+        Only string columns whose profile lists every value are eligible, so
+        the answer matches what the equivalent query returned when the
+        statistics were gathered. Rows written since may add values, so the
+        answer is marked approximate.
+
+        Args:
+            input_data: SQLChatRequest containing the question
+            start_time: Time the request started processing
+
+        Returns:
+            Response dict, or None if the question needs a real query
+        """
+        if input_data.context or not self.schema or not self.schema.column_stats:
+            return None
+
+        match = _DISTINCT_QUESTION.match(input_data.question.strip())
+        if not match:
+            return None
+
+        wanted = match.group("column").strip().lower().replace(" ", "_")
+        candidates = {wanted, re.sub(r"ies$", "y", wanted), re.sub(r"s$", "", wanted)}
+        column = next(
+            (col for col in self.schema.columns if col["name"].lower() in candidates),
+            None,
+        )
+        if column is None:
+            return None
+
+        stats = self.schema.column_stats.get(column["name"])
+        column_type = str(column.get("type", "")).upper()
+        if (
+            stats is None
+            or not stats.top_values_complete
+            or not any(t in column_type for t in ("CHAR", "TEXT", "STRING"))
+        ):
+            return None
+
+        values = sorted(stats.top_values)
+        if stats.null_fraction:
+            values.append(None)
+        values = values[:input_data.max_results or None]
+        self.logger.info("Answered from column profile of %s", column["name"])
+        return await self._build_response(
+            input_data,
+            f"SELECT DISTINCT {column['name']} FROM {self.schema.name}",
+            pd.DataFrame({column["name"]: values}),
+            start_time,
+            source="profile",
+            complete=not (
+                input_data.max_results and len(values) >= input_data.max_results
+            ),
+            approximate=True,
+        )
 
     async def get_schema_overview(self) -> Dict[str, Any]:
         """Get an overview of the database schema.
@@ -149,32 +1254,79 @@ The database type is: {self.database.__class__.__name__}"""
         }
 
     async def suggest_questions(self, n: int = 3) -> List[str]:
-        """Generate suggested questions based on the schema.
-        
+        """Get suggested questions based on the schema.
+
+        Questions come from a pool generated in batches for the current
+        schema, rotating so repeated requests see different ones. The LLM
+        is only waited for when the pool holds fewer than ``n`` questions;
+        when it holds fewer than its minimum otherwise, a batch is generated
+        in the background. Neither happens while the pool backs off after a
+        batch that added nothing new.
+
         Args:
-            n: Number of questions to generate
-            
+            n: Number of questions to return
+
         Returns:
             List of suggested questions
         """
-        schema_str = json.dumps(self.schema.dict(), indent=2)
-        
+        fingerprint = self._schema_fingerprint()
+        if self.suggestions is None or self.suggestions.scope != fingerprint:
+            self.suggestions = SuggestionPool(
+                self.cache,
+                scope=fingerprint,
+                min_size=self.settings.suggestion_pool_min,
+                max_size=self.settings.suggestion_pool_max,
+                ttl=self.settings.suggestion_ttl,
+            )
+        pool = self.suggestions
+
+        size = len(pool.questions())
+        if size < n and pool.can_generate():
+            metrics.record("suggestion_pool_misses")
+            try:
+                size = await pool.refill(lambda: self._generate_suggestions(n))
+            except Exception:
+                # Serve what the pool holds; the failure is logged by the pool
+                if not size:
+                    raise
+        else:
+            metrics.record("suggestion_pool_hits")
+        questions = pool.rotate(n)
+        if pool.needs_refill() and pool.can_generate():
+            pool.refill(lambda: self._generate_suggestions(n))
+        return questions
+
+    async def _generate_suggestions(self, n: int) -> List[str]:
+        """Ask the LLM for a batch of suggested questions.
+
+        Args:
+            n: Fewest questions the batch must hold
+
+        Returns:
+            Generated questions
+        """
+        count = max(n, self.settings.suggestion_batch_size)
+        schema_str = json.dumps(
+            self.schema.dict(exclude={"column_stats"}), separators=(",", ":")
+        )
+
         prompt = f"""Given this database schema:
 
 {schema_str}
 
-Generate {n} interesting analytical questions that could be answered using this data.
+Generate {count} varied, interesting analytical questions that could be answered using
+this data.
 Return only the questions, one per line, without numbering or additional text."""
 
-        response = await openai.ChatCompletion.acreate(
-            model=self.settings.openai_model,
+        columns = [column["name"] for column in self.schema.columns]
+        response = await self._chat_completion(
+            model=self.router.choose("suggest", columns=columns),
             messages=[
                 {"role": "system", "content": "You are a data analyst helping to explore a dataset."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=200
+            max_tokens=40 * count
         )
 
-        questions = response.choices[0].message.content.strip().split("\n")
-        return [q.strip() for q in questions if q.strip()]
\ No newline at end of file
+        return parse_questions(response.choices[0].message.content)
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""Pool of pregenerated question suggestions per schema version."""
+
+import asyncio
+import json
+import re
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from ai_analytics.cache import CacheBackend, MemoryCacheBackend
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Numbering or bullets an LLM may put before a question despite being told not to
+_LIST_MARKER = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+
+class SuggestionPool:
+    """Keeps suggested questions for one schema and serves them in rotation.
+
+    Questions are generated in batches and stored in a cache backend under
+    the schema fingerprint, so a changed schema starts a new pool and every
+    worker sharing the backend shares the questions. Each request gets the
+    next ``n`` questions after those served before, wrapping around;
+    serving reads the pool without using questions up. When the pool holds
+    fewer than ``min_size`` questions a batch is generated in the
+    background, and only one generation runs at a time. A batch that adds
+    no new question stops generation for ``retry_after`` seconds, so an LLM
+    that keeps repeating itself is not asked again on every request.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        scope: str = "",
+        min_size: int = 10,
+        max_size: int = 50,
+        ttl: float = 7 * 86400.0,
+        retry_after: float = 600.0,
+    ):
+        """Initialize the suggestion pool.
+
+        Args:
+            backend: Cache backend to keep questions in; an in-process one
+                is used when omitted.
+            scope: Fingerprint of the schema the questions are about.
+            min_size: Question count below which a batch is generated.
+            max_size: Most questions kept; the oldest are dropped first.
+            ttl: Seconds questions are kept in the backend.
+            retry_after: Seconds no batch is generated after one that
+                added no new question.
+        """
+        self.scope = scope
+        self.min_size = min_size
+        self.max_size = max_size
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.backend = backend or MemoryCacheBackend(default_ttl=ttl)
+        self._key = f"suggestions:{scope}"
+        self._offset = 0
+        self._retry_at = 0.0
+        self._refill: Optional["asyncio.Task[int]"] = None
+
+    def questions(self) -> List[str]:
+        """Get the stored questions, oldest first."""
+        payload = self.backend.get(self._key)
+        return json.loads(payload) if payload is not None else []
+
+    def rotate(self, n: int) -> List[str]:
+        """Get the next questions in rotation.
+
+        Args:
+            n: Number of questions.
+
+        Returns:
+            Up to ``n`` distinct questions.
+        """
+        questions = self.questions()
+        if not questions or n <= 0:
+            return []
+        start = self._offset % len(questions)
+        self._offset = start + n
+        return (questions[start:] + questions[:start])[:n]
+
+    def needs_refill(self) -> bool:
+        """Check that the pool holds fewer than ``min_size`` questions."""
+        return len(self.questions()) < self.min_size
+
+    def can_generate(self) -> bool:
+        """Check that generation is not backing off after a fruitless batch."""
+        return time.monotonic() >= self._retry_at
+
+    def add(self, questions: List[str]) -> int:
+        """Add generated questions, skipping ones already in the pool.
+
+        Args:
+            questions: Generated questions.
+
+        Returns:
+            Number of questions in the pool.
+        """
+        stored = self.questions()
+        seen = {question.lower() for question in stored}
+        for question in questions:
+            if question.lower() not in seen:
+                seen.add(question.lower())
+                stored.append(question)
+        stored = stored[-self.max_size:]
+        self.backend.set(self._key, json.dumps(stored).encode(), ttl=self.ttl)
+        return len(stored)
+
+    def refill(
+        self, generate: Callable[[], Awaitable[List[str]]]
+    ) -> "asyncio.Task[int]":
+        """Generate a batch of questions in the background.
+
+        Args:
+            generate: Coroutine function returning new questions.
+
+        Returns:
+            Task resolving to the pool size; the running one if a batch is
+            already being generated.
+        """
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.ensure_future(self._generate(generate))
+            self._refill.add_done_callback(_log_failure)
+        return self._refill
+
+    async def _generate(self, generate: Callable[[], Awaitable[List[str]]]) -> int:
+        """Generate a batch of questions and add it to the pool."""
+        with metrics.span("suggestion_generation"):
+            questions = await generate()
+        known = {question.lower() for question in self.questions()}
+        size = self.add(questions)
+        if not {question.lower() for question in questions} - known:
+            self._retry_at = time.monotonic() + self.retry_after
+            logger.warning(
+                "No new suggested questions for %s; not generating for %.0f seconds",
+                self.scope,
+                self.retry_after,
+            )
+        logger.info("Suggestion pool %s holds %d questions", self.scope, size)
+        return size
+
+
+def parse_questions(content: str) -> List[str]:
+    """Split completion content into questions, one per line.
+
+    Args:
+        content: Completion content.
+
+    Returns:
+        Questions without list markers or blank lines.
+    """
+    lines = (_LIST_MARKER.sub("", line).strip() for line in content.splitlines())
+    return [line for line in lines if line]
+
+
+def _log_failure(task: "asyncio.Task[int]") -> None:
+    """Log the error of a failed background generation."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Could not generate suggested questions: %s", task.exception())
\ No newline at end of file
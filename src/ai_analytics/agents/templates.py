@@ -0,0 +1,198 @@
+"""Parameterized SQL templates for questions that differ only in literals."""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ai_analytics.cache import CacheBackend, MemoryCacheBackend
+from ai_analytics.database.sql import filter_literals, replace_parameters
+from ai_analytics.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Literals a question can carry: quoted text, ISO dates and numbers
+_QUESTION_LITERALS = (
+    r"""'(?P<single>[^']+)'|"(?P<double>[^"]+)"|(?P<date>\b\d{4}-\d{2}-\d{2}\b)"""
+    r"|(?P<number>(?<![\w.])-?\d+(?:\.\d+)?(?![\w.]))"
+)
+
+
+class TemplateStore:
+    """Keeps SQL templates learned from generated queries.
+
+    A question's literals are quoted text, ISO dates, numbers and values
+    from the column profile. When every literal of a question appears as a
+    filter literal in the SQL generated for it, those filter literals are
+    replaced by ``:p0``, ``:p1``, ... placeholders and the template is
+    stored under the question with its literals masked. A later question
+    of the same shape gets the template with its own literals as parameter
+    values. Templates live in a cache backend and expire ``ttl`` seconds
+    after they were learned.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 86400.0,
+        scope: str = "",
+        known_values: Optional[Mapping[str, str]] = None,
+    ):
+        """Initialize the template store.
+
+        Args:
+            backend: Cache backend to keep templates in; an in-process one
+                is used when omitted.
+            ttl: Seconds a template is kept.
+            scope: Identifies the database and schema the templates apply to.
+            known_values: Profiled string values mapped to their column, so
+                unquoted values in questions are recognized.
+        """
+        self.ttl = ttl
+        self.scope = scope
+        self.backend = backend or MemoryCacheBackend(default_ttl=ttl)
+        self._columns: Dict[str, Tuple[str, str]] = {
+            value.lower(): (value, column)
+            for value, column in (known_values or {}).items()
+            if len(value) > 1
+        }
+        pattern = _QUESTION_LITERALS
+        if self._columns:
+            # Longest first, so multi-word values win over their parts
+            values = sorted(self._columns, key=len, reverse=True)
+            pattern += r"|(?P<known>\b(?:" + "|".join(map(re.escape, values)) + r")\b)"
+        self._literals = re.compile(pattern, re.IGNORECASE)
+
+    def learn(self, question: str, sql: str) -> bool:
+        """Store the template of SQL that answered a question.
+
+        Args:
+            question: Natural language question.
+            sql: SQL that answered it, before limits or sampling are applied.
+
+        Returns:
+            True if a template was stored; False if the question has no
+            literals, or they cannot all be mapped to filter literals of
+            the SQL without ambiguity.
+        """
+        shape, slots = self._parse(question)
+        if not slots or len({str(value) for _, value in slots}) < len(slots):
+            return False
+        # Placeholders already in the SQL would be taken for parameters
+        if replace_parameters(sql, lambda name: "") != sql:
+            return False
+
+        types: List[Optional[str]] = [None] * len(slots)
+        replacements = []
+        for start, end, literal in filter_literals(sql):
+            matches = [
+                i for i, (_, value) in enumerate(slots) if _equal(value, literal)
+            ]
+            if not matches:
+                continue
+            i = matches[0]
+            literal_type = type(literal).__name__
+            if types[i] not in (None, literal_type):
+                return False
+            types[i] = literal_type
+            replacements.append((start, end, i))
+        if None in types:
+            return False
+
+        template = sql
+        for start, end, i in reversed(replacements):
+            template = f"{template[:start]}:p{i}{template[end:]}"
+        payload = json.dumps({"sql": template, "types": types}).encode()
+        self.backend.set(self._key(shape), payload, ttl=self.ttl)
+        logger.debug("Learned SQL template for %r", shape)
+        return True
+
+    def match(self, question: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """Get the template for a question and its parameter values.
+
+        Args:
+            question: Natural language question.
+
+        Returns:
+            Tuple of the template SQL, parameter values by placeholder name
+            and the template key, or None if no template matches.
+        """
+        shape, slots = self._parse(question)
+        if not slots:
+            return None
+        key = self._key(shape)
+        payload = self.backend.get(key)
+        if payload is None:
+            return None
+
+        stored = json.loads(payload)
+        if len(stored["types"]) != len(slots):
+            return None
+        params = {}
+        for i, ((_, value), type_name) in enumerate(zip(slots, stored["types"])):
+            try:
+                params[f"p{i}"] = _convert(value, type_name)
+            except ValueError:
+                return None
+        return stored["sql"], params, key
+
+    def forget(self, key: str) -> None:
+        """Drop a template whose SQL failed.
+
+        Args:
+            key: Template key from ``match``.
+        """
+        self.backend.delete(key)
+
+    def _parse(self, question: str) -> Tuple[str, List[Tuple[str, Any]]]:
+        """Split a question into its shape and its literals.
+
+        Returns:
+            The lowercased question with each literal replaced by a marker
+            of its kind, and the kind and value of each literal.
+        """
+        slots: List[Tuple[str, Any]] = []
+
+        def mask(match: "re.Match[str]") -> str:
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "known":
+                value, column = self._columns[text.lower()]
+                slots.append((column, value))
+                return f"{{{column}}}"
+            if kind == "number":
+                slots.append((kind, float(text) if "." in text else int(text)))
+            else:
+                slots.append(("text" if kind in ("single", "double") else kind, text))
+            return f"{{{slots[-1][0]}}}"
+
+        shape = self._literals.sub(mask, question)
+        shape = " ".join(shape.lower().split()).rstrip("?.! ")
+        return shape, slots
+
+    def _key(self, shape: str) -> str:
+        """Build the cache key of a question shape."""
+        digest = hashlib.sha256(shape.encode()).hexdigest()
+        return f"template:{self.scope}:{digest}"
+
+
+def _equal(value: Any, literal: Any) -> bool:
+    """Check whether a question literal equals a SQL literal."""
+    if isinstance(literal, str):
+        return str(value) == literal
+    return not isinstance(value, str) and value == literal
+
+
+def _convert(value: Any, type_name: str) -> Any:
+    """Convert a question literal to the type of the SQL literal it replaces.
+
+    Raises:
+        ValueError: If the value does not fit the type.
+    """
+    if type_name == "str":
+        return str(value)
+    if type_name == "int":
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"Not an integer: {value}")
+        return int(value)
+    return float(value)
\ No newline at end of file
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 from ai_analytics.agents.base import BaseAgent
 from ai_analytics.config import Settings
+from ai_analytics.utils import metrics
 
 
 class TextAnalysisRequest(BaseModel):
@@ -41,21 +42,34 @@ class TextAnalysisAgent(BaseAgent):
         Returns:
             Dict containing analysis results.
         """
-        system_prompt = self._build_system_prompt(input_data.tasks)
-        
-        response = await openai.ChatCompletion.acreate(
-            model=self.settings.openai_model,
-            messages=[
+        with metrics.span("prompt"):
+            system_prompt = self._build_system_prompt(input_data.tasks)
+            messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": input_data.text}
-            ],
-            temperature=0.3,
+            ]
+
+        model = self.router.choose("text", input_data.text)
+        key = self._cache_key("text", model, messages)
+        analysis = self.cache.get(key) if self.cache is not None else None
+        metrics.record(
+            "text_cache_hits" if analysis is not None else "text_cache_misses"
         )
+        if analysis is None:
+            response = await self._chat_completion(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+            )
+            analysis = response.choices[0].message.content.encode()
+            if self.cache is not None:
+                self.cache.set(key, analysis)
         
         return {
-            "analysis": response.choices[0].message.content,
+            "analysis": analysis.decode(),
             "tasks": input_data.tasks,
             "language": input_data.language,
+            "model": model,
         }
 
     def _build_system_prompt(self, tasks: List[str]) -> str:
@@ -80,9 +94,10 @@ class TextAnalysisAgent(BaseAgent):
             for task in tasks
         ]
         
+        task_list = "\n- ".join(selected_tasks)
         return (
             "You are an advanced text analysis system. "
-            f"Please perform the following tasks:\n"
-            f"- {'\n- '.join(selected_tasks)}\n\n"
+            "Please perform the following tasks:\n"
+            f"- {task_list}\n\n"
             "Provide the results in a clear, structured format."
         )
\ No newline at end of file
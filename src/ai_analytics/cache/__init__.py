@@ -0,0 +1,14 @@
+"""Cache backends shared by the library's caches."""
+
+from ai_analytics.cache.base import CacheBackend, create_cache_backend
+from ai_analytics.cache.bounded import BoundedCacheBackend
+from ai_analytics.cache.memory import MemoryCacheBackend
+from ai_analytics.cache.sqlite import SQLiteCacheBackend
+
+__all__ = [
+    "BoundedCacheBackend",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "create_cache_backend",
+]
\ No newline at end of file
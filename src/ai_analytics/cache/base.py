@@ -0,0 +1,96 @@
+"""Base cache backend interface."""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ai_analytics.config import Settings
+
+
+class CacheBackend(ABC):
+    """Abstract byte-oriented key/value store with expiry.
+
+    Callers namespace their keys (``results:``, ``schema:``, ``sql:``,
+    ``text:``) so a single backend can serve every cache in the library.
+    """
+
+    def __init__(self) -> None:
+        """Initialize hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Stored bytes, or None if missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key.
+            value: Bytes to store.
+            ttl: Seconds until the value expires; uses the backend default
+                when omitted.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present.
+
+        Args:
+            key: Cache key.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values."""
+        pass
+
+    def _record(self, value: Optional[bytes]) -> Optional[bytes]:
+        """Count a lookup as a hit or miss and pass the value through."""
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+
+def create_cache_backend(settings: Settings) -> Optional[CacheBackend]:
+    """Create the cache backend selected in settings.
+
+    Args:
+        settings: Settings with ``cache_backend`` set to ``memory``,
+            ``sqlite`` or ``none``.
+
+    Returns:
+        Configured CacheBackend, or None if caching is disabled.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    name = settings.cache_backend.lower()
+    if name == "none":
+        return None
+    if name == "memory":
+        from ai_analytics.cache.memory import MemoryCacheBackend
+        return MemoryCacheBackend(
+            max_bytes=settings.cache_max_bytes, default_ttl=settings.cache_ttl
+        )
+    if name == "sqlite":
+        from ai_analytics.cache.sqlite import SQLiteCacheBackend
+        return SQLiteCacheBackend(
+            settings.cache_path,
+            max_bytes=settings.cache_max_bytes,
+            default_ttl=settings.cache_ttl,
+        )
+    raise ValueError(f"Unsupported cache backend: {settings.cache_backend}")
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Byte budget for one cache's entries on a shared backend."""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from ai_analytics.cache.base import CacheBackend
+
+
+class BoundedCacheBackend(CacheBackend):
+    """Bounds the bytes one cache stores in a backend shared with others.
+
+    Sizes of the values written through this wrapper are tracked in an LRU
+    and the least recently used are deleted from the underlying backend
+    once they exceed ``max_bytes``, so one cache cannot evict the entries
+    of the others. Accounting is per process: with a backend shared across
+    workers each worker keeps its own writes within the budget.
+    """
+
+    def __init__(self, backend: CacheBackend, max_bytes: int):
+        """Initialize the bounded backend.
+
+        Args:
+            backend: Backend the values are stored in.
+            max_bytes: Maximum total size of the values written through
+                this wrapper.
+        """
+        super().__init__()
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value, refreshing its recency."""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self._forget(key)
+            elif key in self._sizes:
+                self._sizes.move_to_end(key)
+            return self._record(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, deleting least recently used values over budget."""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._forget(key)
+            self._sizes[key] = len(value)
+            self.size += len(value)
+            evicted = []
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._sizes))
+                self._forget(oldest)
+                evicted.append(oldest)
+        for old_key in evicted:
+            self.backend.delete(old_key)
+        self.backend.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        with self._lock:
+            self._forget(key)
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Remove the values written through this wrapper."""
+        with self._lock:
+            keys = list(self._sizes)
+            self._sizes.clear()
+            self.size = 0
+        for key in keys:
+            self.backend.delete(key)
+
+    def _forget(self, key: str) -> None:
+        """Stop tracking a key; the lock must be held."""
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.size -= size
\ No newline at end of file
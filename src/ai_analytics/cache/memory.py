@@ -0,0 +1,71 @@
+"""In-process cache backend."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ai_analytics.cache.base import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Byte-bounded LRU cache held in process memory.
+
+    Only visible to the process that owns it; use ``SQLiteCacheBackend`` to
+    share entries between worker processes on a host.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, default_ttl: float = 3600.0):
+        """Initialize the memory backend.
+
+        Args:
+            max_bytes: Maximum total size of stored values.
+            default_ttl: Seconds until values expire unless set otherwise.
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value, refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return self._record(entry[0] if entry else None)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used values over budget."""
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the lock must be held."""
+        value, _ = self._entries.pop(key)
+        self.size -= len(value)
\ No newline at end of file
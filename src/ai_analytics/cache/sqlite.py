@@ -0,0 +1,136 @@
+"""SQLite cache backend shared by worker processes on a host."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ai_analytics.cache.base import CacheBackend
+
+# Recency is only written back when older than this, so hot reads stay
+# read-only and do not contend for the database write lock
+_TOUCH_INTERVAL = 30.0
+
+# Eviction runs once per this many writes rather than on every write
+_EVICT_EVERY = 64
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache stored in a local SQLite file.
+
+    Every worker process that opens the same path sees the same entries.
+    The database runs in WAL mode, so readers in all processes proceed
+    concurrently with a single writer. Size is bounded approximately: once
+    the stored values exceed ``max_bytes``, least recently used entries are
+    removed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+        default_ttl: float = 3600.0,
+    ):
+        """Initialize the SQLite backend.
+
+        Args:
+            path: Path of the SQLite file; created if missing.
+            max_bytes: Approximate maximum total size of stored values.
+            default_ttl: Seconds until values expire unless set otherwise.
+        """
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value, refreshing its recency at most every few seconds."""
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return self._record(None)
+
+        value, expires_at, accessed_at = row
+        if expires_at < now:
+            conn.execute(
+                "DELETE FROM cache WHERE key = ? AND expires_at < ?", (key, now)
+            )
+            return self._record(None)
+        if now - accessed_at > _TOUCH_INTERVAL:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._record(bytes(value))
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, periodically evicting expired and old entries."""
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(value), len(value), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove expired entries, then old entries until under budget."""
+        conn = self._connection()
+        conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        rows = conn.execute("SELECT key, size FROM cache ORDER BY accessed_at")
+        for key, size in rows:
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._connection().execute("DELETE FROM cache")
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Configuration management for AI Analytics Library."""
 
+import os
+import tempfile
 from typing import Optional
 from pydantic import BaseSettings, Field
 
@@ -11,6 +13,13 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4", env="OPENAI_MODEL")
     
+    # Model Routing Configuration (off unless a fast model is set)
+    openai_fast_model: Optional[str] = Field(None, env="OPENAI_FAST_MODEL")
+    routing_complexity_threshold: float = Field(0.5, env="ROUTING_COMPLEXITY_THRESHOLD")
+    routing_max_schema_columns: int = Field(50, env="ROUTING_MAX_SCHEMA_COLUMNS")
+    routing_min_success_rate: float = Field(0.8, env="ROUTING_MIN_SUCCESS_RATE")
+    routing_min_samples: int = Field(20, env="ROUTING_MIN_SAMPLES")
+    
     # Azure Configuration (optional)
     azure_openai_api_key: Optional[str] = Field(None, env="AZURE_OPENAI_API_KEY")
     azure_openai_endpoint: Optional[str] = Field(None, env="AZURE_OPENAI_ENDPOINT")
@@ -19,9 +28,77 @@ class Settings(BaseSettings):
     agent_timeout: float = Field(30.0, env="AGENT_TIMEOUT")
     max_retries: int = Field(3, env="MAX_RETRIES")
     
+    # Session Configuration
+    session_max_count: int = Field(100, env="SESSION_MAX_COUNT")
+    session_max_rows: int = Field(10_000, env="SESSION_MAX_ROWS")
+    session_ttl: float = Field(1800.0, env="SESSION_TTL")
+    
+    # Cache Configuration
+    cache_backend: str = Field("memory", env="CACHE_BACKEND")
+    cache_path: str = Field(
+        os.path.join(tempfile.gettempdir(), "ai_analytics_cache.sqlite"),
+        env="CACHE_PATH",
+    )
+    cache_max_bytes: int = Field(1024 * 1024 * 1024, env="CACHE_MAX_BYTES")
+    cache_ttl: float = Field(3600.0, env="CACHE_TTL")
+    
+    # Approximate Query Configuration
+    approximate_sample_percent: float = Field(1.0, env="APPROXIMATE_SAMPLE_PERCENT")
+    approximate_min_rows: int = Field(1_000_000, env="APPROXIMATE_MIN_ROWS")
+    
+    # Result Cache Configuration
+    result_cache_max_bytes: int = Field(256 * 1024 * 1024, env="RESULT_CACHE_MAX_BYTES")
+    result_cache_ttl: float = Field(3600.0, env="RESULT_CACHE_TTL")
+    # For results whose tables' changes cannot be detected, e.g. views
+    result_cache_unversioned_ttl: float = Field(
+        60.0, env="RESULT_CACHE_UNVERSIONED_TTL"
+    )
+    
+    # Result Memory Budget (0 fetches every row)
+    result_max_bytes: int = Field(256 * 1024 * 1024, env="RESULT_MAX_BYTES")
+    
+    # Result Cursor Configuration
+    cursor_ttl: float = Field(900.0, env="CURSOR_TTL")
+    cursor_max_rows: int = Field(100_000, env="CURSOR_MAX_ROWS")
+    cursor_max_bytes: int = Field(256 * 1024 * 1024, env="CURSOR_MAX_BYTES")
+    
+    # Streaming Configuration
+    stream_batch_rows: int = Field(1000, env="STREAM_BATCH_ROWS")
+    
+    # SQL Validation Configuration
+    sql_validation: bool = Field(True, env="SQL_VALIDATION")
+    sql_repair_attempts: int = Field(2, env="SQL_REPAIR_ATTEMPTS")
+    
+    # Federated Query Configuration
+    federated_max_source_rows: int = Field(100_000, env="FEDERATED_MAX_SOURCE_ROWS")
+    federated_max_agents: int = Field(16, env="FEDERATED_MAX_AGENTS")
+    
+    # SQL Template Configuration
+    sql_templates: bool = Field(True, env="SQL_TEMPLATES")
+    template_ttl: float = Field(86400.0, env="TEMPLATE_TTL")
+    
+    # Question Suggestion Configuration
+    suggestion_batch_size: int = Field(20, env="SUGGESTION_BATCH_SIZE")
+    suggestion_pool_min: int = Field(10, env="SUGGESTION_POOL_MIN")
+    suggestion_pool_max: int = Field(50, env="SUGGESTION_POOL_MAX")
+    suggestion_ttl: float = Field(7 * 86400.0, env="SUGGESTION_TTL")
+    
+    # Background Job Configuration
+    job_max_workers: int = Field(4, env="JOB_MAX_WORKERS")
+    job_tenant_limit: int = Field(2, env="JOB_TENANT_LIMIT")
+    job_tenant_max_queued: int = Field(20, env="JOB_TENANT_MAX_QUEUED")
+    job_retention: float = Field(3600.0, env="JOB_RETENTION")
+    job_max_jobs: int = Field(1000, env="JOB_MAX_JOBS")
+    
+    # LLM Cassette Configuration (record/replay of completions)
+    llm_cassette_path: Optional[str] = Field(None, env="LLM_CASSETTE_PATH")
+    llm_cassette_mode: str = Field("replay", env="LLM_CASSETTE_MODE")
+    llm_cassette_latency_scale: float = Field(0.0, env="LLM_CASSETTE_LATENCY_SCALE")
+    
     # Monitoring Configuration
     enable_monitoring: bool = Field(True, env="ENABLE_MONITORING")
     log_level: str = Field("INFO", env="LOG_LEVEL")
+    log_format: str = Field("json", env="LOG_FORMAT")
     
     class Config:
         """Pydantic configuration."""
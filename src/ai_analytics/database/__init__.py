@@ -1,7 +1,40 @@
 """Database connection and query execution utilities."""
 
-from ai_analytics.database.base import DatabaseConnection
-from ai_analytics.database.bigquery import BigQueryConnection
-from ai_analytics.database.postgres import PostgresConnection
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["DatabaseConnection", "BigQueryConnection", "PostgresConnection"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from ai_analytics.database.base import DatabaseConnection
+    from ai_analytics.database.bigquery import BigQueryConnection
+    from ai_analytics.database.cache import ResultCache
+    from ai_analytics.database.postgres import PostgresConnection
+
+# Backends load on first access, so Postgres-only deployments never import
+# the BigQuery SDK and vice versa
+_LAZY_ATTRIBUTES = {
+    "DatabaseConnection": "ai_analytics.database.base",
+    "BigQueryConnection": "ai_analytics.database.bigquery",
+    "PostgresConnection": "ai_analytics.database.postgres",
+    "ResultCache": "ai_analytics.database.cache",
+}
+
+__all__ = [
+    "DatabaseConnection",
+    "BigQueryConnection",
+    "PostgresConnection",
+    "ResultCache",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import connection classes on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including lazy ones."""
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -1,23 +1,104 @@
 """Base database connection interface."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from pydantic import BaseModel
 
+from ai_analytics.cache import CacheBackend
+from ai_analytics.database.cache import ResultCache
+from ai_analytics.database.frames import compact_dtypes, limit_bytes
+from ai_analytics.database.sql import (
+    add_table_sample,
+    extract_tables,
+    is_volatile,
+    render_parameters,
+    syntax_error,
+    table_references,
+)
+from ai_analytics.utils import metrics
+from ai_analytics.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows fetched per batch when a result is read within a memory budget
+_BUDGET_BATCH_ROWS = 10000
+
+
+class ColumnStats(BaseModel):
+    """Approximate value profile for a single column."""
+
+    name: str
+    null_fraction: Optional[float] = None
+    distinct_count: Optional[float] = None
+    min_value: Optional[Any] = None
+    max_value: Optional[Any] = None
+    top_values: List[Any] = []
+    top_values_complete: bool = False
+
+    def summary(self) -> str:
+        """Render the stats as a compact one-line description.
+
+        Returns:
+            Short human readable summary suitable for an LLM prompt.
+        """
+        parts = []
+        if self.null_fraction:
+            parts.append(f"{self.null_fraction:.0%} null")
+        if self.distinct_count is not None:
+            parts.append(f"~{int(self.distinct_count)} distinct")
+        if self.min_value is not None and self.max_value is not None:
+            parts.append(f"range {self.min_value!r}..{self.max_value!r}")
+        if self.top_values:
+            values = ", ".join(repr(value) for value in self.top_values)
+            label = "values" if self.top_values_complete else "common values"
+            parts.append(f"{label}: {values}")
+        return f"{self.name}: " + ("; ".join(parts) or "no statistics")
+
 
 class TableSchema(BaseModel):
     """Schema information for a database table."""
     
     name: str
-    columns: List[Dict[str, str]]
+    columns: List[Dict[str, Any]]
     description: Optional[str] = None
+    column_stats: Optional[Dict[str, ColumnStats]] = None
+
+    def format_column_stats(self) -> str:
+        """Format the cached column profile for use in prompts.
+
+        Returns:
+            One line per profiled column, or an empty string if no profile.
+        """
+        if not self.column_stats:
+            return ""
+        return "\n".join(stats.summary() for stats in self.column_stats.values())
 
 
 class DatabaseConnection(ABC):
     """Abstract base class for database connections."""
 
+    # SQL dialect whose string quoting the lexical query check follows
+    sql_dialect: Optional[str] = None
+
+    def __init__(
+        self,
+        result_cache: Optional[ResultCache] = None,
+        cache: Optional[CacheBackend] = None,
+    ) -> None:
+        """Initialize state shared by all connections.
+
+        Args:
+            result_cache: Optional cache for query results, which may be
+                shared between connections.
+            cache: Optional cache backend for table metadata such as the
+                profiled schema, which may be shared between processes.
+        """
+        self.result_cache = result_cache
+        self.cache = cache
+        self._profiled_schema: Optional[TableSchema] = None
+
     @abstractmethod
     def connect(self) -> None:
         """Establish connection to the database."""
@@ -28,9 +109,208 @@ class DatabaseConnection(ABC):
         """Close the database connection."""
         pass
 
-    @abstractmethod
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def execute_query(
+        self,
+        query: str,
+        use_cache: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> pd.DataFrame:
         """Execute a SQL query and return results as a DataFrame.
+
+        Read-only queries are served from the result cache when one is
+        configured and the tables they read have not changed. Queries calling
+        functions such as ``now()`` or ``random()`` are never cached.
+        
+        Args:
+            query: SQL query string to execute.
+            use_cache: Whether the result cache may be used.
+            params: Values for ``:name`` placeholders in the query. Backends
+                that support it bind them server-side; others receive them
+                inlined as literals.
+            max_bytes: Memory budget for the result. When given, rows are
+                fetched in batches into compacted dtypes and fetching stops
+                once the budget is reached; ``attrs["truncated"]`` of the
+                result tells whether rows were dropped. Truncated results
+                are not cached.
+            
+        Returns:
+            DataFrame containing query results.
+        """
+        rendered = render_parameters(query, params) if params else query
+        if (
+            self.result_cache is None
+            or not use_cache
+            or not self.validate_query(rendered)
+            or is_volatile(rendered)
+        ):
+            return self._fetch(query, params, max_bytes)
+
+        try:
+            key, marker, cached = self._cached_result(rendered)
+        except Exception as e:
+            logger.warning("Could not read table change marker: %s", e)
+            return self._fetch(query, params, max_bytes)
+        if cached is not None:
+            return cached if max_bytes is None else limit_bytes(cached, max_bytes)
+
+        df = self._fetch(query, params, max_bytes)
+        if not df.attrs.get("truncated"):
+            with metrics.span("result_cache"):
+                self.result_cache.put(key, df, marker)
+        return df
+
+    def iter_query(
+        self,
+        query: str,
+        batch_size: int = 1000,
+        use_cache: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Execute a SQL query and yield its results in batches as they arrive.
+
+        Cached results are served from the result cache. Otherwise rows are
+        fetched from the backend batch by batch and not added to the cache,
+        so the whole result is never held in memory.
+
+        Args:
+            query: SQL query string to execute.
+            batch_size: Maximum rows per batch.
+            use_cache: Whether the result cache may be used.
+            params: Values for ``:name`` placeholders in the query, bound
+                by the backend.
+
+        Yields:
+            DataFrames of consecutive rows; at least one, possibly empty, so
+            the columns are known.
+        """
+        rendered = render_parameters(query, params) if params else query
+        cacheable = use_cache and self.validate_query(rendered)
+        if self.result_cache is not None and cacheable:
+            try:
+                cached = self._cached_result(rendered)[2]
+            except Exception as e:
+                logger.warning("Could not read table change marker: %s", e)
+                cached = None
+            if cached is not None:
+                yield from _batches(cached, batch_size)
+                return
+
+        if params:
+            batches = self._iter_parameterized(query, params, batch_size)
+        else:
+            batches = self._iter_query(query, batch_size)
+        try:
+            while True:
+                with metrics.span("db_query"):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                if metrics.enabled():
+                    metrics.record("rows_fetched", len(batch))
+                    metrics.record(
+                        "bytes_fetched", int(batch.memory_usage(deep=True).sum())
+                    )
+                yield batch
+        finally:
+            batches.close()
+
+    def _cached_result(
+        self, query: str
+    ) -> Tuple[str, Optional[str], Optional[pd.DataFrame]]:
+        """Look a query up in the result cache.
+
+        Args:
+            query: Read-only SQL query string.
+
+        Returns:
+            Tuple of the cache key, the tables' change marker and the cached
+            result, or None on a miss.
+        """
+        with metrics.span("table_marker"):
+            marker = self._table_marker(extract_tables(query))
+        key = self.result_cache.make_key(self._cache_identity(), query)
+        with metrics.span("result_cache"):
+            cached = self.result_cache.get(key, marker)
+        metrics.record(
+            "result_cache_hits" if cached is not None else "result_cache_misses"
+        )
+        return key, marker, cached
+
+    def _fetch(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Execute a query on the backend, recording rows and bytes fetched."""
+        if max_bytes is not None:
+            df = self._fetch_within(query, max_bytes, params)
+        else:
+            with metrics.span("db_query"):
+                if params:
+                    df = self._execute_parameterized(query, params)
+                else:
+                    df = self._execute_query(query)
+        if metrics.enabled():
+            metrics.record("rows_fetched", len(df))
+            metrics.record("bytes_fetched", int(df.memory_usage(deep=True).sum()))
+        return df
+
+    def _fetch_within(
+        self, query: str, max_bytes: int, params: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """Fetch a result batch by batch until it exceeds a memory budget.
+
+        Batches are compacted as they arrive and the rows of the batch that
+        crosses the budget are cut, after which the backend stops fetching.
+        Low-cardinality strings become categoricals once all rows are in.
+
+        Args:
+            query: SQL query string.
+            max_bytes: Memory budget in bytes.
+            params: Values for ``:name`` placeholders in the query.
+
+        Returns:
+            Compacted DataFrame with ``attrs["truncated"]`` set.
+        """
+        kept: List[pd.DataFrame] = []
+        size, truncated = 0, False
+        if params:
+            batches = self._iter_parameterized(query, params, _BUDGET_BATCH_ROWS)
+        else:
+            batches = self._iter_query(query, _BUDGET_BATCH_ROWS)
+        try:
+            while True:
+                with metrics.span("db_query"):
+                    batch = next(batches, None)
+                if batch is None:
+                    break
+                batch = compact_dtypes(batch, categories=False)
+                batch_bytes = int(batch.memory_usage(deep=True).sum())
+                if size + batch_bytes > max_bytes:
+                    rows = int(len(batch) * (max_bytes - size) / batch_bytes)
+                    kept.append(batch.head(rows))
+                    truncated = True
+                    break
+                kept.append(batch)
+                size += batch_bytes
+        finally:
+            batches.close()
+
+        df = pd.concat(kept, ignore_index=True) if len(kept) > 1 else kept[0]
+        df = compact_dtypes(df)
+        df.attrs["truncated"] = truncated
+        if truncated:
+            logger.warning(
+                "Result truncated to %d rows by the %d byte budget", len(df), max_bytes
+            )
+            metrics.record("results_truncated")
+        return df
+
+    @abstractmethod
+    def _execute_query(self, query: str) -> pd.DataFrame:
+        """Execute a SQL query against the database, bypassing any cache.
         
         Args:
             query: SQL query string to execute.
@@ -40,6 +320,180 @@ class DatabaseConnection(ABC):
         """
         pass
 
+    def _execute_parameterized(
+        self, query: str, params: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Execute a SQL query with bind parameters, bypassing any cache.
+
+        Backends with server-side parameters or prepared statements
+        override this; by default the values are inlined as literals.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+
+        Returns:
+            DataFrame containing query results.
+        """
+        return self._execute_query(render_parameters(query, params))
+
+    def _iter_query(self, query: str, batch_size: int) -> Iterator[pd.DataFrame]:
+        """Execute a SQL query, yielding results in batches, bypassing any cache.
+
+        Backends that can fetch incrementally override this; by default the
+        complete result is fetched and then split.
+
+        Args:
+            query: SQL query string to execute.
+            batch_size: Maximum rows per batch.
+
+        Yields:
+            DataFrames of consecutive rows, at least one.
+        """
+        yield from _batches(self._execute_query(query), batch_size)
+
+    def _iter_parameterized(
+        self, query: str, params: Dict[str, Any], batch_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Execute a SQL query with bind parameters, yielding results in batches.
+
+        Backends that can bind parameters and fetch incrementally override
+        this; by default the parameterized result is fetched and then split.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+            batch_size: Maximum rows per batch.
+
+        Yields:
+            DataFrames of consecutive rows, at least one.
+        """
+        yield from _batches(self._execute_parameterized(query, params), batch_size)
+
+    def check_query(self, query: str) -> Optional[str]:
+        """Check that a query would run, without running it.
+
+        The query is only checked lexically here; backends that can plan a
+        query without executing it also catch unknown tables, columns and
+        functions and type errors.
+
+        Args:
+            query: SQL query string.
+
+        Returns:
+            The error the database reports for the query, or None if it
+            passed.
+        """
+        return syntax_error(query, self.sql_dialect)
+
+    def estimate_cost(self, query: str) -> Optional[Dict[str, Any]]:
+        """Estimate the cost of a query without running it.
+
+        Args:
+            query: SQL query string.
+
+        Returns:
+            Backend-specific estimate, such as planned rows or bytes to be
+            scanned, or None if the backend cannot estimate costs.
+        """
+        return None
+
+    def _cache_identity(self) -> str:
+        """Identify the database queries run against, for cache keys.
+
+        Backends override this with their connection parameters, so that
+        connections to the same database share entries across connections
+        and processes; the default is unique to this connection.
+
+        Returns:
+            String that differs between databases returning different data.
+        """
+        return f"{self.__class__.__name__}:{id(self)}"
+
+    def apply_table_sample(self, query: str, percent: float) -> Optional[str]:
+        """Rewrite a query to read the configured table through a sample.
+
+        Args:
+            query: SQL query string.
+            percent: Percentage of the table to sample.
+
+        Returns:
+            Rewritten query, or None if the backend does not support
+            sampling or the query does not read the table exactly once.
+        """
+        clause = self.table_sample_clause(percent)
+        if clause is None or not self._qualified_table_name():
+            return None
+        return add_table_sample(query, self._table_names(), clause)
+
+    def table_references(self, query: str) -> List[Tuple[int, bool]]:
+        """Find the references of the configured table in a query.
+
+        Args:
+            query: SQL query string.
+
+        Returns:
+            Parenthesis depth of each reference, 0 for the outermost query,
+            and whether it carries a TABLESAMPLE clause.
+        """
+        if not self._qualified_table_name():
+            return []
+        return table_references(query, self._table_names())
+
+    def _table_names(self) -> List[str]:
+        """Get the names the configured table can be referenced by."""
+        parts = self._qualified_table_name().split(".")
+        return [".".join(parts[i:]) for i in range(len(parts))]
+
+    def estimate_row_count(self) -> Optional[int]:
+        """Estimate the number of rows in the configured table from metadata.
+
+        Returns:
+            Estimated row count, or None if unknown.
+        """
+        return None
+
+    def table_sample_clause(self, percent: float) -> Optional[str]:
+        """Get the dialect's TABLESAMPLE clause.
+
+        Args:
+            percent: Percentage of the table to sample.
+
+        Returns:
+            Clause string, or None if sampling is unsupported.
+        """
+        return None
+
+    def pool_status(self) -> Optional[Dict[str, int]]:
+        """Get the state of the connection pool.
+
+        Returns:
+            Dict with the pool ``size``, connections ``checked_out`` and
+            ``overflow`` connections beyond the size, or None if the
+            connection is not pooled.
+        """
+        return None
+
+    def _qualified_table_name(self) -> str:
+        """Get the fully qualified name of the configured table.
+
+        Returns:
+            Qualified table name, or an empty string if not applicable.
+        """
+        return ""
+
+    def _table_marker(self, tables: List[str]) -> Optional[str]:
+        """Get a marker that changes whenever any of the tables change.
+
+        Args:
+            tables: Table references read by a query.
+
+        Returns:
+            Marker string, or None if changes cannot be detected, in which
+            case cached results only expire by TTL.
+        """
+        return None
+
     @abstractmethod
     def get_schema(self) -> TableSchema:
         """Get schema information for the configured table.
@@ -61,6 +515,54 @@ class DatabaseConnection(ABC):
         """
         pass
 
+    def get_column_stats(self, top_k: int = 5) -> Dict[str, ColumnStats]:
+        """Compute per-column value statistics in a single batched pass.
+
+        Args:
+            top_k: Number of most common values to collect per column.
+
+        Backends that do not support profiling keep this default, so their
+        profiled schema is the plain schema.
+
+        Returns:
+            Dict mapping column names to their statistics; empty if the
+            backend does not support profiling.
+        """
+        return {}
+
+    def get_profiled_schema(self, top_k: int = 5, refresh: bool = False) -> TableSchema:
+        """Get the table schema with column statistics attached.
+
+        The result is cached on the connection, so profiling only runs once
+        unless ``refresh`` is set. Profiling is best effort: if it fails the
+        plain schema is returned.
+
+        Args:
+            top_k: Number of most common values to collect per column.
+            refresh: Recompute the profile even if one is cached.
+
+        Returns:
+            TableSchema whose ``column_stats`` is populated when available.
+        """
+        if self._profiled_schema is not None and not refresh:
+            return self._profiled_schema
+
+        key = f"schema:{self._cache_identity()}:{self._qualified_table_name()}:{top_k}"
+        cached = self.cache.get(key) if self.cache is not None and not refresh else None
+        if cached is not None:
+            self._profiled_schema = TableSchema.parse_raw(cached)
+            return self._profiled_schema
+
+        schema = self.get_schema()
+        try:
+            schema.column_stats = self.get_column_stats(top_k) or None
+        except Exception as e:
+            logger.warning("Column profiling failed: %s", e)
+        if self.cache is not None:
+            self.cache.set(key, schema.json().encode())
+        self._profiled_schema = schema
+        return self._profiled_schema
+
     def validate_query(self, query: str) -> bool:
         """Basic validation of SQL query.
         
@@ -80,4 +582,10 @@ class DatabaseConnection(ABC):
         if not any(query.startswith(start) for start in valid_starts):
             return False
             
-        return True
\ No newline at end of file
+        return True
+
+
+def _batches(df: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Split a DataFrame into batches of rows, yielding at least one."""
+    for start in range(0, max(len(df), 1), batch_size):
+        yield df.iloc[start:start + batch_size]
\ No newline at end of file
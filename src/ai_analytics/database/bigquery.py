@@ -1,24 +1,73 @@
 """BigQuery database connection implementation."""
 
+import hashlib
 import json
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
-from google.cloud import bigquery
-from google.oauth2 import service_account
 
-from ai_analytics.database.base import DatabaseConnection, TableSchema
+from ai_analytics.cache import CacheBackend
+from ai_analytics.database.base import ColumnStats, DatabaseConnection, TableSchema
+from ai_analytics.database.cache import ResultCache
+from ai_analytics.database.sql import replace_parameters
+
+# Seconds a table's modified time is reused before it is fetched again
+_MARKER_TTL = 5.0
+
+# Most table metadata requests made at once for one change marker
+_MARKER_WORKERS = 8
+
+# Column types that support MIN/MAX and grouping in APPROX_TOP_COUNT
+_PROFILABLE_TYPES = {
+    "STRING", "INTEGER", "INT64", "FLOAT", "FLOAT64", "NUMERIC", "BIGNUMERIC",
+    "BOOLEAN", "BOOL", "DATE", "DATETIME", "TIMESTAMP", "TIME",
+}
+
+
+def _to_python(value: Any) -> Any:
+    """Convert numpy scalars returned by pandas into plain Python values."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _parameter_type(value: Any) -> str:
+    """Get the BigQuery type of a query parameter value."""
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "FLOAT64"
+    return "STRING"
+
+
+def _pages(rows: Any) -> Iterator[pd.DataFrame]:
+    """Download the pages of a query result, yielding at least one."""
+    empty = True
+    for df in rows.to_dataframe_iterable():
+        empty = False
+        yield df
+    if empty:
+        yield pd.DataFrame(columns=[field.name for field in rows.schema])
 
 
 class BigQueryConnection(DatabaseConnection):
     """Connection to Google BigQuery."""
 
+    sql_dialect = "bigquery"
+
     def __init__(
         self,
         project_id: str,
         dataset_id: str,
         table_id: str,
         credentials_json: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        cache: Optional[CacheBackend] = None,
     ):
         """Initialize BigQuery connection.
         
@@ -27,27 +76,40 @@ class BigQueryConnection(DatabaseConnection):
             dataset_id: BigQuery dataset ID.
             table_id: BigQuery table ID.
             credentials_json: Optional service account credentials JSON string.
+            result_cache: Optional cache for query results.
+            cache: Optional cache backend for table metadata.
         """
+        super().__init__(result_cache, cache)
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.table_id = table_id
         self.credentials_json = credentials_json
+        self.credentials: Any = None
         self.client = None
         self.table = None
+        # Change markers by table ID, with the time they expire
+        self._markers: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._markers_lock = threading.Lock()
 
     def connect(self) -> None:
         """Establish connection to BigQuery."""
+        # The SDK is slow to import, so it loads with the first connection
+        import google.auth
+        from google.cloud import bigquery
+        from google.oauth2 import service_account
+
         if self.credentials_json:
             credentials_info = json.loads(self.credentials_json)
-            credentials = service_account.Credentials.from_service_account_info(
+            self.credentials = service_account.Credentials.from_service_account_info(
                 credentials_info
             )
-            self.client = bigquery.Client(
-                credentials=credentials,
-                project=self.project_id
-            )
         else:
-            self.client = bigquery.Client(project=self.project_id)
+            # Application default credentials, as the client would load them
+            self.credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+        self.client = bigquery.Client(
+            credentials=self.credentials,
+            project=self.project_id
+        )
         
         dataset_ref = self.client.dataset(self.dataset_id)
         table_ref = dataset_ref.table(self.table_id)
@@ -58,7 +120,7 @@ class BigQueryConnection(DatabaseConnection):
         if self.client:
             self.client.close()
 
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def _execute_query(self, query: str) -> pd.DataFrame:
         """Execute BigQuery query.
         
         Args:
@@ -73,6 +135,241 @@ class BigQueryConnection(DatabaseConnection):
         query_job = self.client.query(query)
         return query_job.to_dataframe()
 
+    def _execute_parameterized(
+        self, query: str, params: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Execute BigQuery query with named query parameters.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+
+        Returns:
+            DataFrame with query results.
+        """
+        if not self.client:
+            self.connect()
+
+        return self._query_parameterized(query, params).to_dataframe()
+
+    def _iter_query(self, query: str, batch_size: int) -> Iterator[pd.DataFrame]:
+        """Execute BigQuery query, downloading results page by page.
+
+        Args:
+            query: SQL query string.
+            batch_size: Maximum rows per page.
+
+        Yields:
+            DataFrames of consecutive rows.
+        """
+        if not self.client:
+            self.connect()
+
+        yield from _pages(self.client.query(query).result(page_size=batch_size))
+
+    def _iter_parameterized(
+        self, query: str, params: Dict[str, Any], batch_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Execute BigQuery query with named query parameters, page by page.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+            batch_size: Maximum rows per page.
+
+        Yields:
+            DataFrames of consecutive rows.
+        """
+        if not self.client:
+            self.connect()
+
+        job = self._query_parameterized(query, params)
+        yield from _pages(job.result(page_size=batch_size))
+
+    def _query_parameterized(self, query: str, params: Dict[str, Any]) -> Any:
+        """Start a query job binding ``:name`` placeholders as query parameters."""
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter(name, _parameter_type(value), value)
+                for name, value in params.items()
+            ]
+        )
+        statement = replace_parameters(query, lambda name: f"@{name}")
+        return self.client.query(statement, job_config=job_config)
+
+    def check_query(self, query: str) -> Optional[str]:
+        """Check a query with a dry run, which validates it without running it.
+
+        Client errors are reported too: a dry run that reads a missing table
+        or column fails with NotFound, and one without access with Forbidden.
+
+        Args:
+            query: SQL query string.
+
+        Returns:
+            BigQuery's error message, or None if the query is valid.
+        """
+        error = super().check_query(query)
+        if error is not None:
+            return error
+        if not self.client:
+            self.connect()
+        from google.api_core.exceptions import ClientError
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        try:
+            self.client.query(query, job_config=job_config)
+        except ClientError as e:
+            return str(e.message)
+        return None
+
+    def estimate_cost(self, query: str) -> Optional[Dict[str, Any]]:
+        """Estimate the bytes a query would scan with a dry run.
+
+        Args:
+            query: SQL query string.
+
+        Returns:
+            Dict with the bytes processed, which on-demand pricing bills.
+        """
+        if not self.client:
+            self.connect()
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        query_job = self.client.query(query, job_config=job_config)
+        return {"bytes_processed": query_job.total_bytes_processed}
+
+    def _cache_identity(self) -> str:
+        """Identify the project and principal queries run as, for cache keys.
+
+        Authorized views and row-level security make results depend on the
+        principal, so results read with one service account are never
+        served to another.
+
+        Returns:
+            Project URL string with a fingerprint of the credentials.
+        """
+        if self.credentials_json:
+            info = json.loads(self.credentials_json)
+            principal = f"{info.get('client_email')}:{info.get('private_key_id')}"
+        else:
+            if not self.client:
+                self.connect()
+            # Application default credentials: a service account or a user
+            principal = str(
+                getattr(self.credentials, "service_account_email", None)
+                or getattr(self.credentials, "account", None)
+                or "default"
+            )
+        fingerprint = hashlib.sha256(principal.encode()).hexdigest()[:16]
+        return f"bigquery://{self.project_id}/{self.dataset_id}?principal={fingerprint}"
+
+    def estimate_row_count(self) -> Optional[int]:
+        """Get the table's row count from its metadata.
+
+        Returns:
+            Row count, or None if unknown.
+        """
+        if not self.table:
+            self.connect()
+        return self.table.num_rows
+
+    def table_sample_clause(self, percent: float) -> Optional[str]:
+        """Get the block sampling clause.
+
+        Args:
+            percent: Percentage of the table to sample.
+
+        Returns:
+            TABLESAMPLE clause.
+        """
+        return f"TABLESAMPLE SYSTEM ({percent:g} PERCENT)"
+
+    def _qualified_table_name(self) -> str:
+        """Get the configured table name.
+
+        Returns:
+            Table name as project.dataset.table.
+        """
+        return f"{self.project_id}.{self.dataset_id}.{self.table_id}"
+
+    def _table_marker(self, tables: List[str]) -> Optional[str]:
+        """Get a change marker from the tables' ``modified`` timestamps.
+
+        Each table's timestamp is reused for ``_MARKER_TTL`` seconds, so
+        repeated cache lookups skip the metadata requests; the others are
+        fetched concurrently. A result cached within that time of a write
+        may still be served.
+
+        Args:
+            tables: Table references read by a query.
+
+        Returns:
+            Marker string, or None if no referenced table was found.
+        """
+        if not self.client:
+            self.connect()
+
+        table_ids = set()
+        for name in tables:
+            parts = name.split(".")
+            if len(parts) == 1:
+                parts = [self.dataset_id] + parts
+            if len(parts) == 2:
+                parts = [self.project_id] + parts
+            table_ids.add(".".join(parts))
+
+        now = time.monotonic()
+        with self._markers_lock:
+            markers = {
+                table_id: self._markers[table_id][1]
+                for table_id in table_ids
+                if table_id in self._markers and self._markers[table_id][0] > now
+            }
+        missing = sorted(table_ids - markers.keys())
+        if len(missing) > 1:
+            workers = min(len(missing), _MARKER_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = list(executor.map(self._fetch_marker, missing))
+        else:
+            fetched = [self._fetch_marker(table_id) for table_id in missing]
+
+        if missing:
+            expires = time.monotonic() + _MARKER_TTL
+            with self._markers_lock:
+                self._markers = {
+                    table_id: entry
+                    for table_id, entry in self._markers.items()
+                    if entry[0] > now
+                }
+                for table_id, marker in zip(missing, fetched):
+                    self._markers[table_id] = (expires, marker)
+                    markers[table_id] = marker
+        found = [marker for marker in markers.values() if marker is not None]
+        return ",".join(sorted(found)) or None
+
+    def _fetch_marker(self, table_id: str) -> Optional[str]:
+        """Get one table's change marker from its metadata.
+
+        Args:
+            table_id: Table ID as project.dataset.table.
+
+        Returns:
+            Marker string, or None if there is no such table.
+        """
+        from google.api_core.exceptions import NotFound
+
+        try:
+            table = self.client.get_table(table_id)
+        except NotFound:
+            # Not a table, e.g. a CTE name
+            return None
+        return f"{table.full_table_id}:{table.modified.isoformat()}"
+
     def get_schema(self) -> TableSchema:
         """Get BigQuery table schema.
         
@@ -93,6 +390,77 @@ class BigQueryConnection(DatabaseConnection):
             description=self.table.description
         )
 
+    def get_column_stats(
+        self, top_k: int = 5, sample_rows: int = 1_000_000
+    ) -> Dict[str, ColumnStats]:
+        """Get per-column statistics with one approximate aggregate query.
+
+        Large tables are read through ``TABLESAMPLE`` so that profiling scans
+        roughly ``sample_rows`` rows. Nested, repeated and other non-orderable
+        columns are skipped.
+
+        Args:
+            top_k: Number of most common values to keep per column.
+            sample_rows: Approximate number of rows to scan.
+
+        Returns:
+            Dict mapping column names to their statistics.
+        """
+        if not self.table:
+            self.connect()
+
+        fields = [
+            field for field in self.table.schema
+            if field.field_type in _PROFILABLE_TYPES and field.mode != "REPEATED"
+        ]
+        if not fields:
+            return {}
+
+        total_rows = self.table.num_rows or 0
+        sampled = total_rows > sample_rows
+        sample_clause = ""
+        if sampled:
+            percent = max(100.0 * sample_rows / total_rows, 0.01)
+            sample_clause = f"TABLESAMPLE SYSTEM ({percent:.4f} PERCENT)"
+
+        aggregates = ["COUNT(*) AS row_count"]
+        for i, field in enumerate(fields):
+            column = f"`{field.name}`"
+            aggregates.extend([
+                f"COUNTIF({column} IS NULL) AS c{i}_nulls",
+                f"APPROX_COUNT_DISTINCT({column}) AS c{i}_distinct",
+                f"MIN({column}) AS c{i}_min",
+                f"MAX({column}) AS c{i}_max",
+                f"APPROX_TOP_COUNT({column}, {top_k}) AS c{i}_top",
+            ])
+
+        query = f"""
+        SELECT {", ".join(aggregates)}
+        FROM `{self.project_id}.{self.dataset_id}.{self.table_id}` {sample_clause}
+        """
+        row = self.execute_query(query).iloc[0]
+        row_count = int(row["row_count"]) or 1
+
+        stats = {}
+        for i, field in enumerate(fields):
+            distinct_count = float(row[f"c{i}_distinct"])
+            top = [
+                _to_python(item["value"])
+                for item in row[f"c{i}_top"]
+                if item["value"] is not None
+            ]
+            stats[field.name] = ColumnStats(
+                name=field.name,
+                null_fraction=float(row[f"c{i}_nulls"]) / row_count,
+                distinct_count=distinct_count,
+                min_value=_to_python(row[f"c{i}_min"]),
+                max_value=_to_python(row[f"c{i}_max"]),
+                top_values=top,
+                # A sample can miss rare values, so only a full scan is exhaustive
+                top_values_complete=not sampled and distinct_count <= len(top),
+            )
+        return stats
+
     def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
         """Get sample data from BigQuery table.
         
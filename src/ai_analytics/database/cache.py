@@ -0,0 +1,137 @@
+"""Query result caching for database connections."""
+
+import hashlib
+import io
+import struct
+import threading
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from ai_analytics.cache import BoundedCacheBackend, CacheBackend, MemoryCacheBackend
+from ai_analytics.database.sql import normalize_sql
+from ai_analytics.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResultCache:
+    """Cache of query results on top of a cache backend.
+
+    Results are stored as Parquet bytes, which keeps them compact and
+    decouples cached data from the DataFrames handed to callers. Entries
+    expire after ``ttl`` seconds, or as soon as the change marker of the
+    tables they read differs from the one recorded when they were cached.
+    Entries without a change marker, whose staleness cannot be detected,
+    expire after the shorter ``unversioned_ttl``.
+    By default results live in a byte-bounded in-process LRU; pass a shared
+    backend to reuse them across worker processes, in which case the bytes
+    of the results this process stores there are bounded the same way.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float = 3600.0,
+        backend: Optional[CacheBackend] = None,
+        unversioned_ttl: float = 60.0,
+    ):
+        """Initialize the result cache.
+
+        Args:
+            max_bytes: Maximum total size of cached payloads.
+            ttl: Seconds after which an entry expires.
+            backend: Cache backend to store results in.
+            unversioned_ttl: Seconds after which an entry stored without a
+                change marker expires.
+        """
+        self.ttl = ttl
+        self.unversioned_ttl = min(unversioned_ttl, ttl)
+        if backend is None:
+            self.backend: CacheBackend = MemoryCacheBackend(
+                max_bytes=max_bytes, default_ttl=ttl
+            )
+        else:
+            self.backend = BoundedCacheBackend(backend, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        # Lookups run in worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(identity: str, query: str) -> str:
+        """Build a cache key from connection identity and normalized SQL.
+
+        Args:
+            identity: String identifying the database the query runs on.
+            query: SQL query string.
+
+        Returns:
+            Namespaced hex digest cache key.
+        """
+        normalized = normalize_sql(query)
+        digest = hashlib.sha256(f"{identity}\n{normalized}".encode()).hexdigest()
+        return f"results:{digest}"
+
+    def get(self, key: str, marker: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Get a cached result.
+
+        Args:
+            key: Cache key from ``make_key``.
+            marker: Current change marker of the tables the query reads.
+
+        Returns:
+            Cached DataFrame, or None on a miss.
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            stored_marker, payload = _unpack(value)
+            if stored_marker != marker:
+                self.backend.delete(key)
+                value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            return None
+        return pd.read_parquet(io.BytesIO(payload))
+
+    def put(self, key: str, df: pd.DataFrame, marker: Optional[str] = None) -> bool:
+        """Store a result in the cache.
+
+        Args:
+            key: Cache key from ``make_key``.
+            df: Result DataFrame.
+            marker: Change marker of the tables the query reads.
+
+        Returns:
+            True if the result was serialized and handed to the backend.
+        """
+        buffer = io.BytesIO()
+        try:
+            df.to_parquet(buffer, index=False)
+        except Exception as e:
+            logger.debug("Result not cacheable: %s", e)
+            return False
+        ttl = self.ttl if marker is not None else self.unversioned_ttl
+        self.backend.set(key, _pack(marker, buffer.getvalue()), ttl=ttl)
+        return True
+
+    def clear(self) -> None:
+        """Remove the cached results."""
+        self.backend.clear()
+
+
+def _pack(marker: Optional[str], payload: bytes) -> bytes:
+    """Prefix a payload with its length-delimited change marker."""
+    encoded = (marker if marker is not None else "\0").encode()
+    return struct.pack(">I", len(encoded)) + encoded + payload
+
+
+def _unpack(value: bytes) -> Tuple[Optional[str], bytes]:
+    """Split a stored value into change marker and payload."""
+    (length,) = struct.unpack(">I", value[:4])
+    marker = value[4:4 + length].decode()
+    return (None if marker == "\0" else marker), value[4 + length:]
\ No newline at end of file
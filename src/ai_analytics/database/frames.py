@@ -0,0 +1,118 @@
+"""Compact in-memory representation of query results."""
+
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import pandas as pd
+
+# String columns with at most this share of distinct values become categoricals
+_CATEGORY_MAX_RATIO = 0.5
+
+# Results smaller than this keep plain string columns
+_CATEGORY_MIN_ROWS = 100
+
+
+@lru_cache(maxsize=None)
+def _string_dtype() -> pd.StringDtype:
+    """Get the Arrow-backed string dtype, built on first use.
+
+    Falls back to the Python-backed one when pyarrow is missing or older
+    than pandas supports.
+    """
+    try:
+        return pd.StringDtype("pyarrow")
+    except ImportError:
+        return pd.StringDtype("python")
+
+
+def compact_dtypes(df: pd.DataFrame, categories: bool = True) -> pd.DataFrame:
+    """Store a result in the smallest dtypes that keep its values.
+
+    Integer columns are downcast to the narrowest integer type, string
+    columns become Arrow-backed strings where pyarrow is available, and
+    with ``categories`` those with few distinct values become categoricals.
+    Floats are kept, as narrowing them would lose precision.
+
+    Args:
+        df: Query result.
+        categories: Whether to convert low-cardinality strings to
+            categoricals; off for batches that are concatenated later,
+            since differing categories would turn them back into objects.
+
+    Returns:
+        DataFrame with compacted columns; ``df`` if nothing changed.
+    """
+    compacted = {}
+    for position, (_, column) in enumerate(df.items()):
+        dtype = column.dtype
+        is_object = pd.api.types.is_object_dtype(dtype)
+        if dtype.kind in "iu":
+            compacted[position] = pd.to_numeric(
+                column, downcast="integer" if dtype.kind == "i" else "unsigned"
+            )
+        elif is_object or isinstance(dtype, pd.StringDtype):
+            if is_object and (
+                pd.api.types.infer_dtype(column, skipna=True) != "string"
+            ):
+                continue
+            if (
+                categories
+                and len(column) >= _CATEGORY_MIN_ROWS
+                and column.nunique() <= len(column) * _CATEGORY_MAX_RATIO
+            ):
+                compacted[position] = column.astype("category")
+            elif is_object:
+                compacted[position] = column.astype(_string_dtype())
+
+    if not compacted:
+        return df
+    columns = [compacted.get(i, df.iloc[:, i]) for i in range(df.shape[1])]
+    result = pd.concat(columns, axis=1)
+    result.columns = df.columns
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def limit_bytes(df: pd.DataFrame, max_bytes: int) -> pd.DataFrame:
+    """Compact a result and drop trailing rows beyond a memory budget.
+
+    Args:
+        df: Query result.
+        max_bytes: Memory budget in bytes.
+
+    Returns:
+        Compacted DataFrame with ``attrs["truncated"]`` telling whether rows
+        were dropped.
+    """
+    df = compact_dtypes(df)
+    size = int(df.memory_usage(deep=True).sum())
+    truncated = size > max_bytes
+    if truncated:
+        df = df.head(int(len(df) * max_bytes / size))
+    df.attrs["truncated"] = truncated
+    return df
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a result to row dicts, with None for missing values.
+
+    Categorical and Arrow-backed string columns would otherwise return
+    NaN or ``pd.NA``, which cannot be serialized to JSON.
+
+    Args:
+        df: Query result.
+
+    Returns:
+        One dict per row.
+    """
+    nullable = [
+        i for i, dtype in enumerate(df.dtypes)
+        if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+    ]
+    if nullable:
+        df = df.copy(deep=False)
+        for i in nullable:
+            column = df.iloc[:, i]
+            df.isetitem(i, column.astype(object).where(column.notna(), None))
+    records: List[Dict[str, Any]] = df.to_dict(orient="records")
+    return records
\ No newline at end of file
@@ -1,19 +1,34 @@
 """PostgreSQL database connection implementation."""
 
-from typing import Any, Dict, Optional
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import quote_plus
 
 import pandas as pd
 from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.exc import DataError, ProgrammingError, SQLAlchemyError
 
-from ai_analytics.database.base import DatabaseConnection, TableSchema
+from ai_analytics.cache import CacheBackend
+from ai_analytics.database.base import ColumnStats, DatabaseConnection, TableSchema
+from ai_analytics.database.cache import ResultCache
+from ai_analytics.database.sql import replace_parameters
+
+# Connection info entry holding the statements prepared on a connection
+_PREPARED_KEY = "ai_analytics_prepared"
+
+# Prepared statements kept per connection before they are all released
+_MAX_PREPARED = 100
 
 
 class PostgresConnection(DatabaseConnection):
     """Connection to PostgreSQL database."""
 
+    sql_dialect = "postgres"
+
     def __init__(
         self,
         host: str,
@@ -24,6 +39,8 @@ class PostgresConnection(DatabaseConnection):
         schema: str = "public",
         table: str = None,
         ssl_mode: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        cache: Optional[CacheBackend] = None,
     ):
         """Initialize PostgreSQL connection.
         
@@ -36,7 +53,10 @@ class PostgresConnection(DatabaseConnection):
             schema: Database schema (default: public)
             table: Table name to query
             ssl_mode: SSL mode for connection (optional)
+            result_cache: Cache for query results (optional)
+            cache: Cache backend for table metadata (optional)
         """
+        super().__init__(result_cache, cache)
         self.host = host
         self.database = database
         self.user = user
@@ -82,7 +102,7 @@ class PostgresConnection(DatabaseConnection):
             self.engine.dispose()
             self.engine = None
 
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def _execute_query(self, query: str) -> pd.DataFrame:
         """Execute PostgreSQL query.
         
         Args:
@@ -99,6 +119,269 @@ class PostgresConnection(DatabaseConnection):
         except SQLAlchemyError as e:
             raise RuntimeError(f"Query execution failed: {str(e)}")
 
+    def _execute_parameterized(
+        self, query: str, params: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Execute PostgreSQL query as a prepared statement.
+
+        Each pooled connection prepares a query text once, so repeated
+        executions with other values skip parsing and planning.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+
+        Returns:
+            DataFrame with query results
+        """
+        if not self.engine:
+            self.connect()
+
+        try:
+            with self.engine.connect() as conn:
+                result = self._execute_prepared(conn, query, params)
+                df = pd.DataFrame.from_records(
+                    result.fetchall(), columns=list(result.keys()), coerce_float=True
+                )
+                conn.commit()
+                return df
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Query execution failed: {str(e)}")
+
+    def _iter_parameterized(
+        self, query: str, params: Dict[str, Any], batch_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Execute PostgreSQL query as a prepared statement, in batches.
+
+        A server-side cursor cannot run EXECUTE, so the driver receives the
+        whole result; rows become DataFrames ``batch_size`` at a time and
+        stop when iteration is closed, which bounds the memory budget of
+        the frames.
+
+        Args:
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+            batch_size: Maximum rows per batch
+
+        Yields:
+            DataFrames of consecutive rows, at least one
+        """
+        if not self.engine:
+            self.connect()
+
+        try:
+            with self.engine.connect() as conn:
+                result = self._execute_prepared(conn, query, params)
+                columns = list(result.keys())
+                empty = True
+                while True:
+                    rows = result.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    empty = False
+                    yield pd.DataFrame.from_records(
+                        rows, columns=columns, coerce_float=True
+                    )
+                if empty:
+                    yield pd.DataFrame(columns=columns)
+                conn.commit()
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Query execution failed: {str(e)}")
+
+    def _execute_prepared(self, conn: Any, query: str, params: Dict[str, Any]) -> Any:
+        """Prepare a query on a connection once and execute it.
+
+        Args:
+            conn: SQLAlchemy connection.
+            query: SQL query string with ``:name`` placeholders.
+            params: Values by placeholder name.
+
+        Returns:
+            SQLAlchemy result of the EXECUTE statement
+        """
+        names: List[str] = []
+
+        def placeholder(name: str) -> str:
+            if name not in names:
+                names.append(name)
+            return f"${names.index(name) + 1}"
+
+        statement = replace_parameters(query, placeholder)
+        statement_name = "ai_" + hashlib.sha1(statement.encode()).hexdigest()[:16]
+        execute = f"EXECUTE {statement_name}"
+        if names:
+            execute += f" ({', '.join(['%s'] * len(names))})"
+        prepared = conn.connection.info.setdefault(_PREPARED_KEY, set())
+        if statement_name not in prepared:
+            if len(prepared) >= _MAX_PREPARED:
+                conn.exec_driver_sql("DEALLOCATE ALL")
+                prepared.clear()
+            conn.exec_driver_sql(f"PREPARE {statement_name} AS {statement}")
+            conn.commit()
+            prepared.add(statement_name)
+        return conn.exec_driver_sql(execute, tuple(params[name] for name in names))
+
+    def _iter_query(self, query: str, batch_size: int) -> Iterator[pd.DataFrame]:
+        """Execute PostgreSQL query through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time, holding a pooled
+        connection until iteration finishes or is closed.
+
+        Args:
+            query: SQL query string
+            batch_size: Maximum rows per batch
+
+        Yields:
+            DataFrames of consecutive rows
+        """
+        if not self.engine:
+            self.connect()
+
+        try:
+            with self.engine.connect().execution_options(stream_results=True) as conn:
+                yield from pd.read_sql_query(query, conn, chunksize=batch_size)
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Query execution failed: {str(e)}")
+
+    def check_query(self, query: str) -> Optional[str]:
+        """Check a query with EXPLAIN, which plans it without executing it.
+
+        Args:
+            query: SQL query string
+
+        Returns:
+            PostgreSQL's error message, or None if the query can be planned
+        """
+        error = super().check_query(query)
+        if error is not None:
+            return error
+        if not self.engine:
+            self.connect()
+
+        try:
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql(f"EXPLAIN {query}")
+        except (DataError, ProgrammingError) as e:
+            return str(e.orig).strip()
+        return None
+
+    def estimate_cost(self, query: str) -> Optional[Dict[str, Any]]:
+        """Estimate the cost of a query from its plan.
+
+        Args:
+            query: SQL query string
+
+        Returns:
+            Dict with the planner's estimated rows and total cost in its
+            arbitrary units
+        """
+        if not self.engine:
+            self.connect()
+
+        with self.engine.connect() as conn:
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {query}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        root = plan[0]["Plan"]
+        return {
+            "estimated_rows": int(root["Plan Rows"]),
+            "estimated_cost": float(root["Total Cost"]),
+        }
+
+    def _cache_identity(self) -> str:
+        """Identify the database for result cache keys.
+
+        Returns:
+            Connection URL without the password
+        """
+        return f"postgresql://{self.user}@{self.host}:{self.port}/{self.database}"
+
+    def estimate_row_count(self) -> Optional[int]:
+        """Estimate the table's row count from planner statistics.
+
+        Returns:
+            Estimated row count, or None if the table was never analyzed
+        """
+        if not self.table:
+            return None
+
+        if not self.engine:
+            self.connect()
+
+        with self.engine.connect() as conn:
+            reltuples = conn.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": self._qualified_table_name()},
+            ).scalar()
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    def table_sample_clause(self, percent: float) -> Optional[str]:
+        """Get the block sampling clause.
+
+        Args:
+            percent: Percentage of the table to sample
+
+        Returns:
+            TABLESAMPLE clause
+        """
+        return f"TABLESAMPLE SYSTEM ({percent:g})"
+
+    def pool_status(self) -> Optional[Dict[str, int]]:
+        """Get the state of the SQLAlchemy connection pool.
+
+        Returns:
+            Dict with pool size, checked out and overflow connections, or
+            None before connecting or for pools without these counters.
+        """
+        pool = self.engine.pool if self.engine else None
+        if pool is None or not hasattr(pool, "checkedout"):
+            return None
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def _qualified_table_name(self) -> str:
+        """Get the configured table name.
+
+        Returns:
+            Table name as schema.table
+        """
+        return f"{self.schema}.{self.table}"
+
+    def _table_marker(self, tables: List[str]) -> Optional[str]:
+        """Get a change marker from ``pg_stat_user_tables`` write counters.
+
+        Unqualified names resolve through the connection schema; names that
+        are not tables (such as CTEs) are ignored.
+
+        Args:
+            tables: Table references read by a query
+
+        Returns:
+            Marker string, or None if no referenced table was found
+        """
+        if not tables:
+            return None
+
+        if not self.engine:
+            self.connect()
+
+        names = [name if "." in name else f"{self.schema}.{name}" for name in tables]
+        query = text("""
+            SELECT string_agg(
+                relid::text || ':' || (n_tup_ins + n_tup_upd + n_tup_del)::text,
+                ',' ORDER BY relid
+            )
+            FROM pg_stat_user_tables
+            WHERE relid = ANY(ARRAY(
+                SELECT to_regclass(name) FROM unnest(CAST(:names AS text[])) AS name
+            ))
+        """)
+        with self.engine.connect() as conn:
+            return conn.execute(query, {"names": names}).scalar()
+
     def get_schema(self) -> TableSchema:
         """Get PostgreSQL table schema.
         
@@ -140,6 +423,80 @@ class PostgresConnection(DatabaseConnection):
             description=description
         )
 
+    def get_column_stats(self, top_k: int = 5) -> Dict[str, ColumnStats]:
+        """Get per-column statistics from the planner's ``pg_stats`` view.
+
+        All columns are read in a single catalog query, so no table scan is
+        needed. Statistics are only as fresh as the last ``ANALYZE``; columns
+        that have never been analyzed are omitted. The range covers both the
+        histogram bounds and the most common values, which the histogram
+        excludes.
+
+        Args:
+            top_k: Number of most common values to keep per column.
+
+        Returns:
+            Dict mapping column names to their statistics.
+
+        Raises:
+            ValueError: If no table name is specified
+        """
+        if not self.table:
+            raise ValueError("Table name must be specified")
+
+        if not self.engine:
+            self.connect()
+
+        query = text("""
+            SELECT
+                s.attname,
+                s.null_frac,
+                s.n_distinct,
+                s.most_common_vals::text::text[] AS most_common_vals,
+                s.most_common_freqs,
+                s.histogram_bounds::text::text[] AS histogram_bounds,
+                c.reltuples
+            FROM pg_stats s
+            LEFT JOIN pg_class c ON c.oid = to_regclass(
+                quote_ident(:schema) || '.' || quote_ident(:table)
+            )
+            WHERE s.schemaname = :schema AND s.tablename = :table
+        """)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, {
+                "schema": self.schema,
+                "table": self.table,
+            }).mappings().all()
+
+        stats = {}
+        for row in rows:
+            common_values = list(row["most_common_vals"] or [])
+            frequencies = list(row["most_common_freqs"] or [])
+            histogram = list(row["histogram_bounds"] or [])
+            null_fraction = float(row["null_frac"] or 0.0)
+
+            # Positive n_distinct is an absolute count, negative is a
+            # fraction of the row count
+            distinct_count = float(row["n_distinct"])
+            if distinct_count < 0 and row["reltuples"] and row["reltuples"] > 0:
+                distinct_count = -distinct_count * float(row["reltuples"])
+
+            complete = (
+                0 < distinct_count <= len(common_values)
+                and sum(frequencies) + null_fraction >= 0.999
+            )
+            min_value, max_value = _value_range(histogram + common_values)
+            stats[row["attname"]] = ColumnStats(
+                name=row["attname"],
+                null_fraction=null_fraction,
+                distinct_count=distinct_count if distinct_count > 0 else None,
+                min_value=min_value,
+                max_value=max_value,
+                top_values=common_values[:top_k],
+                top_values_complete=complete and len(common_values) <= top_k,
+            )
+        return stats
+
     def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
         """Get sample data from PostgreSQL table.
         
@@ -183,19 +540,118 @@ class PostgresConnection(DatabaseConnection):
             
         Returns:
             Dict containing table information and sample data
+
+        Raises:
+            ValueError: If the table does not exist
+            RuntimeError: If the sample data cannot be read
         """
-        original_table = self.table
-        original_schema = self.schema
-        
+        preview = self.get_table_previews([table_name], schema)[table_name]
+        if "schema" not in preview:
+            raise ValueError(preview["error"])
+        if "error" in preview:
+            raise RuntimeError(preview["error"])
+        return preview
+
+    def get_table_previews(
+        self,
+        table_names: Optional[Sequence[str]] = None,
+        schema: Optional[str] = None,
+        limit: int = 3,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get previews of many tables' structure and sample data.
+
+        Columns and comments of all tables are reflected in one batch, and
+        the samples are read concurrently over the connection pool. The
+        connection's own table and schema are not touched, so previews can
+        run alongside other requests on a shared connection.
+
+        Args:
+            table_names: Tables to preview; every table, view and
+                materialized view in the schema when omitted
+            schema: Schema name (defaults to connection schema)
+            limit: Sample rows per table
+
+        Returns:
+            Dict mapping each table name to its schema and sample data; a
+            table that does not exist or cannot be read has an error
+            instead of the schema or the sample data
+        """
+        if not self.engine:
+            self.connect()
+        schema = schema or self.schema
+
+        # Batched reflection reads every table's columns in one catalog
+        # query and renders types the same way get_schema does
+        inspector = inspect(self.engine)
         try:
-            self.table = table_name
-            if schema:
-                self.schema = schema
-                
-            return {
-                "schema": self.get_schema().dict(),
-                "sample_data": self.get_sample_data(3).to_dict(orient="records")
-            }
-        finally:
-            self.table = original_table
-            self.schema = original_schema
\ No newline at end of file
+            columns = inspector.get_multi_columns(
+                schema=schema, filter_names=table_names, kind=ObjectKind.ANY
+            )
+            comments = inspector.get_multi_table_comment(
+                schema=schema, filter_names=table_names, kind=ObjectKind.ANY
+            )
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Failed to read table catalog: {str(e)}")
+
+        schemas: Dict[str, TableSchema] = {}
+        for key, table_columns in sorted(columns.items()):
+            name = key[1]
+            schemas[name] = TableSchema(
+                name=f"{schema}.{name}",
+                columns=[
+                    {
+                        "name": column["name"],
+                        "type": str(column["type"]),
+                        "nullable": column["nullable"],
+                    }
+                    for column in table_columns
+                ],
+                description=comments.get(key, {}).get("text"),
+            )
+
+        previews: Dict[str, Dict[str, Any]] = {
+            name: {"error": f"Table not found: {schema}.{name}"}
+            for name in table_names or [] if name not in schemas
+        }
+
+        quote = self.engine.dialect.identifier_preparer.quote
+
+        def sample(name: str) -> Dict[str, Any]:
+            preview: Dict[str, Any] = {"schema": schemas[name].dict()}
+            try:
+                # Samples bypass the result cache and its freshness lookups
+                df = self._fetch(
+                    f"SELECT * FROM {quote(schema)}.{quote(name)} LIMIT {limit}"
+                )
+                preview["sample_data"] = df.to_dict(orient="records")
+            except Exception as e:
+                preview["sample_data"] = []
+                preview["error"] = f"Failed to read sample data: {str(e)}"
+            return preview
+
+        if schemas:
+            # More threads than pooled connections would only wait for one
+            status = self.pool_status()
+            workers = min(status["size"] if status else 5, len(schemas))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for name, preview in zip(schemas, executor.map(sample, schemas)):
+                    previews[name] = preview
+        return {name: previews[name] for name in table_names or schemas}
+
+
+def _value_range(values: Sequence[str]) -> Tuple[Optional[Any], Optional[Any]]:
+    """Get the smallest and largest of statistics values read as text.
+
+    Numbers are compared numerically; other values as text, which orders
+    ISO dates and timestamps correctly but may differ from the column's
+    collation.
+    """
+    if not values:
+        return None, None
+    try:
+        numbers = [float(value) for value in values]
+    except ValueError:
+        return min(values), max(values)
+    low = min(range(len(values)), key=numbers.__getitem__)
+    high = max(range(len(values)), key=numbers.__getitem__)
+    return values[low], values[high]
\ No newline at end of file
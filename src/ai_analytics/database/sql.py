@@ -0,0 +1,399 @@
+"""Lexical SQL helpers used by the database adapters."""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Quoted strings and identifiers, or runs of comments and whitespace
+_SQL_TOKENS = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`)|((?:\s|--[^\n]*|/\*.*?\*/)+)""",
+    re.DOTALL,
+)
+
+_TABLE_REFERENCE = re.compile(
+    r"""\b(?:from|join)\s+((?:[\w$-]+|`[^`]+`|"[^"]+")(?:\.(?:[\w$-]+|`[^`]+`|"[^"]+"))*)""",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """Normalize SQL text so that equivalent queries share a cache key.
+
+    Comments are removed and whitespace runs are collapsed, leaving quoted
+    strings and identifiers untouched. A trailing semicolon is dropped.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        Normalized SQL string.
+    """
+    def replace(match: "re.Match[str]") -> str:
+        if match.group(1):
+            return match.group(1)
+        return " "
+
+    return _SQL_TOKENS.sub(replace, query).strip().rstrip(";").strip()
+
+
+def _mask_literals(query: str) -> str:
+    """Blank out string literals and comments, keeping every offset.
+
+    Quoted identifiers are kept, as table names may be quoted.
+    """
+    def replace(match: "re.Match[str]") -> str:
+        token = match.group(1)
+        if token is not None and not token.startswith("'"):
+            return token
+        return " " * len(match.group(0))
+
+    return _SQL_TOKENS.sub(replace, query)
+
+
+def extract_tables(query: str) -> List[str]:
+    """Extract table references that follow FROM and JOIN keywords.
+
+    This is a lexical scan, so CTE names are returned as well; callers
+    resolving the names against the catalog should ignore unknown ones.
+    String literals and comments are skipped.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        Unique table references in order of appearance, unquoted.
+    """
+    tables = []
+    for match in _TABLE_REFERENCE.finditer(_mask_literals(query)):
+        name = re.sub(r'[`"]', "", match.group(1))
+        if name not in tables:
+            tables.append(name)
+    return tables
+
+
+# Functions whose result differs between executions of the same query
+_VOLATILE_FUNCTION = re.compile(
+    r"\b(?:(?:now|random|rand|clock_timestamp|statement_timestamp|timeofday|"
+    r"transaction_timestamp|gen_random_uuid|uuid_generate_v[14]|generate_uuid)\s*\(|"
+    r"(?:current_(?:timestamp|date|time|datetime)|localtimestamp|localtime)\b)",
+    re.IGNORECASE,
+)
+
+
+def is_volatile(query: str) -> bool:
+    """Check whether a query calls functions such as ``now()`` or ``random()``.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        True if the query's result may change without any table changing.
+    """
+    unquoted = _SQL_TOKENS.sub(lambda match: "''" if match.group(1) else " ", query)
+    return _VOLATILE_FUNCTION.search(unquoted) is not None
+
+
+# Words that may follow a table reference but are not an alias
+_CLAUSE_KEYWORDS = (
+    "where|join|on|using|group|order|limit|left|right|inner|outer|full|cross|"
+    "natural|union|intersect|except|having|window|qualify|tablesample|for|"
+    "offset|fetch|lateral|select|from|with|as"
+)
+
+_SAMPLE_TARGET = re.compile(
+    r"(?P<ref>\b(?:from|join)\s+"
+    r"""(?P<table>(?:[\w$-]+|`[^`]+`|"[^"]+")(?:\.(?:[\w$-]+|`[^`]+`|"[^"]+"))*)"""
+    rf"(?:\s+(?:as\s+)?(?!(?:{_CLAUSE_KEYWORDS})\b)[a-z_]\w*)?)"
+    r"(?P<sampled>\s+tablesample\b)?",
+    re.IGNORECASE,
+)
+
+
+def table_references(query: str, table_names: Iterable[str]) -> List[Tuple[int, bool]]:
+    """Find the references of a table after FROM and JOIN keywords.
+
+    Args:
+        query: SQL query string.
+        table_names: Names, at any qualification level, that refer to the
+            table. Matching is case-insensitive.
+
+    Returns:
+        Parenthesis depth of each reference, 0 for the outermost query, and
+        whether it carries a TABLESAMPLE clause.
+    """
+    names = {name.lower() for name in table_names}
+    # Keywords and parentheses inside string literals and comments do not count
+    masked = _mask_literals(query)
+    references = []
+    for match in _SAMPLE_TARGET.finditer(masked):
+        table = re.sub(r'[`"]', "", match.group("table")).lower()
+        if table in names:
+            before = masked[:match.start()]
+            depth = before.count("(") - before.count(")")
+            references.append((depth, bool(match.group("sampled"))))
+    return references
+
+
+def add_table_sample(
+    query: str, table_names: Iterable[str], clause: str
+) -> Optional[str]:
+    """Add a TABLESAMPLE clause to the single reference of a table.
+
+    Scaling totals by the inverse sampling rate is only unbiased when the
+    table is read once, so queries that reference the table in subqueries,
+    self-joins or more than once are not rewritten. The clause is placed
+    after the table's alias, if any; a reference that already carries a
+    TABLESAMPLE clause is left unchanged.
+
+    Args:
+        query: SQL query string.
+        table_names: Names, at any qualification level, that refer to the
+            table to sample. Matching is case-insensitive.
+        clause: Dialect-specific TABLESAMPLE clause.
+
+    Returns:
+        Rewritten SQL query string, or None if the table is not referenced
+        exactly once in the outermost query.
+    """
+    names = {name.lower() for name in table_names}
+    if [depth for depth, _ in table_references(query, names)] != [0]:
+        return None
+
+    for match in _SAMPLE_TARGET.finditer(_mask_literals(query)):
+        table = re.sub(r'[`"]', "", match.group("table")).lower()
+        if table in names and not match.group("sampled"):
+            end = match.end("ref")
+            return f"{query[:end]} {clause}{query[end:]}"
+    return query
+
+
+_TRAILING_LIMIT = re.compile(r"\blimit\s+(\d+)(?:\s+offset\s+\d+)?$", re.IGNORECASE)
+
+
+def trailing_limit(query: str) -> Optional[int]:
+    """Get the row limit of the outermost query.
+
+    Only a LIMIT clause at the very end of the statement counts; the word
+    in string literals, comments or subqueries does not.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        The limit, or None if the query has no trailing LIMIT clause.
+    """
+    match = _TRAILING_LIMIT.search(normalize_sql(query))
+    return int(match.group(1)) if match else None
+
+
+def apply_limit(query: str, limit: int) -> str:
+    """Cap the number of rows a query returns.
+
+    Args:
+        query: SQL query string.
+        limit: Maximum number of rows.
+
+    Returns:
+        The query unchanged if it already returns at most ``limit`` rows,
+        with its trailing LIMIT lowered if larger, or with a LIMIT clause
+        appended.
+    """
+    existing = trailing_limit(query)
+    if existing is None:
+        # On a new line, so that a trailing line comment cannot swallow it
+        return f"{query.rstrip().rstrip(';').rstrip()}\nLIMIT {limit}"
+    if existing <= limit:
+        return query
+    normalized = normalize_sql(query)
+    match = _TRAILING_LIMIT.search(normalized)
+    return f"{normalized[:match.start(1)]}{limit}{normalized[match.end(1):]}"
+
+
+# Lexemes of a statement, for finding the literals of filter clauses
+_LEXEMES = re.compile(
+    r"""(?P<string>'(?:[^']|'')*')|(?P<quoted>"(?:[^"]|"")*"|`[^`]*`)"""
+    r"|(?P<comment>--[^\n]*|/\*.*?\*/)"
+    r"|(?P<number>(?<![\w.])\d+(?:\.\d+)?(?![\w.]))"
+    r"|(?P<word>[A-Za-z_][\w$]*)|(?P<open>\()|(?P<close>\))|(?P<symbol>[^\s\w'\"`()]+)",
+    re.DOTALL,
+)
+
+_FILTER_CLAUSES = {"where", "having", "qualify", "on"}
+_OTHER_CLAUSES = {
+    "select", "from", "join", "using", "group", "order", "limit", "offset", "fetch",
+    "window", "union", "intersect", "except", "tablesample", "returning",
+}
+# Keywords that make the following string a typed literal
+_TYPED_LITERALS = {"interval", "date", "time", "timestamp", "datetime"}
+
+_CAST_FOLLOWS = re.compile(r"\s*::")
+
+
+def filter_literals(query: str) -> List[Tuple[int, int, Any]]:
+    """Find the literal values of WHERE, HAVING, QUALIFY and ON clauses.
+
+    These are the literals that can be replaced by bind parameters. Typed
+    literals such as ``DATE '2024-01-01'`` or ``INTERVAL '7 days'``,
+    literals cast with ``::`` and literals of other clauses, such as LIMIT
+    counts or positional GROUP BY references, are skipped.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        Start offset, end offset and value of each literal in order;
+        strings are unquoted and numbers are int or float.
+    """
+    literals = []
+    clause: Optional[str] = None
+    outer: List[Optional[str]] = []
+    previous: Optional[str] = None
+    for match in _LEXEMES.finditer(query):
+        kind, text = match.lastgroup, match.group()
+        if kind == "comment":
+            continue
+        if kind == "word":
+            previous = text.lower()
+            if previous in _FILTER_CLAUSES:
+                clause = "filter"
+            elif previous in _OTHER_CLAUSES:
+                clause = None
+            continue
+        if kind == "open":
+            outer.append(clause)
+        elif kind == "close" and outer:
+            clause = outer.pop()
+        elif kind in ("string", "number") and clause == "filter":
+            typed = previous in _TYPED_LITERALS or _CAST_FOLLOWS.match(
+                query, match.end()
+            )
+            if not typed:
+                if kind == "string":
+                    value: Any = text[1:-1].replace("''", "'")
+                else:
+                    value = float(text) if "." in text else int(text)
+                literals.append((match.start(), match.end(), value))
+        previous = None
+    return literals
+
+
+_PARAMETER = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`)|(?<![:\w]):([A-Za-z_]\w*)"""
+)
+
+
+def replace_parameters(query: str, replace: Callable[[str], str]) -> str:
+    """Substitute ``:name`` placeholders outside quoted text.
+
+    Args:
+        query: SQL query string with placeholders.
+        replace: Returns the replacement for a placeholder name.
+
+    Returns:
+        SQL query string.
+    """
+    def substitute(match: "re.Match[str]") -> str:
+        if match.group(1):
+            return match.group(1)
+        return replace(match.group(2))
+
+    return _PARAMETER.sub(substitute, query)
+
+
+def sql_literal(value: Any) -> str:
+    """Render a Python value as a SQL literal.
+
+    Args:
+        value: None, bool, number or string.
+
+    Returns:
+        SQL literal text.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_parameters(query: str, params: Dict[str, Any]) -> str:
+    """Inline parameter values into a query as literals.
+
+    Args:
+        query: SQL query string with ``:name`` placeholders.
+        params: Values by placeholder name.
+
+    Returns:
+        SQL query string without placeholders.
+    """
+    return replace_parameters(query, lambda name: sql_literal(params[name]))
+
+
+# Lexemes that affect whether a statement is complete
+# String literals and quoted identifiers per dialect; the default knows
+# only standard quoting with doubled quotes as escapes
+_QUOTED = {
+    None: r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`""",
+    # E'' strings take backslash escapes; $$ and $tag$ quote bodies verbatim
+    "postgres": (
+        r"(?<!\w)[eE]'(?:[^'\\]|\\.|'')*'"
+        r"|\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$"
+        r'''|'(?:[^']|'')*'|"(?:[^"]|"")*"'''
+    ),
+    # Backslash escapes in every string, triple-quoted strings and # comments
+    "bigquery": (
+        r"'''.*?'''|" + '"""' + r'.*?' + '"""'
+        + r"""|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`|#[^\n]*"""
+    ),
+}
+
+# Openings of quotes and comments that do not close
+_UNTERMINATED = {
+    None: r"""['"`]|/\*""",
+    "postgres": r"""['"]|/\*|\$(?:[A-Za-z_]\w*)?\$""",
+    "bigquery": r"""['"`]|/\*""",
+}
+
+_STRUCTURE = {
+    dialect: re.compile(
+        rf"{quoted}|--[^\n]*|/\*.*?\*/"
+        r"|(?P<open>\()|(?P<close>\))|(?P<end>;)"
+        rf"|(?P<unterminated>{_UNTERMINATED[dialect]})",
+        re.DOTALL,
+    )
+    for dialect, quoted in _QUOTED.items()
+}
+
+
+def syntax_error(query: str, dialect: Optional[str] = None) -> Optional[str]:
+    """Find lexical errors that keep a query from parsing.
+
+    Checks for unterminated quotes and comments, unbalanced parentheses
+    and more than one statement.
+
+    Args:
+        query: SQL query string.
+        dialect: ``postgres`` or ``bigquery`` to recognize the dialect's
+            string escapes and quoting; standard SQL quoting otherwise.
+
+    Returns:
+        Description of the first error found, or None.
+    """
+    structure = _STRUCTURE.get(dialect, _STRUCTURE[None])
+    depth = 0
+    for match in structure.finditer(query):
+        kind = match.lastgroup
+        if kind == "unterminated":
+            return f"Unterminated {match.group()} at character {match.start() + 1}"
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+            if depth < 0:
+                return f"Unbalanced ')' at character {match.start() + 1}"
+        elif kind == "end" and normalize_sql(query[match.end():]):
+            return "Only a single statement is allowed"
+    if depth > 0:
+        return f"{depth} unclosed '('"
+    return None
\ No newline at end of file
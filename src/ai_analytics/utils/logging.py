@@ -1,35 +1,227 @@
-"""Logging utilities for AI Analytics Library."""
+"""Logging utilities for AI Analytics Library.
 
+Records are handed to a bounded in-memory queue and written by a single
+background listener thread, started with the first record, so a slow
+stdout pipe never blocks the request path. Output is one JSON object per
+line, tagged with the request id of the context the record was logged in.
+"""
+
+import atexit
+import contextvars
+import json
 import logging
+import queue
 import sys
-from typing import Optional
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Iterator, Optional
 
 from ai_analytics.config import Settings
 
+# Records logged while the queue is full are dropped rather than blocking
+QUEUE_SIZE = 10_000
+
+_request_id: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "ai_analytics_request_id", default=None
+)
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_output: Optional[logging.Handler] = None
+# Set by shutdown_logging; records are then written on the calling thread
+_stopped = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record.
+
+        Args:
+            record: Log record to format.
+
+        Returns:
+            JSON string.
+        """
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that never blocks the caller.
+
+    Only the cheap work happens on the calling thread: interpolating the
+    message arguments and capturing the request id. Serialization and I/O
+    run on the listener thread.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the parts of a record that depend on the calling context."""
+        record.request_id = _request_id.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, starting the listener on the first one.
+
+        After ``shutdown_logging`` no listener consumes the queue, so the
+        record is written directly instead.
+        """
+        if _listener is None:
+            with _lock:
+                if _listener is None and not _stopped:
+                    _start(_output or _stream_handler())
+                output = _output if _listener is None else None
+            if output is not None:
+                output.handle(self.prepare(record))
+                return
+        super().emit(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record, dropping it if the listener has fallen behind."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Shared by every logger from get_logger; records wait here for the listener
+_handler = _NonBlockingQueueHandler(queue.Queue(QUEUE_SIZE))
+
+
+def configure_logging(
+    settings: Optional[Settings] = None, stream: Optional[IO[str]] = None
+) -> None:
+    """Configure the shared log output, (re)starting the listener.
+
+    Loggers from ``get_logger`` share one queue handler, so reconfiguring
+    applies to all of them. Without a call to this function the listener
+    starts with JSON output to stdout when the first record is logged.
+
+    Args:
+        settings: Optional settings instance selecting the output format.
+        stream: Stream to write to, stdout by default.
+    """
+    output = _stream_handler(settings, stream)
+    with _lock:
+        _start(output)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread.
+
+    Records logged afterwards are written on the calling thread, until
+    ``configure_logging`` starts a listener again.
+    """
+    global _listener, _stopped
+    with _lock:
+        _stopped = True
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _stream_handler(
+    settings: Optional[Settings] = None, stream: Optional[IO[str]] = None
+) -> logging.Handler:
+    """Create the output handler for the format selected in settings."""
+    output = logging.StreamHandler(stream or sys.stdout)
+    if not settings or settings.log_format != "text":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s'
+        ))
+    return output
+
+
+def _start(output: logging.Handler) -> None:
+    """Start a listener writing to ``output``; the lock must be held."""
+    global _listener, _output, _stopped
+    if _listener is not None:
+        _listener.stop()
+    _output = output
+    _stopped = False
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=False)
+    _listener.start()
+
 
 def get_logger(name: str, settings: Optional[Settings] = None) -> logging.Logger:
     """Get a configured logger instance.
-    
+
     Args:
         name: Name for the logger.
         settings: Optional settings instance for configuration.
-        
+
     Returns:
         Configured logging.Logger instance.
     """
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
-        if settings:
-            logger.setLevel(settings.log_level)
-        else:
+        logger.addHandler(_handler)
+        if not settings:
             logger.setLevel(logging.INFO)
-    
-    return logger
\ No newline at end of file
+
+    if settings:
+        logger.setLevel(settings.log_level)
+
+    return logger
+
+
+def get_request_id() -> Optional[str]:
+    """Get the request id of the current context.
+
+    Returns:
+        Request id, or None outside a request.
+    """
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None) -> Iterator[str]:
+    """Tag log records of the enclosed block with a request id.
+
+    The id is bound to the current context, so it follows the request into
+    child tasks and ``asyncio.to_thread`` calls.
+
+    Args:
+        request_id: Id to use, e.g. from an ``X-Request-ID`` header. A new
+            one is generated when omitted.
+
+    Yields:
+        The request id in effect.
+    """
+    request_id = request_id or uuid.uuid4().hex
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""Lightweight request tracing and Prometheus-style metrics."""
+
+import bisect
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow queries
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+_NOOP = nullcontext()
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus exposition model."""
+
+    def __init__(
+        self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name.
+            description: Help text.
+            buckets: Upper bounds of the buckets, in increasing order.
+        """
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self._series: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value.
+            **labels: Label values identifying the series.
+        """
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Bucket counts, then +Inf count and sum
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        """Render the histogram in text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels(key, le=f'{bound:g}')} {cumulative:g}"
+                )
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_labels(key, le='+Inf')} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_labels(key)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{_labels(key)} {cumulative:g}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter in the Prometheus exposition model."""
+
+    def __init__(self, name: str, description: str):
+        """Initialize the counter.
+
+        Args:
+            name: Metric name.
+            description: Help text.
+        """
+        self.name = name
+        self.description = description
+        self._series: Dict[LabelKey, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        """Increase the counter.
+
+        Args:
+            value: Amount to add.
+            **labels: Label values identifying the series.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] += value
+
+    def render(self) -> List[str]:
+        """Render the counter in text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            snapshot = dict(self._series)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(key)} {value:g}")
+        return lines
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    """Format a label set, escaping the values."""
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize the built-in metrics."""
+        self.stage_seconds = Histogram(
+            "ai_analytics_stage_duration_seconds",
+            "Time spent per processing stage.",
+        )
+        self.request_seconds = Histogram(
+            "ai_analytics_http_request_duration_seconds",
+            "HTTP request latency.",
+        )
+        self.events = Counter(
+            "ai_analytics_events_total",
+            "Tokens, rows, bytes and cache lookups counted per agent.",
+        )
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format.
+
+        Returns:
+            Exposition text.
+        """
+        lines = (
+            self.stage_seconds.render()
+            + self.request_seconds.render()
+            + self.events.render()
+        )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Trace:
+    """Per-request collection of stage timings and counters."""
+
+    def __init__(self, agent: str):
+        """Initialize an empty trace.
+
+        Args:
+            agent: Name of the agent handling the request.
+        """
+        self.agent = agent
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, float] = defaultdict(float)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the trace as response metadata.
+
+        Returns:
+            Dict with stage timings in seconds and counters.
+        """
+        return {
+            "timings": {
+                stage: round(value, 6) for stage, value in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def publish(self, registry: MetricsRegistry = REGISTRY) -> None:
+        """Record the trace into the registry's histograms and counters.
+
+        Args:
+            registry: Registry to record into.
+        """
+        for stage, value in self.timings.items():
+            registry.stage_seconds.observe(value, agent=self.agent, stage=stage)
+        for name, value in self.counters.items():
+            registry.events.inc(value, agent=self.agent, event=name)
+
+
+_current: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar(
+    "ai_analytics_trace", default=None
+)
+
+
+@contextmanager
+def trace(agent: str) -> Iterator[Trace]:
+    """Collect timings and counters for one request.
+
+    The trace is bound to the current context, so work in child tasks and
+    ``asyncio.to_thread`` calls is attributed to it.
+
+    Args:
+        agent: Name of the agent handling the request.
+
+    Yields:
+        The active Trace.
+    """
+    current = Trace(agent)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def enabled() -> bool:
+    """Check whether a trace is active, to skip computing costly values.
+
+    Returns:
+        True if metrics recorded now are kept.
+    """
+    return _current.get() is not None
+
+
+def span(stage: str) -> ContextManager[Any]:
+    """Time a stage of the active trace; a no-op when none is active.
+
+    Args:
+        stage: Stage name. Time from repeated spans of a stage accumulates.
+
+    Returns:
+        Context manager timing the enclosed block.
+    """
+    current = _current.get()
+    if current is None:
+        return _NOOP
+    return _timed(current, stage)
+
+
+@contextmanager
+def _timed(current: Trace, stage: str) -> Iterator[None]:
+    """Add the duration of the enclosed block to a stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current.timings[stage] += time.perf_counter() - start
+
+
+def record(name: str, value: float = 1.0) -> None:
+    """Add to a counter of the active trace; a no-op when none is active.
+
+    Args:
+        name: Counter name.
+        value: Amount to add.
+    """
+    current = _current.get()
+    if current is not None:
+        current.counters[name] += value
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    """Add a measured duration to a stage of the active trace.
+
+    Args:
+        stage: Stage name.
+        seconds: Duration to add.
+    """
+    current = _current.get()
+    if current is not None:
+        current.timings[stage] += seconds
\ No newline at end of file
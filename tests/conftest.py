@@ -0,0 +1,64 @@
+"""Shared fixtures for the agent tests."""
+
+from unittest.mock import AsyncMock
+
+import pandas as pd
+import pytest
+
+from ai_analytics.config import Settings
+from ai_analytics.database.base import DatabaseConnection, TableSchema
+
+
+class TableConnection(DatabaseConnection):
+    """In-memory connection to one table, recording the queries it runs."""
+
+    def __init__(self, name: str, data: pd.DataFrame):
+        super().__init__()
+        self.name = name
+        self.data = data
+        self.queries = []
+
+    def connect(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+    def _execute_query(self, query: str) -> pd.DataFrame:
+        self.queries.append(query)
+        return self.data
+
+    def get_schema(self) -> TableSchema:
+        return TableSchema(
+            name=self.name,
+            columns=[
+                {"name": name, "type": str(dtype)}
+                for name, dtype in self.data.dtypes.items()
+            ],
+        )
+
+    def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
+        return self.data.head(limit)
+
+
+def mock_completion(content):
+    """Build a mocked ChatCompletion response."""
+    response = AsyncMock()
+    response.choices = [AsyncMock(message=AsyncMock(content=content))]
+    return response
+
+
+async def mock_stream(*pieces):
+    """Build a mocked streamed ChatCompletion response."""
+    for piece in pieces:
+        yield AsyncMock(choices=[AsyncMock(delta=AsyncMock(content=piece))])
+
+
+@pytest.fixture
+def settings():
+    """Create test settings."""
+    return Settings(
+        openai_api_key="test-key",
+        openai_model="gpt-4",
+        enable_monitoring=False,
+    )
\ No newline at end of file
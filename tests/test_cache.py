@@ -0,0 +1,78 @@
+"""Tests for cache backends."""
+
+import multiprocessing
+
+from ai_analytics.cache import (
+    BoundedCacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+
+
+def _write_from_other_process(path):
+    SQLiteCacheBackend(path).set("shared", b"from worker")
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Test that the memory backend stays within its byte budget."""
+    cache = MemoryCacheBackend(max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.get("a")
+    cache.set("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.size <= 10
+
+
+def test_memory_backend_expires_entries():
+    """Test that entries expire after their TTL."""
+    cache = MemoryCacheBackend()
+    cache.set("a", b"value", ttl=-1)
+
+    assert cache.get("a") is None
+    assert cache.misses == 1
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    """Test that values written by one process are read by another."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCacheBackend(path)
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=_write_from_other_process, args=(path,)
+    )
+    process.start()
+    process.join()
+
+    assert cache.get("shared") == b"from worker"
+    assert cache.hits == 1
+
+
+def test_sqlite_backend_evicts_over_budget(tmp_path):
+    """Test that eviction brings the store back under its byte budget."""
+    cache = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), max_bytes=20)
+    for key in "abcde":
+        cache.set(key, b"12345678")
+    cache.evict()
+
+    remaining = [key for key in "abcde" if cache.get(key) is not None]
+    assert len(remaining) == 2
+    assert "e" in remaining
+
+
+def test_bounded_backend_only_evicts_its_own_entries():
+    """Test that a bounded cache stays in budget without touching other keys."""
+    shared = MemoryCacheBackend()
+    shared.set("sql:other", b"1234567890")
+    results = BoundedCacheBackend(shared, max_bytes=10)
+    results.set("results:a", b"12345")
+    results.set("results:b", b"12345")
+    results.get("results:a")
+    results.set("results:c", b"12345")
+
+    assert shared.get("results:b") is None
+    assert results.get("results:a") == b"12345"
+    assert shared.get("sql:other") == b"1234567890"
+    assert results.size <= 10
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""Tests for LLM completion record and replay."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ai_analytics.agents import TextAnalysisAgent
+from ai_analytics.agents.cassette import CassetteMiss
+from ai_analytics.agents.text_analysis import TextAnalysisRequest
+from ai_analytics.config import Settings
+
+
+def make_agent(path, mode):
+    """Create a text agent using a cassette and no completion cache."""
+    return TextAnalysisAgent(Settings(
+        openai_api_key="test-key",
+        cache_backend="none",
+        llm_cassette_path=str(path),
+        llm_cassette_mode=mode,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_recorded_completions_replay_offline(tmp_path):
+    """Test that replay serves recorded completions and misses on new prompts."""
+    path = tmp_path / "cassette.jsonl.gz"
+    response = AsyncMock()
+    response.choices = [AsyncMock(message=AsyncMock(content="Positive"))]
+    response.usage = AsyncMock(prompt_tokens=40, completion_tokens=2)
+    request = TextAnalysisRequest(text="Great service!", tasks=["sentiment"])
+
+    with patch("openai.ChatCompletion.acreate", return_value=response):
+        await make_agent(path, "record").execute(request)
+
+    agent = make_agent(path, "replay")
+    with patch("openai.ChatCompletion.acreate") as acreate:
+        result = await agent.execute(request)
+        with pytest.raises(CassetteMiss):
+            await agent.execute(request.copy(update={"text": "Changed prompt"}))
+
+    acreate.assert_not_called()
+    assert result["analysis"] == "Positive"
\ No newline at end of file
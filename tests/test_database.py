@@ -0,0 +1,293 @@
+"""Tests for database connection utilities."""
+
+import time
+from unittest.mock import Mock, patch
+
+import pandas as pd
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import INTEGER, VARCHAR
+
+from ai_analytics.database.base import DatabaseConnection, TableSchema
+from ai_analytics.database.bigquery import BigQueryConnection
+from ai_analytics.database.cache import ResultCache
+from ai_analytics.database.frames import to_records
+from ai_analytics.database.postgres import PostgresConnection, _value_range
+from ai_analytics.database.sql import (
+    add_table_sample,
+    apply_limit,
+    extract_tables,
+    filter_literals,
+    normalize_sql,
+    render_parameters,
+    syntax_error,
+)
+
+
+class CountingConnection(DatabaseConnection):
+    """Connection that counts executed queries and has a settable marker."""
+
+    def __init__(self, result_cache=None):
+        super().__init__(result_cache)
+        self.executed = 0
+        self.marker = "v1"
+
+    def connect(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+    def _execute_query(self, query: str) -> pd.DataFrame:
+        self.executed += 1
+        return pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+
+    def _table_marker(self, tables):
+        return self.marker
+
+    def get_schema(self) -> TableSchema:
+        return TableSchema(name="t", columns=[])
+
+    def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
+        return self.execute_query(f"SELECT * FROM t LIMIT {limit}")
+
+
+def test_normalize_sql():
+    """Test that comments and whitespace are normalized outside literals."""
+    query = "SELECT  a, -- comment\n  b FROM t WHERE c = 'x  y' /* note */ ;"
+    assert normalize_sql(query) == "SELECT a, b FROM t WHERE c = 'x  y'"
+
+
+def test_extract_tables():
+    """Test extraction of table references."""
+    query = "SELECT * FROM `proj.ds.orders` o JOIN public.customers c ON o.id = c.id"
+    assert extract_tables(query) == ["proj.ds.orders", "public.customers"]
+    # Literals and comments are not references
+    query = "SELECT * FROM orders -- join returns\nWHERE note = 'from refunds'"
+    assert extract_tables(query) == ["orders"]
+
+
+def test_execute_query_uses_result_cache():
+    """Test that repeated queries are served from the cache."""
+    db = CountingConnection(ResultCache())
+
+    first = db.execute_query("SELECT * FROM t")
+    second = db.execute_query("SELECT *\n  FROM t;")
+
+    assert db.executed == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_table_marker_invalidates_cache():
+    """Test that a changed table marker forces re-execution."""
+    db = CountingConnection(ResultCache())
+
+    db.execute_query("SELECT * FROM t")
+    db.marker = "v2"
+    db.execute_query("SELECT * FROM t")
+
+    assert db.executed == 2
+
+
+def test_unversioned_and_volatile_results_are_not_kept():
+    """Test that volatile queries skip the cache and unversioned ones expire early."""
+    db = CountingConnection(ResultCache(ttl=3600, unversioned_ttl=0.001))
+
+    db.execute_query("SELECT *, now() FROM t")
+    db.execute_query("SELECT *, now() FROM t")
+    assert db.executed == 2
+
+    db.marker = None
+    db.execute_query("SELECT * FROM t")
+    time.sleep(0.01)
+    db.execute_query("SELECT * FROM t")
+    assert db.executed == 4
+
+
+def test_result_cache_is_bounded_by_bytes():
+    """Test that least recently used entries are evicted by size."""
+    df = pd.DataFrame({"value": range(1000)})
+    probe = ResultCache()
+    probe.put("probe", df)
+
+    cache = ResultCache(max_bytes=probe.backend.size * 2)
+    for key in ("a", "b", "c"):
+        cache.put(key, df)
+
+    assert cache.backend.size <= cache.backend.max_bytes
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_add_table_sample():
+    """Test TABLESAMPLE insertion after the single table reference and alias."""
+    query = (
+        "SELECT o.status, COUNT(*) FROM public.orders AS o "
+        "JOIN customers c ON o.cid = c.id GROUP BY o.status"
+    )
+    names = ["public.orders", "orders"]
+    clause = "TABLESAMPLE SYSTEM (1)"
+    rewritten = add_table_sample(query, names, clause)
+
+    assert "FROM public.orders AS o TABLESAMPLE SYSTEM (1) JOIN" in rewritten
+    assert "customers c ON" in rewritten
+    assert add_table_sample(rewritten, names, clause) == rewritten
+    # Sampling every reference would scale semi-joins and self-joins twice
+    semi_join = f"{query} HAVING o.status IN (SELECT status FROM orders)"
+    assert add_table_sample(semi_join, names, clause) is None
+    derived = "SELECT * FROM (SELECT * FROM orders) s"
+    assert add_table_sample(derived, names, clause) is None
+    noted = "SELECT * FROM orders WHERE note = 'from orders'"
+    assert add_table_sample(noted, names, clause) == (
+        "SELECT * FROM orders TABLESAMPLE SYSTEM (1) WHERE note = 'from orders'"
+    )
+
+
+def test_apply_limit():
+    """Test that only a trailing LIMIT clause counts as a row limit."""
+    unlimited = "SELECT * FROM t WHERE note = 'no limit'"
+    assert apply_limit(unlimited, 10).endswith("\nLIMIT 10")
+    limited_subquery = "SELECT * FROM (SELECT * FROM t LIMIT 3) s"
+    assert apply_limit(limited_subquery, 10).endswith("\nLIMIT 10")
+    assert apply_limit("SELECT * FROM t LIMIT 5;", 10) == "SELECT * FROM t LIMIT 5;"
+    assert apply_limit("SELECT * FROM t LIMIT 500 OFFSET 20", 10) == (
+        "SELECT * FROM t LIMIT 10 OFFSET 20"
+    )
+
+
+def test_syntax_error_follows_dialect_quoting():
+    """Test that dialect string escapes are not reported as unterminated."""
+    assert syntax_error("SELECT * FROM t WHERE name = 'O\\'Brien'", "bigquery") is None
+    assert syntax_error("SELECT '''it's''' # it's", "bigquery") is None
+    dollar_quoted = "SELECT $$it's$$, $q$(it's$q$, E'O\\'Brien'"
+    assert syntax_error(dollar_quoted, "postgres") is None
+    assert syntax_error("SELECT $1 FROM t WHERE name = 'O''Brien'", "postgres") is None
+    assert syntax_error("SELECT $$it's", "postgres").startswith("Unterminated $$")
+    assert syntax_error("SELECT 'a' FROM t'", "bigquery").startswith("Unterminated '")
+    assert syntax_error("SELECT 1; DROP TABLE t", "postgres") is not None
+
+
+def test_filter_literals_and_parameters():
+    """Test that only plain literals of filter clauses become parameters."""
+    query = (
+        "SELECT country, SUM(amount) FROM orders "
+        "WHERE country = 'DE' AND amount > 10 AND created_at >= DATE '2024-01-01' "
+        "GROUP BY 1 HAVING SUM(amount) > 2.5 LIMIT 5"
+    )
+    assert [value for _, _, value in filter_literals(query)] == ["DE", 10, 2.5]
+
+    template = "SELECT * FROM t WHERE name = :p0 AND note = ':p1' AND id::text = :p1"
+    assert render_parameters(template, {"p0": "O'Brien", "p1": 7}) == (
+        "SELECT * FROM t WHERE name = 'O''Brien' AND note = ':p1' AND id::text = 7"
+    )
+
+
+def test_memory_budget_compacts_and_truncates_results():
+    """Test that results are compacted and cut, uncached, at the byte budget."""
+    data = pd.DataFrame({
+        "id": range(50_000),
+        "country": ["DE", "FR", None, "US"] * 12_500,
+    })
+
+    class LargeConnection(CountingConnection):
+        def _execute_query(self, query: str) -> pd.DataFrame:
+            self.executed += 1
+            return data
+
+    db = LargeConnection(ResultCache())
+
+    result = db.execute_query("SELECT * FROM t", max_bytes=100_000)
+
+    assert result.attrs["truncated"]
+    assert 0 < len(result) < len(data)
+    assert result.memory_usage(deep=True).sum() <= 100_000
+    assert result["id"].dtype == "int16"
+    assert isinstance(result["country"].dtype, pd.CategoricalDtype)
+    assert to_records(result.head(3))[2] == {"id": 2, "country": None}
+
+    full = db.execute_query("SELECT * FROM t", max_bytes=10_000_000)
+    assert not full.attrs["truncated"]
+    assert len(full) == len(data)
+    db.execute_query("SELECT * FROM t")
+    assert db.executed == 2
+
+
+def test_statistics_range_includes_common_values():
+    """Test that the profiled range covers values outside the histogram."""
+    histogram, common = ["5", "20", "100"], ["1000", "2"]
+    assert _value_range(histogram + common) == ("2", "1000")
+    assert _value_range(["2024-01-05", "2023-12-31"]) == ("2023-12-31", "2024-01-05")
+    assert _value_range([]) == (None, None)
+
+
+def test_table_previews_group_catalog_and_keep_order():
+    """Test that previews follow the requested order and report missing tables."""
+    db = PostgresConnection("host", "db", "user", "password")
+    db.engine = Mock(dialect=postgresql.dialect(), pool=None)
+    inspector = Mock()
+    inspector.get_multi_columns.return_value = {
+        ("public", "orders"): [
+            {"name": "id", "type": INTEGER(), "nullable": False},
+            {"name": "note", "type": VARCHAR(50), "nullable": True},
+        ],
+        ("public", "customers"): [
+            {"name": "id", "type": INTEGER(), "nullable": False},
+        ],
+    }
+    inspector.get_multi_table_comment.return_value = {
+        ("public", "orders"): {"text": "Orders"},
+    }
+
+    def fetch(query):
+        if "customers" in query:
+            raise RuntimeError("permission denied")
+        return pd.DataFrame({"id": [1], "note": ["first"]})
+
+    with patch("ai_analytics.database.postgres.inspect", return_value=inspector), \
+            patch.object(db, "_fetch", side_effect=fetch) as fetched:
+        previews = db.get_table_previews(["orders", "missing", "customers"])
+
+    assert list(previews) == ["orders", "missing", "customers"]
+    assert previews["missing"] == {"error": "Table not found: public.missing"}
+    assert previews["orders"]["schema"]["description"] == "Orders"
+    assert previews["orders"]["schema"]["columns"] == [
+        {"name": "id", "type": "INTEGER", "nullable": False},
+        {"name": "note", "type": "VARCHAR(50)", "nullable": True},
+    ]
+    assert previews["orders"]["sample_data"] == [{"id": 1, "note": "first"}]
+    assert previews["customers"]["sample_data"] == []
+    assert "permission denied" in previews["customers"]["error"]
+    assert sorted(call.args[0] for call in fetched.call_args_list) == [
+        "SELECT * FROM public.customers LIMIT 3",
+        "SELECT * FROM public.orders LIMIT 3",
+    ]
+    inspector.get_multi_columns.assert_called_once()
+
+
+def test_bigquery_connections_share_cache_identity():
+    """Test that connections to one dataset as one principal share cache keys."""
+    credentials = Mock(service_account_email="reader@project.iam.gserviceaccount.com")
+    with patch("google.auth.default", return_value=(credentials, "project")), patch(
+        "google.cloud.bigquery.Client"
+    ):
+        first = BigQueryConnection("project", "sales", "orders")
+        second = BigQueryConnection("project", "sales", "orders")
+        other = BigQueryConnection("project", "returns", "orders")
+
+        assert first._cache_identity() == second._cache_identity()
+        assert first._cache_identity() != other._cache_identity()
+
+
+def test_bigquery_table_markers_are_reused_briefly():
+    """Test that repeated cache lookups skip the table metadata requests."""
+    connection = BigQueryConnection("project", "sales", "orders")
+    connection.client = Mock()
+    connection.client.get_table.side_effect = lambda table_id: Mock(
+        full_table_id=table_id, modified=pd.Timestamp("2024-01-01")
+    )
+
+    first = connection._table_marker(["orders", "sales.customers"])
+    second = connection._table_marker(["sales.orders", "project.sales.customers"])
+
+    assert first == second
+    assert first.startswith("project.sales.customers:2024-01-01")
+    assert connection.client.get_table.call_count == 2
\ No newline at end of file
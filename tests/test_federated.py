@@ -0,0 +1,87 @@
+"""Tests for the FederatedSQLAgent."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+from conftest import TableConnection, mock_completion
+
+from ai_analytics.agents import FederatedRequest, FederatedSQLAgent
+from ai_analytics.agents.base import PermanentError
+
+
+@pytest.mark.asyncio
+async def test_source_results_are_joined_and_aggregated_locally(settings):
+    """Test that pushed-down results are combined locally, repairing a bad plan."""
+    operational = TableConnection(
+        "orders", pd.DataFrame({"country": ["DE", "FR"], "open_orders": [3, 5]})
+    )
+    history = TableConnection(
+        "history.orders",
+        pd.DataFrame({"country": ["DE", "FR"], "past_orders": [30, 50]}),
+    )
+    agent = FederatedSQLAgent(
+        settings, databases={"postgres": operational, "bigquery": history}
+    )
+    plan = {
+        "queries": [
+            {
+                "name": "recent",
+                "source": "postgres",
+                "sql": "SELECT country, COUNT(*) AS open_orders FROM orders "
+                "GROUP BY country",
+            },
+            {
+                "name": "past",
+                "source": "bigquery",
+                "sql": "SELECT country, COUNT(*) AS past_orders FROM history.orders "
+                "GROUP BY country",
+            },
+        ],
+        "join": {"on": ["country"], "how": "inner"},
+        "combine": {
+            "sort": [{"column": "past_orders", "ascending": False}],
+            "limit": 1,
+        },
+    }
+    bad_plan = {**plan, "join": {"on": ["region"]}}
+
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion(json.dumps(bad_plan)),
+            mock_completion(json.dumps(plan)),
+        ],
+    ) as acreate:
+        result = await agent.execute(FederatedRequest(question="Orders by country?"))
+
+    assert "join columns ['region'] are missing" in (
+        acreate.call_args_list[1].kwargs["messages"][-1]["content"]
+    )
+    assert result["repairs"] == 1
+    assert result["results"] == [{"country": "FR", "open_orders": 5, "past_orders": 50}]
+    assert [query["row_count"] for query in result["queries"]] == [2, 2]
+    assert operational.queries[-1].endswith("LIMIT 100001")
+
+
+@pytest.mark.asyncio
+async def test_source_execution_errors_are_not_repaired(settings):
+    """Test that a failing source is left to the retry, not fed back as a bad plan."""
+    orders = TableConnection("orders", pd.DataFrame({"country": ["DE"]}))
+    orders._execute_query = Mock(side_effect=RuntimeError("connection reset"))
+    agent = FederatedSQLAgent(settings, databases={"postgres": orders})
+    plan = {
+        "queries": [
+            {"name": "all", "source": "postgres", "sql": "SELECT * FROM orders"}
+        ]
+    }
+
+    with patch(
+        "openai.ChatCompletion.acreate", return_value=mock_completion(json.dumps(plan))
+    ) as acreate:
+        with pytest.raises(RuntimeError, match="connection reset") as error:
+            await agent._process(FederatedRequest(question="All orders?"))
+
+    assert not isinstance(error.value, PermanentError)
+    assert acreate.call_count == 1
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""Tests for lazy package imports."""
+
+import subprocess
+import sys
+
+
+def test_postgres_import_does_not_load_bigquery_sdk():
+    """Test that backends and their SDKs load only when used."""
+    probe = (
+        "import sys\n"
+        "import ai_analytics, ai_analytics.database\n"
+        "assert 'pandas' not in sys.modules\n"
+        "from ai_analytics.database import PostgresConnection\n"
+        "from ai_analytics import SQLChatAgent\n"
+        "assert 'google.cloud.bigquery' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Tests for background jobs."""
+
+import asyncio
+
+import pytest
+
+from ai_analytics.agents.jobs import JobManager, JobStatus, QuotaExceeded
+
+
+class SlowAgent:
+    """Agent stand-in that tracks how many executions overlap."""
+
+    def __init__(self, delay: float = 0.01, rows: int = 5):
+        self.delay = delay
+        self.rows = rows
+        self.running = 0
+        self.max_running = 0
+
+    async def execute(self, request):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return {"results": [{"n": i} for i in range(self.rows)], "question": request}
+
+
+@pytest.mark.asyncio
+async def test_jobs_respect_tenant_quota_and_page_results():
+    """Test that a tenant's jobs run within its limit and results are paged."""
+    jobs = JobManager(max_workers=4, tenant_limit=2, tenant_max_queued=5)
+    agent = SlowAgent()
+
+    submitted = [jobs.submit(agent, f"q{i}", tenant="a") for i in range(5)]
+    with pytest.raises(QuotaExceeded):
+        jobs.submit(agent, "q5", tenant="a")
+
+    events = [event["status"] async for event in jobs.events(submitted[-1])]
+    await asyncio.gather(*(job.task for job in submitted if job.task))
+
+    assert agent.max_running == 2
+    assert events[0] == "queued" and events[-1] == "succeeded"
+    page = jobs.results(submitted[0], offset=2, limit=2)
+    assert page["results"] == [{"n": 2}, {"n": 3}]
+    assert page["next_offset"] == 4 and page["total_rows"] == 5
+    assert jobs.get(submitted[0].id, tenant="b") is None
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_evicted_after_retention():
+    """Test that finished jobs expire and cancelled jobs are marked."""
+    jobs = JobManager(retention=0.0)
+    done = jobs.submit(SlowAgent(delay=0), "fast")
+    slow = jobs.submit(SlowAgent(delay=10), "slow")
+    await done.task
+    jobs.cancel(slow.id)
+    await asyncio.sleep(0.01)
+
+    assert slow.status == JobStatus.CANCELLED
+    assert jobs.get(done.id) is None
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""Tests for logging utilities."""
+
+import io
+import json
+
+from ai_analytics.utils.logging import (
+    configure_logging,
+    get_logger,
+    request_context,
+    shutdown_logging,
+)
+
+
+def test_records_are_written_as_json_with_request_id():
+    """Test that queued records are formatted lazily and tagged per request."""
+    stream = io.StringIO()
+    configure_logging(stream=stream)
+    logger = get_logger("tests.logging")
+
+    with request_context("req-1"):
+        logger.info("Answered from column profile of %s", "country")
+    logger.info("Outside a request")
+    shutdown_logging()
+    # Without a listener records are written directly rather than queued
+    logger.info("After shutdown")
+
+    first, second, third = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Answered from column profile of country"
+    assert first["request_id"] == "req-1"
+    assert first["level"] == "INFO"
+    assert second["request_id"] is None
+    assert third["message"] == "After shutdown"
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Tests for metrics collection and exposition."""
+
+from ai_analytics.utils import metrics
+
+
+def test_registry_renders_escaped_prometheus_text():
+    """Test the exposition format, including label values needing escapes."""
+    registry = metrics.MetricsRegistry()
+    with metrics.trace("sql_chat") as trace:
+        metrics.record("rows_fetched", 3)
+        metrics.record_timing("db_query", 0.02)
+    trace.publish(registry)
+    registry.request_seconds.observe(0.3, path='/q"\\\n', method="GET")
+
+    lines = registry.render().splitlines()
+
+    stage = "ai_analytics_stage_duration_seconds"
+    assert f"# TYPE {stage} histogram" in lines
+    assert f'{stage}_bucket{{agent="sql_chat",stage="db_query",le="0.025"}} 1' in lines
+    assert 'ai_analytics_events_total{agent="sql_chat",event="rows_fetched"} 3' in lines
+    request = "ai_analytics_http_request_duration_seconds"
+    assert f'{request}_count{{method="GET",path="/q\\"\\\\\\n"}} 1' in lines
\ No newline at end of file
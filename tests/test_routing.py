@@ -0,0 +1,37 @@
+"""Tests for model routing."""
+
+import pytest
+
+from ai_analytics.agents.routing import ModelRouter, question_complexity
+
+
+def test_simple_questions_use_fast_model_and_complex_ones_strong():
+    """Test that routing follows question complexity and schema size."""
+    router = ModelRouter(strong_model="gpt-4", fast_model="gpt-4o-mini")
+    columns = ["country", "amount", "created_at"]
+
+    assert question_complexity("What is the total amount per country?", columns) == 0
+    simple = "What is the total amount per country?"
+    assert router.choose("sql", simple, columns) == "gpt-4o-mini"
+    complex_question = "Compare monthly revenue growth between DE and FR year over year"
+    assert router.choose("sql", complex_question, columns) == "gpt-4"
+    wide = [f"c{i}" for i in range(51)]
+    assert router.choose("sql", "How many orders?", wide) == "gpt-4"
+    assert router.escalation("gpt-4o-mini") == "gpt-4"
+    assert router.escalation("gpt-4") is None
+
+
+def test_low_success_rate_demotes_fast_model():
+    """Test that a failing fast model is skipped, apart from occasional probes."""
+    router = ModelRouter(strong_model="gpt-4", fast_model="gpt-4o-mini", min_samples=5)
+    for _ in range(5):
+        router.record_outcome("gpt-4o-mini", "sql", success=False)
+    router.record_call("gpt-4o-mini", 0.5, prompt_tokens=1000, completion_tokens=100)
+
+    choices = [router.choose("sql", "How many orders?") for _ in range(40)]
+
+    assert choices.count("gpt-4o-mini") == 2
+    assert router.choose("text", "Short text") == "gpt-4o-mini"
+    stats = router.stats()["gpt-4o-mini"]
+    assert stats["success_rates"] == {"sql": 0.0}
+    assert stats["cost_usd"] == pytest.approx(0.00015 + 0.00006)
\ No newline at end of file
@@ -0,0 +1,452 @@
+"""Tests for the SQLChatAgent."""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from conftest import TableConnection, mock_completion, mock_stream
+from google.api_core.exceptions import NotFound
+
+from ai_analytics.agents import SQLChatAgent, SQLChatRequest
+from ai_analytics.database.base import ColumnStats, TableSchema
+from ai_analytics.database.bigquery import BigQueryConnection
+
+
+class FakeConnection(TableConnection):
+    """In-memory orders table with a profile and a large row estimate."""
+
+    def __init__(self, data: pd.DataFrame):
+        super().__init__("public.orders", data)
+
+    def get_schema(self) -> TableSchema:
+        return TableSchema(
+            name="public.orders",
+            columns=[
+                {"name": "country", "type": "VARCHAR"},
+                {"name": "amount", "type": "INTEGER"},
+            ],
+        )
+
+    def estimate_row_count(self):
+        return 10_000_000
+
+    def table_sample_clause(self, percent: float):
+        return f"TABLESAMPLE SYSTEM ({percent:g})"
+
+    def _qualified_table_name(self) -> str:
+        return "public.orders"
+
+    def get_column_stats(self, top_k: int = 5):
+        return {
+            "country": ColumnStats(
+                name="country",
+                null_fraction=0.0,
+                distinct_count=2,
+                top_values=["FR", "DE"],
+                top_values_complete=True,
+            ),
+            "amount": ColumnStats(
+                name="amount", distinct_count=3, min_value=10, max_value=30
+            ),
+        }
+
+
+@pytest.fixture
+def database():
+    """Create a fake database connection."""
+    return FakeConnection(pd.DataFrame({
+        "country": ["DE", "FR", "DE"],
+        "amount": [10, 20, 30],
+    }))
+
+
+@pytest.fixture
+def sql_agent(settings, database):
+    """Create SQLChatAgent instance."""
+    return SQLChatAgent(settings, database=database)
+
+
+def test_prompt_includes_column_profile(sql_agent):
+    """Test that the compact column profile is part of the system prompt."""
+    prompt = sql_agent._build_system_prompt()
+
+    assert "Column value profile" in prompt
+    assert "values: 'FR', 'DE'" in prompt
+    assert "range 10..30" in prompt
+    assert '"column_stats"' not in prompt
+
+
+@pytest.mark.asyncio
+async def test_distinct_question_answered_from_profile(sql_agent, database):
+    """Test that distinct-value questions skip the LLM and the database."""
+    with patch("openai.ChatCompletion.acreate") as acreate:
+        result = await sql_agent.execute(
+            SQLChatRequest(question="What are the distinct countries?")
+        )
+
+    acreate.assert_not_called()
+    assert database.queries == []
+    assert result["source"] == "profile"
+    assert result["approximate"]
+    assert result["results"] == [{"country": "DE"}, {"country": "FR"}]
+
+
+@pytest.mark.asyncio
+async def test_query_executes_generated_sql(sql_agent, database):
+    """Test that other questions generate and execute SQL."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_completion("SELECT country, amount FROM public.orders"),
+    ):
+        result = await sql_agent.execute(
+            SQLChatRequest(question="Show all orders", max_results=10)
+        )
+
+    assert result["source"] == "database"
+    assert result["row_count"] == 3
+    assert database.queries[-1].endswith("LIMIT 10")
+
+
+@pytest.mark.asyncio
+async def test_follow_up_served_from_session(sql_agent, database):
+    """Test that follow-ups on a complete previous result skip the database."""
+    local_operation = (
+        '{"local_operation": {"filters": [{"column": "country", "op": "==", '
+        '"value": "DE"}], "sort": [{"column": "amount", "ascending": false}]}}'
+    )
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion("SELECT country, amount FROM public.orders"),
+            mock_completion(local_operation),
+        ],
+    ):
+        await sql_agent.execute(
+            SQLChatRequest(question="Show all orders", session_id="s1")
+        )
+        result = await sql_agent.execute(
+            SQLChatRequest(question="Now only for Germany", session_id="s1")
+        )
+
+    assert len(database.queries) == 1
+    assert result["source"] == "session"
+    assert result["results"] == [
+        {"country": "DE", "amount": 30},
+        {"country": "DE", "amount": 10},
+    ]
+    assert "WHERE country = 'DE'" in result["generated_sql"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_local_operation_falls_back_to_database(sql_agent, database):
+    """Test that a local operation on unknown columns re-generates SQL."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion("SELECT country, amount FROM public.orders"),
+            mock_completion('{"local_operation": {"group_by": ["margin"]}}'),
+            mock_completion("SELECT country FROM public.orders"),
+        ],
+    ):
+        await sql_agent.execute(
+            SQLChatRequest(question="Show all orders", session_id="s1")
+        )
+        result = await sql_agent.execute(
+            SQLChatRequest(question="Group that by margin", session_id="s1")
+        )
+
+    assert len(database.queries) == 2
+    assert result["source"] == "database"
+
+
+@pytest.mark.asyncio
+async def test_approximate_query_reads_table_sample(sql_agent, database):
+    """Test that approximate mode samples the table and reports the error."""
+    sampled = "SELECT COUNT(*) * 100 FROM public.orders TABLESAMPLE SYSTEM (1)"
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion(
+                f"{sampled} WHERE country IN "
+                "(SELECT country FROM orders TABLESAMPLE SYSTEM (1))"
+            ),
+            mock_completion(sampled),
+            mock_completion("SELECT COUNT(*) FROM public.orders"),
+        ],
+    ) as acreate:
+        result = await sql_agent.execute(
+            SQLChatRequest(question="Roughly how many orders?", approximate=True)
+        )
+        exact = await sql_agent.execute(
+            SQLChatRequest(question="Roughly how many customers?", approximate=True)
+        )
+
+    repair_prompt = acreate.call_args_list[1].kwargs["messages"][-1]["content"]
+    assert "single reference" in repair_prompt
+    assert database.queries[0].startswith(sampled)
+    assert result["approximate"] is True
+    assert result["sampling_rate"] == 0.01
+    assert 0 < result["error_estimate"] < 0.01
+    assert exact["approximate"] is False
+
+
+@pytest.mark.asyncio
+async def test_monitoring_reports_stage_timings(settings, database):
+    """Test that enabled monitoring adds per-stage metrics to the response."""
+    agent = SQLChatAgent(
+        settings.copy(update={"enable_monitoring": True}), database=database
+    )
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_completion("SELECT country, amount FROM public.orders"),
+    ):
+        result = await agent.execute(SQLChatRequest(question="Show all orders"))
+
+    timings = result["metrics"]["timings"]
+    assert {"total", "prompt", "llm", "sql_execution", "db_query"} <= set(timings)
+    assert result["metrics"]["counters"]["rows_fetched"] == 3
+
+
+@pytest.mark.asyncio
+async def test_paged_query_serves_later_pages_from_cursor(sql_agent, database):
+    """Test that later pages are read without the LLM or the database."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_completion("SELECT country, amount FROM public.orders"),
+    ) as acreate:
+        first = await sql_agent.execute(
+            SQLChatRequest(question="Show all orders", page_size=2)
+        )
+        second = await sql_agent.fetch_page(first["next_cursor"])
+
+    assert acreate.call_count == 1
+    assert len(database.queries) == 1
+    assert first["results"] == [
+        {"country": "DE", "amount": 10},
+        {"country": "FR", "amount": 20},
+    ]
+    assert first["total_rows"] == 3
+    assert second["results"] == [{"country": "DE", "amount": 30}]
+    assert second["source"] == "cursor"
+    assert second["next_cursor"] is None
+    # Cursors are bounded separately from the agent's shared cache backend
+    assert sql_agent.cursors.backend.backend is sql_agent.cache
+    assert sql_agent.cursors.backend.max_bytes == sql_agent.settings.cursor_max_bytes
+
+
+@pytest.mark.asyncio
+async def test_streamed_query_emits_tokens_sql_and_row_batches(settings, database):
+    """Test that a streamed query sends tokens, then SQL, then result batches."""
+    agent = SQLChatAgent(
+        settings.copy(update={"stream_batch_rows": 2}), database=database
+    )
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_stream("SELECT country, amount ", "FROM public.orders"),
+    ) as acreate:
+        events = [
+            event async for event in agent.execute_stream(
+                SQLChatRequest(question="Show all orders")
+            )
+        ]
+
+    assert acreate.call_args.kwargs["stream"] is True
+    assert [event["event"] for event in events] == [
+        "token", "token", "sql", "rows", "rows", "done"
+    ]
+    assert events[2]["data"]["sql"].startswith(
+        "SELECT country, amount FROM public.orders"
+    )
+    assert events[3]["data"]["rows"] == [
+        {"country": "DE", "amount": 10},
+        {"country": "FR", "amount": 20},
+    ]
+    assert events[4]["data"]["offset"] == 2
+    assert events[5]["data"]["row_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_sql_from_fast_model_escalates(settings, database):
+    """Test that SQL failing validation is generated again by the strong model."""
+    agent = SQLChatAgent(
+        settings.copy(update={"openai_fast_model": "gpt-4o-mini"}), database=database
+    )
+
+    async def complete(**kwargs):
+        if kwargs["model"] == "gpt-4o-mini":
+            return mock_completion("DELETE FROM public.orders")
+        return mock_completion("SELECT country, amount FROM public.orders")
+
+    with patch("openai.ChatCompletion.acreate", side_effect=complete) as acreate:
+        result = await agent.execute(SQLChatRequest(question="Show all orders"))
+
+    models = [call.kwargs["model"] for call in acreate.call_args_list]
+    assert models == ["gpt-4o-mini", "gpt-4"]
+    assert len(database.queries) == 1
+    assert result["model"] == "gpt-4"
+    assert agent.router.stats()["gpt-4o-mini"]["success_rates"]["sql"] < 1
+
+
+@pytest.mark.asyncio
+async def test_question_matching_template_skips_llm(sql_agent, database):
+    """Test that SQL learned for a question is reused with new literals."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_completion(
+            "SELECT * FROM public.orders WHERE country = 'DE' AND amount > 15"
+        ),
+    ) as acreate:
+        await sql_agent.execute(SQLChatRequest(question="Orders in DE above 15?"))
+        with patch.object(
+            database, "_execute_parameterized", wraps=database._execute_parameterized
+        ) as executed:
+            result = await sql_agent.execute(
+                SQLChatRequest(question="Orders in FR above 25?")
+            )
+
+    assert acreate.call_count == 1
+    assert result["source"] == "template"
+    assert result["generated_sql"].startswith(
+        "SELECT * FROM public.orders WHERE country = 'FR' AND amount > 25"
+    )
+    # The values are bound by the backend even within the result byte budget
+    assert sql_agent.settings.result_max_bytes
+    assert executed.call_args.args[1] == {"p0": "FR", "p1": 25}
+
+
+@pytest.mark.asyncio
+async def test_question_with_context_neither_learns_nor_uses_template(sql_agent):
+    """Test that SQL generated for a context is not reused without it."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        return_value=mock_completion(
+            "SELECT * FROM public.orders WHERE country = 'DE' AND amount > 15"
+        ),
+    ) as acreate:
+        await sql_agent.execute(
+            SQLChatRequest(question="Orders in DE above 15?", context="Only EU")
+        )
+        await sql_agent.execute(SQLChatRequest(question="Orders in FR above 25?"))
+        assert acreate.call_count == 2
+
+        await sql_agent.execute(SQLChatRequest(question="Orders in DE above 15?"))
+        await sql_agent.execute(
+            SQLChatRequest(question="Orders in FR above 25?", context="Only EU")
+        )
+
+    assert acreate.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_sql_failing_validation_is_repaired_before_execution(sql_agent, database):
+    """Test that the validation error is sent back to the LLM to fix the SQL."""
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion("SELECT country FROM public.orders WHERE (amount > 10"),
+            mock_completion("SELECT country FROM public.orders WHERE amount > 10"),
+        ],
+    ) as acreate:
+        result = await sql_agent.execute(
+            SQLChatRequest(question="Which orders are large?")
+        )
+
+    repair_prompt = acreate.call_args_list[1].kwargs["messages"][-1]["content"]
+    assert "1 unclosed '('" in repair_prompt
+    assert len(database.queries) == 1
+    assert "WHERE amount > 10" in result["generated_sql"]
+
+
+class FakeBigQuery(BigQueryConnection):
+    """BigQuery connection with a mocked client and a fixed orders table."""
+
+    def __init__(self):
+        super().__init__("project", "sales", "orders")
+        self.client = MagicMock()
+        self.client.query.side_effect = self._query
+        self.queries = []
+
+    def _query(self, query, job_config=None):
+        if job_config is not None and job_config.dry_run:
+            if "returns" in query:
+                raise NotFound("Not found: Table project:sales.returns")
+            return MagicMock()
+        self.queries.append(query)
+        return MagicMock(to_dataframe=lambda: pd.DataFrame({"country": ["FR"]}))
+
+    def get_schema(self) -> TableSchema:
+        return TableSchema(
+            name="project.sales.orders",
+            columns=[{"name": "country", "type": "STRING"}],
+        )
+
+    def get_column_stats(self, top_k: int = 5):
+        return {}
+
+    def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
+        return pd.DataFrame({"country": ["FR"]})
+
+
+@pytest.mark.asyncio
+async def test_sql_reading_missing_table_is_repaired_from_dry_run(settings):
+    """Test that a dry run's NotFound error is sent back to the LLM."""
+    database = FakeBigQuery()
+    sql_agent = SQLChatAgent(settings, database=database)
+    with patch(
+        "openai.ChatCompletion.acreate",
+        side_effect=[
+            mock_completion("SELECT country FROM sales.returns"),
+            mock_completion("SELECT country FROM sales.orders"),
+        ],
+    ) as acreate:
+        await sql_agent.execute(SQLChatRequest(question="Where are orders from?"))
+
+    repair_prompt = acreate.call_args_list[1].kwargs["messages"][-1]["content"]
+    assert "Not found: Table project:sales.returns" in repair_prompt
+    assert len(database.queries) == 1
+    assert "FROM sales.orders" in database.queries[0]
+
+
+@pytest.mark.asyncio
+async def test_suggestions_served_in_rotation_from_pool(sql_agent, database):
+    """Test that suggestions come from one batch, rotating, until the schema changes."""
+    batch = "\n".join(f"{i}. Question {i}?" for i in range(1, 21))
+    with patch(
+        "openai.ChatCompletion.acreate", return_value=mock_completion(batch)
+    ) as acreate:
+        first = await sql_agent.suggest_questions(3)
+        second = await sql_agent.suggest_questions(3)
+        # Rotating past the end of the full pool generates nothing more
+        for _ in range(5):
+            last = await sql_agent.suggest_questions(3)
+        assert sql_agent.suggestions._refill.done()
+        assert acreate.call_count == 1
+
+        columns = sql_agent.schema.columns + [{"name": "city", "type": "VARCHAR"}]
+        sql_agent.schema = sql_agent.schema.copy(update={"columns": columns})
+        await sql_agent.suggest_questions(3)
+
+    assert first == ["Question 1?", "Question 2?", "Question 3?"]
+    assert second == ["Question 4?", "Question 5?", "Question 6?"]
+    assert last == ["Question 19?", "Question 20?", "Question 1?"]
+    assert acreate.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_small_suggestion_pool_refills_and_backs_off(sql_agent, database):
+    """Test that a pool below its minimum refills, paused after repeated ones."""
+    batch = "\n".join(f"Question {i}?" for i in range(1, 7))
+    with patch(
+        "openai.ChatCompletion.acreate", return_value=mock_completion(batch)
+    ) as acreate:
+        first = await sql_agent.suggest_questions(3)
+        # 6 questions are fewer than SUGGESTION_POOL_MIN
+        await sql_agent.suggestions._refill
+        assert acreate.call_count == 2
+        second = await sql_agent.suggest_questions(3)
+        await sql_agent.suggest_questions(3)
+
+    assert first == ["Question 1?", "Question 2?", "Question 3?"]
+    assert second == ["Question 4?", "Question 5?", "Question 6?"]
+    assert len(sql_agent.suggestions.questions()) == 6
+    assert acreate.call_count == 2
\ No newline at end of file